@@ -1 +1,7 @@
-from app.views   import VwMainWindow
+# views are imported on first access only - importing any subpackage (e.g. app.models in a worker process)
+# must not pull in PyQt5 and the whole widget tree
+def __getattr__(name: str):
+    if name == 'VwMainWindow':
+        from app.views import VwMainWindow
+        return VwMainWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,3 @@
+from .ing_parse_task       import IngParseTask
+from .ing_results_transfer import IngResultsDescriptor, IngResultsTransfer, export_results
+from .ing_worker           import run_parse_task, export_parse_task, warm_up_worker, INGESTION_MODELS
@@ -0,0 +1,55 @@
+"""Contains description of a single source file parsing job, passed to worker processes instead of model objects."""
+
+from app.models.components.mdl_json_model_base import MdlJsonModelBase
+
+
+class IngParseTask:
+    """
+    Plain description of parsing of a single source json file: name of the model class, file path, constructor 
+    options of the model and settings of the results cache. Contains only simple values, so it is cheap to pickle 
+    and unpickling it does not require any application state.
+    """
+
+    def __init__(self, func_id: str, model_name: str, j_filepath: str, options: dict = None
+                 , cache_dir: str = None, cache_max_bytes: int = None, cache_mmap: bool = True
+                 , transfer_dir: str = None, byte_range: tuple[int, int] = None):
+        """
+        :param func_id: Identifier returned back together with the results.
+        :param model_name: Name of the model class (see INGESTION_MODELS).
+        :param j_filepath: String filepath of the file containing source data.
+        :param options: Additional keyword arguments of the model's constructor (see MdlJsonModelBase.get_parse_options).
+        :param cache_dir: Directory of the results cache - results are not cached if not given.
+        :param cache_max_bytes: Size limit of the results cache.
+        :param cache_mmap: Whether the results cache memory-maps loaded arrays.
+        :param transfer_dir: Parent directory of files used to pass results to the main process (see export_parse_task).
+        :param byte_range: Record-aligned byte range of the file to be parsed (see MdlJsonModelBase.get_chunk_ranges).
+                           Whole file is parsed if not given. Results of a range are not cached.
+        """
+        self.func_id         = func_id
+        self.model_name      = model_name
+        self.j_filepath      = j_filepath
+        self.options         = dict(options or {})
+        self.cache_dir       = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_mmap      = cache_mmap
+        self.transfer_dir    = transfer_dir
+        self.byte_range      = byte_range
+
+    @classmethod
+    def from_model(cls, model: MdlJsonModelBase, func_id: str, transfer_dir: str = None
+                   , byte_range: tuple[int, int] = None) -> 'IngParseTask':
+        """
+        Returns task producing the same results as model.get_result_frames_cached(func_id) 
+        (or model.get_result_frames_range(func_id, byte_range) if the range is given).
+        """
+        cache = model.get_results_cache()
+        return cls(
+              func_id         = func_id
+            , model_name      = model.__class__.__name__
+            , j_filepath      = model.get_json_filepath()
+            , options         = model.get_parse_options()
+            , cache_dir       = cache.get_cache_dir() if cache else None
+            , cache_max_bytes = cache.get_max_bytes() if cache else None
+            , cache_mmap      = cache.is_mmap()       if cache else True
+            , transfer_dir    = transfer_dir
+            , byte_range      = byte_range)
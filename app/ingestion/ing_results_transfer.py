@@ -0,0 +1,82 @@
+"""Contains transfer of result frames from worker processes through memory-mapped files instead of pickling."""
+
+import os
+import shutil
+import tempfile
+import weakref
+
+from app.models.components.mdl_results_files import save_results, load_results
+
+
+# files in RAM-backed file system (if available) are effectively shared memory blocks
+DEFAULT_TRANSFER_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+TRANSFER_DIR_PREFIX  = 'ftv_results_'
+
+
+class IngResultsDescriptor:
+    """
+    Describes result frames written by a worker process: directory with per-column files and descriptors of items.
+    This object is all that is sent back to the main process. The directory is either a temporary transfer
+    directory (removed once the results are released) or an entry of the results cache (left in place).
+    """
+
+    def __init__(self, func_id: str, dir_path: str, items: list[dict], temporary: bool = True):
+        self.func_id   = func_id
+        self.dir_path  = dir_path
+        self.items     = items
+        self.temporary = temporary
+
+
+def export_results(func_id: str, results: tuple, transfer_dir: str = None) -> IngResultsDescriptor:
+    """
+    Writes result frames to a new transfer directory (worker process side).
+
+    :param func_id: Identifier of the results.
+    :param results: Tuple of pandas DataFrames / MdlRaggedFrame objects.
+    :param transfer_dir: Parent directory of transfer directories. DEFAULT_TRANSFER_DIR if not given.
+    :return: Descriptor to be passed to IngResultsTransfer in the main process.
+    """
+    dir_path = tempfile.mkdtemp(dir=transfer_dir or DEFAULT_TRANSFER_DIR, prefix=TRANSFER_DIR_PREFIX)
+    try:
+        items = save_results(dir_path, results)
+    except BaseException:
+        shutil.rmtree(dir_path, ignore_errors=True)
+        raise
+
+    return IngResultsDescriptor(func_id, dir_path, items)
+
+
+class IngResultsTransfer:
+    """
+    Owns result frames received from a worker process (main process side). Numeric columns are memory-mapped
+    straight from the transfer files, so they are neither copied nor unpickled. Temporary files are removed on
+    release, when the transfer object is garbage collected or on interpreter exit - whichever comes first (entries
+    of the results cache are only unmapped). Memory of mapped columns still in use stays valid after the release
+    (until the arrays are dropped).
+    """
+
+    def __init__(self, descriptor: IngResultsDescriptor):
+        self._descriptor = descriptor
+        self._results: tuple = None
+        self._released = False
+        self._finalizer = weakref.finalize(self, shutil.rmtree, descriptor.dir_path, True) \
+                          if descriptor.temporary else None
+
+    def get_func_id(self) -> str:
+        return self._descriptor.func_id
+
+    def get_results(self) -> tuple:
+        """
+        Returns result frames (to be passed to model's set_result_frames).
+        """
+        if self._results is None:
+            if self._released:
+                raise ValueError(f'{self.__class__.__name__}: results already released')
+            self._results = load_results(self._descriptor.dir_path, self._descriptor.items, mmap_mode='r')
+        return self._results
+
+    def release(self):
+        self._results = None
+        self._released = True
+        if self._finalizer is not None:
+            self._finalizer()
@@ -0,0 +1,67 @@
+"""Contains entry point of worker processes parsing source files. Imports only the json / NumPy / pandas stack."""
+
+import os
+
+from app.models                              import MdlEventsData, MdlFramesData, MdlLineupsData
+from app.models.components.mdl_results_cache import MdlResultsCache
+from app.ingestion.ing_parse_task            import IngParseTask
+from app.ingestion.ing_results_transfer      import IngResultsDescriptor, export_results
+
+
+# models which can be created by worker processes, by class name
+INGESTION_MODELS = { model_cls.__name__: model_cls for model_cls in (MdlEventsData, MdlFramesData, MdlLineupsData) }
+
+
+def _create_model(task: IngParseTask) -> MdlEventsData | MdlFramesData | MdlLineupsData:
+    model_cls = INGESTION_MODELS.get(task.model_name)
+    if model_cls is None:
+        raise ValueError(f'Unsupported model of parse task: {task.model_name}')
+
+    results_cache = None
+    if task.cache_dir:
+        results_cache = MdlResultsCache(cache_dir=task.cache_dir, max_bytes=task.cache_max_bytes, mmap=task.cache_mmap)
+
+    return model_cls(j_filepath=task.j_filepath, results_cache=results_cache, **task.options)
+
+
+def run_parse_task(task: IngParseTask) -> tuple[str, tuple]:
+    """
+    Parses source file (or its byte range) described by the task with a fresh model object and saves results 
+    of the whole file in the cache (if set).
+
+    :param task: Description of the parsing job.
+    :return: Tuple of task's func_id and result frames (to be passed to model's set_result_frames).
+    """
+    model = _create_model(task)
+    if task.byte_range is not None:
+        return model.get_result_frames_range(task.func_id, task.byte_range)
+    return model.get_result_frames_cached(task.func_id)
+
+
+def export_parse_task(task: IngParseTask) -> IngResultsDescriptor:
+    """
+    Same as run_parse_task, but result frames are written to memory-mapped files instead of being returned - only
+    their small descriptor is pickled and sent back to the main process (see IngResultsTransfer). Results of
+    the whole file saved in the cache are passed by the cache entry itself, so they are written only once.
+    """
+    if task.cache_dir and task.byte_range is None:
+        model = _create_model(task)
+        func_id, results = model.get_result_frames(task.func_id)
+
+        cache_entry = model.store_cached_result_frames(results)
+        if cache_entry is not None:
+            return IngResultsDescriptor(func_id, *cache_entry, temporary=False)
+    else:
+        func_id, results = run_parse_task(task)
+
+    return export_results(func_id, results, transfer_dir=task.transfer_dir)
+
+
+def warm_up_worker() -> int:
+    """
+    No-op task - executing it in a new worker process imports this module (and the parsing stack) upfront,
+    so the first real parse task does not wait for it.
+
+    :return: Id of the worker process.
+    """
+    return os.getpid()
@@ -1,3 +1,8 @@
 from .mdl_events_data   import MdlEventsData, EventsFrameColNames
-from .mdl_frames_data   import MdlFramesData, FramesMainColNames, FramesPlayersColNames, FramesVisibleAreaColNames, MAX_PLAYER_X_COORD, MAX_PLAYER_Y_COORD, MIN_PLAYER_X_COORD, MIN_PLAYER_Y_COORD
-from .mdl_lineups_data  import MdlLineupsData, LineupsFrameColNames
\ No newline at end of file
+from .mdl_frames_data   import MdlFramesData, FramesMainColNames, FramesPlayersColNames, FramesVisibleAreaColNames, FramesPlayersFlags, MAX_PLAYER_X_COORD, MAX_PLAYER_Y_COORD, MIN_PLAYER_X_COORD, MIN_PLAYER_Y_COORD, VISIBLE_AREA_COORDS_COL, PLAYERS_FLAGS_COL
+from .mdl_lineups_data  import MdlLineupsData, LineupsFrameColNames
+from .mdl_frames_join   import MdlFramesJoin, MdlFramesJoinRow, FramesJoinColNames
+from .mdl_spatial_index import MdlSpatialIndex, MdlPitchRegion, MdlSpatialPredicate, MdlRegionCountPredicate, MdlNearestDistancePredicate, SpatialPlayersGroup, PENALTY_AREA, OWN_PENALTY_AREA, PITCH_UNITS_PER_METER
+from .mdl_events_filter import MdlEventsFilter, MdlEventsValueFilter, MdlEventsMinuteFilter, MdlEventsAllFilter, MdlEventsAnyFilter
+from .components.mdl_results_cache import MdlResultsCache
+from .components.mdl_dtype_policy  import MdlDtypePolicy
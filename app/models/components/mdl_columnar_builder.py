@@ -0,0 +1,109 @@
+"""Contains builder which collects chosen attributes of json records directly into columns of pandas DataFrame."""
+
+import numpy  as np
+import pandas as pd
+from typing import Any, Iterable
+
+
+PATH_SEPARATOR = '.'
+
+
+class MdlColumnSpec:
+    """
+    Describes single output column: its name, path to the value inside json record, optional dtype and value
+    of records missing the attribute. Path is a sequence of dictionary keys (or list indexes) or a string with parts
+    separated by dots, e.g. 'type.id' or 'location.0'.
+    """
+
+    def __init__(self, name: str, path: str | tuple = None, dtype: Any = None, missing: Any = None):
+        self.name    = name
+        self.path    = self._parse_path(name if path is None else path)
+        self.dtype   = dtype
+        self.missing = missing
+
+    @staticmethod
+    def _parse_path(path: str | tuple) -> tuple:
+        if isinstance(path, str):
+            path = path.split(PATH_SEPARATOR)
+        return tuple(int(part) if isinstance(part, str) and part.isdigit() else part for part in path)
+
+    def get_value(self, record: dict) -> Any:
+        """
+        Returns value found under column's path in given json record or None if the path does not exist.
+        """
+        value = record
+        for key in self.path:
+            if isinstance(value, dict):
+                value = value.get(key)
+            elif isinstance(value, list) and isinstance(key, int) and key < len(value):
+                value = value[key]
+            else:
+                return None
+        return value
+
+
+class MdlColumnarBuilder:
+    """
+    Accumulates values of chosen (possibly nested) attributes of consecutive json records in per-column lists.
+    Only the requested values are kept, so memory used is bounded by the size of the output columns.
+    """
+
+    def __init__(self, columns: list[str | MdlColumnSpec]):
+        self._specs: list[MdlColumnSpec] = [c if isinstance(c, MdlColumnSpec) else MdlColumnSpec(c) for c in columns]
+        self._columns: dict[str, list] = {spec.name: list() for spec in self._specs}
+        self._rows_no = 0
+
+        # top-level attributes are read directly, nested ones walk their path
+        self._getters = [
+            (self._columns[spec.name], spec.path[0] if len(spec.path) == 1 else None, spec) for spec in self._specs
+        ]
+
+    def __len__(self) -> int:
+        return self._rows_no
+
+    def append(self, record: dict):
+        if not isinstance(record, dict):
+            raise ValueError('Invalid content of json data provided. Expected list of dictionaries (json objects)')
+
+        for values, key, spec in self._getters:
+            values.append(record.get(key) if key is not None else spec.get_value(record))
+        self._rows_no += 1
+
+    def extend(self, records: Iterable[dict]):
+        for record in records:
+            self.append(record)
+
+    def to_frame(self, index_base: int = 1) -> pd.DataFrame:
+        """
+        Returns collected columns as pandas DataFrame. Rows are indexed with consecutive integers.
+        Columns with dtype specified are converted to it, the rest have dtype inferred.
+
+        :param index_base: Index of the first row.
+        :return: Pandas DataFrame
+        """
+        data = {
+            spec.name: self._to_array(self._columns[spec.name], spec) if spec.dtype is not None
+                  else self._columns[spec.name]
+            for spec in self._specs
+        }
+        df = pd.DataFrame(data, columns=list(data))
+        df.index += index_base
+
+        return df
+
+    @staticmethod
+    def _to_array(values: list, spec: MdlColumnSpec) -> np.ndarray:
+        """
+        Converts values of a column to the spec's dtype. Missing values (None) are replaced with the spec's missing
+        value - if it is not set, an integer column with missing values falls back to float64 with NaN (the same way
+        pandas infers it), instead of failing.
+        """
+        dtype = np.dtype(spec.dtype)
+        if not any(value is None for value in values):
+            return np.array(values, dtype=dtype)
+
+        if spec.missing is not None:
+            return np.array([spec.missing if value is None else value for value in values], dtype=dtype)
+        if dtype.kind in 'iu':
+            dtype = np.dtype(np.float64)
+        return np.array(values, dtype=dtype)
@@ -0,0 +1,99 @@
+"""Contains dtype compaction of result frames and measurement of memory used by them."""
+
+import numpy  as np
+import pandas as pd
+from typing import Any
+
+from app.models.components.mdl_ragged_frame   import MdlRaggedFrame
+from app.models.components.mdl_inverted_index import MdlInvertedIndex
+
+
+DTYPE_CATEGORY = 'category'
+# string column is converted to categorical only if the number of distinct values is at most such part of its length
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+class MdlDtypePolicy:
+    """
+    Maps names of DataFrame columns to compact target dtypes, e.g. int8 for match period or 'category' for
+    repeated names. Conversions never lose data: integer columns are downcast only if all their values fit
+    the target type and string columns become categorical only if their values repeat. Columns not mentioned
+    in the policy or not meeting these conditions keep their original dtype.
+    """
+
+    def __init__(self, dtypes: dict[str, Any]):
+        self._dtypes = dtypes
+
+    def get_dtypes(self) -> dict[str, Any]:
+        return self._dtypes
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns given DataFrame with columns converted to dtypes of the policy. Columns which are already
+        compact are not copied.
+
+        :param df: Pandas DataFrame
+        :return: Pandas DataFrame
+        """
+        if df.empty:
+            return df
+
+        converted = {
+            name: self._compact_column(df[name], dtype) for name, dtype in self._dtypes.items() if name in df.columns
+        }
+        converted = { name: values for name, values in converted.items() if values is not None }
+        if not converted:
+            return df
+
+        return df.assign(**converted)
+
+    @staticmethod
+    def _compact_column(values: pd.Series, dtype: Any) -> pd.Series | None:
+        """
+        Returns values converted to given dtype or None if conversion is not needed or not possible without data loss.
+        """
+        if dtype == DTYPE_CATEGORY:
+            if isinstance(values.dtype, pd.CategoricalDtype) or values.dtype != np.object_:
+                return None
+            if values.nunique(dropna=False) > CATEGORY_MAX_UNIQUE_RATIO * len(values):
+                return None
+            return values.astype(DTYPE_CATEGORY)
+
+        dtype = np.dtype(dtype)
+        if values.dtype == dtype:
+            return None
+
+        if dtype.kind in 'iu':
+            if values.dtype.kind not in 'iu':
+                return None
+            limits = np.iinfo(dtype)
+            if values.min() < limits.min or values.max() > limits.max:
+                return None
+            return values.astype(dtype)
+
+        if dtype.kind == 'f':
+            return values.astype(dtype) if values.dtype.kind in 'iuf' else None
+
+        if dtype.kind == 'b':
+            return values.astype(dtype) if values.dtype.kind == 'b' or values.isin([True, False]).all() else None
+
+        return None
+
+
+def get_memory_usage(item: Any) -> int:
+    """
+    Returns number of bytes used by given part of model's results. Size of Python objects stored in object columns
+    is included. Memory-mapped arrays (e.g. loaded from the results cache) are counted as if they were in memory.
+
+    :param item: Pandas DataFrame or Index, MdlRaggedFrame, MdlInvertedIndex or NumPy array.
+    :return: Number of bytes.
+    """
+    if isinstance(item, pd.DataFrame):
+        return int(item.memory_usage(index=True, deep=True).sum())
+    if isinstance(item, pd.Index):
+        return int(item.memory_usage(deep=True))
+    if isinstance(item, (MdlRaggedFrame, MdlInvertedIndex)):
+        return item.get_nbytes()
+    if isinstance(item, np.ndarray):
+        return int(item.nbytes)
+    raise ValueError(f'Unsupported type of item to measure memory usage: {type(item).__name__}')
@@ -0,0 +1,66 @@
+"""Contains index from values of a column to sorted positions of rows holding them."""
+
+import numpy  as np
+
+from app.models.components.mdl_ragged_frame import MdlRaggedFrame
+
+
+# name of the single column of the index - positions of rows, grouped by value
+INVERTED_INDEX_POS_COL = 'pos'
+
+
+class MdlInvertedIndex:
+    """
+    Maps every distinct value of a column to positions (0-based, ascending) of rows holding it. Positions of all values
+    are stored in a single array grouped by value, so rows of any value are found by binary search over distinct
+    values plus a slice - the column itself is not scanned.
+    """
+
+    def __init__(self, values: np.ndarray):
+        values = np.asarray(values)
+        # stable sort keeps positions of rows with the same value ascending
+        order = np.argsort(values, kind='stable')
+        self._keys, counts = np.unique(values[order], return_counts=True)
+        self._positions = MdlRaggedFrame.from_lengths(counts, { INVERTED_INDEX_POS_COL: order.astype(np.int64) })
+
+    def get_keys(self) -> np.ndarray:
+        """
+        Returns distinct values of the column in ascending order.
+        """
+        return self._keys
+
+    def get_positions(self) -> MdlRaggedFrame:
+        return self._positions
+
+    def get_nbytes(self) -> int:
+        return self._keys.nbytes + self._positions.get_nbytes()
+
+    def get_rows(self, value) -> np.ndarray:
+        """
+        Returns positions of rows holding given value - a view of the index, empty if the value does not occur.
+        """
+        key_pos = int(np.searchsorted(self._keys, value))
+        if key_pos >= len(self._keys) or self._keys[key_pos] != value:
+            return self._positions.get_empty_group()[INVERTED_INDEX_POS_COL]
+        return self._positions.get_group(key_pos)[INVERTED_INDEX_POS_COL]
+
+    def get_rows_any(self, values: list) -> np.ndarray:
+        """
+        Returns ascending positions of rows holding any of given values.
+        """
+        rows = [self.get_rows(value) for value in values]
+        if len(rows) == 1:
+            return rows[0]
+        return np.sort(np.concatenate(rows)) if rows else np.empty(0, dtype=np.int64)
+
+    def get_rows_between(self, min_value, max_value) -> np.ndarray:
+        """
+        Returns ascending positions of rows holding values from given range (both bounds included).
+        """
+        start = int(np.searchsorted(self._keys, min_value, side='left'))
+        end   = int(np.searchsorted(self._keys, max_value, side='right'))
+        if end <= start:
+            return np.empty(0, dtype=np.int64)
+
+        offsets = self._positions.get_offsets()
+        return np.sort(self._positions.get_column(INVERTED_INDEX_POS_COL)[offsets[start]:offsets[end]])
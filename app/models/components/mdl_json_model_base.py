@@ -1,16 +1,116 @@
 import json
 import pandas as pd
-from typing   import Any
+from typing   import Any, Iterator
 from abc      import ABC, abstractmethod
 from io       import StringIO
 
+from app.models.components.mdl_json_stream      import iter_json_records, split_json_array
+from app.models.components.mdl_columnar_builder import MdlColumnarBuilder, MdlColumnSpec
+from app.models.components.mdl_results_cache    import MdlResultsCache
+from app.models.components.mdl_dtype_policy     import MdlDtypePolicy, get_memory_usage
+
 
 class MdlJsonModelBase(ABC):
 
-    def __init__(self, j_filepath: str = None):
+    # names of json attributes (or MdlColumnSpec objects for nested ones) needed by the model; if defined, the source
+    # file is read record by record and only those values are collected into DataFrame columns 
+    # (no intermediate full json structure)
+    STREAM_COLUMNS: list[str | MdlColumnSpec] = None
+    # version of the layout of result frames - must be increased whenever it changes, so that cached results
+    # of older layout are not used anymore
+    RESULTS_VERSION = 1
+    # compact dtypes of columns of the model's main result frame - applied whenever result frames are set
+    DTYPE_POLICY: MdlDtypePolicy = None
+    # minimal size of a part of the source file parsed separately - if defined, the model supports parsing of 
+    # record-aligned byte ranges of the file in parallel (see get_chunk_ranges)
+    MIN_CHUNK_BYTES: int = None
+
+    def __init__(self, j_filepath: str = None, results_cache: MdlResultsCache = None):
         super(MdlJsonModelBase, self).__init__()
 
         self._j_filepath: str = j_filepath or None
+        self._results_cache: MdlResultsCache = results_cache
+
+    def set_results_cache(self, results_cache: MdlResultsCache):
+        self._results_cache = results_cache
+
+    def get_results_cache(self) -> MdlResultsCache:
+        return self._results_cache
+
+    def get_json_filepath(self) -> str:
+        return self._j_filepath
+
+    def get_parse_options(self) -> dict:
+        """
+        Returns keyword arguments of the constructor (apart from filepath and cache) needed to create a model 
+        producing the same results - e.g. in a worker process.
+        """
+        return dict()
+
+    def _get_cache_namespace(self) -> str:
+        """
+        Returns identifier of results produced by the model - results of models configured differently must not
+        share cache entries.
+        """
+        return f'{self.__class__.__name__}.v{self.RESULTS_VERSION}'
+
+    def load_cached_result_frames(self) -> tuple | None:
+        """
+        Returns result frames stored in the cache for the current version of the source file or None if the cache
+        is not set or does not contain them. Result can be passed directly to set_result_frames.
+        """
+        if not self._results_cache or not self._j_filepath:
+            return None
+        
+        return self._results_cache.load(self._j_filepath, self._get_cache_namespace())
+
+    def get_result_frames_cached(self, func_id: str) -> tuple[str, tuple]:
+        """
+        Same as get_result_frames, but also saves the results in the cache (if set) for future usage.
+        """
+        func_id, frames = self.get_result_frames(func_id)
+        self.store_cached_result_frames(frames)
+        
+        return func_id, frames
+
+    def store_cached_result_frames(self, frames: tuple) -> tuple[str, list[dict]] | None:
+        """
+        Saves given result frames in the cache (if set) as results for the current version of the source file.
+
+        :return: Directory of the cache entry and descriptors of its items - None if the results were not cached.
+        """
+        if not self._results_cache:
+            return None
+
+        return self._results_cache.store(self._j_filepath, self._get_cache_namespace(), frames)
+
+    def invalidate_cached_result_frames(self) -> int:
+        """
+        Removes all cache entries created for the source file of the model.
+
+        :return: Number of removed entries.
+        """
+        if not self._results_cache or not self._j_filepath:
+            return 0
+        
+        return self._results_cache.invalidate(self._j_filepath)
+
+    def _compact_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns given result frame with columns converted to compact dtypes of the model's policy (if defined).
+        """
+        if self.DTYPE_POLICY is None:
+            return df
+
+        return self.DTYPE_POLICY.apply(df)
+
+    def memory_usage(self) -> dict[str, int]:
+        """
+        Returns number of bytes used by every part of the model's current results.
+
+        :return: Dictionary of part name -> number of bytes.
+        """
+        return { name: get_memory_usage(item) for name, item in self._get_memory_items().items() }
 
     def set_json_filepath(self, j_filepath: str):
         self._j_filepath = j_filepath
@@ -51,7 +151,56 @@ class MdlJsonModelBase(ABC):
 
         return raw_df
     
-    def _get_raw_data_frame(self) -> pd.DataFrame:
+    def _iter_json_records(self, byte_range: tuple[int, int] = None) -> Iterator[dict]:
+        """
+        Returns generator of json objects read one by one from the top-level array of the source file
+        (or from given record-aligned byte range of it only).
+        """
+        if not self._j_filepath:
+            raise Exception(f'{self.__class__.__name__}: JSON filepath not set!')
+
+        return iter_json_records(self._j_filepath, byte_range=byte_range)
+
+    def get_chunk_ranges(self, parts_no: int) -> list[tuple[int, int]]:
+        """
+        Splits the source file into at most parts_no record-aligned byte ranges, which can be parsed independently
+        with get_result_frames_range. Parts are not smaller than MIN_CHUNK_BYTES, so small files give single range.
+
+        :return: List of (start, end) byte ranges - empty if the model or the file does not support splitting.
+        """
+        stream_columns = self._get_stream_columns()
+        if self.MIN_CHUNK_BYTES is None or stream_columns is None or not self._j_filepath:
+            return list()
+
+        # top-level attributes read by the model tell records of the array from objects nested in them
+        required_keys = {
+            spec if isinstance(spec, str) else spec.path[0] for spec in stream_columns
+        }
+        return split_json_array(self._j_filepath, parts_no, list(required_keys), min_part_bytes=self.MIN_CHUNK_BYTES)
+
+    def _get_stream_columns(self) -> list[str | MdlColumnSpec]:
+        return self.STREAM_COLUMNS
+
+    def _stream_json_table(self, columns: list[str | MdlColumnSpec], byte_range: tuple[int, int] = None) -> pd.DataFrame:
+        """
+        Parses source file to pandas DataFrame record by record, keeping only given attributes.
+
+        :param columns: Names of top-level json attributes or column specs to be collected as DataFrame columns.
+        :param byte_range: Record-aligned byte range of the file to parse (see get_chunk_ranges). Whole file if not given.
+        :return: Pandas DataFrame
+        """
+        builder = MdlColumnarBuilder(columns)
+        builder.extend(self._iter_json_records(byte_range))
+
+        return builder.to_frame(index_base=1)
+
+    def _get_raw_data_frame(self, byte_range: tuple[int, int] = None) -> pd.DataFrame:
+        stream_columns = self._get_stream_columns()
+        if stream_columns is not None:
+            return self._stream_json_table(stream_columns, byte_range)
+        if byte_range is not None:
+            raise Exception(f'{self.__class__.__name__}: parsing of byte ranges requires stream columns!')
+
         raw_json_obj = self._read_json_data()
         return self._parse_json_table(raw_json_obj)
     
@@ -59,10 +208,45 @@ class MdlJsonModelBase(ABC):
     def get_result_frames(self, func_id) -> tuple[str, tuple[pd.DataFrame]]:
         pass
 
+    def get_result_frames_range(self, func_id: str, byte_range: tuple[int, int]) -> tuple[str, tuple]:
+        """
+        Same as get_result_frames, but only records of given byte range of the source file are parsed. Results of
+        consecutive ranges are combined with merge_result_frames. Models which do not support splitting of the file
+        parse only a range covering the whole array of records (a single part).
+        """
+        if self._is_whole_file_range(byte_range):
+            return self.get_result_frames(func_id)
+
+        raise Exception(f'{self.__class__.__name__}: parsing of byte ranges not supported!')
+
+    def merge_result_frames(self, parts: list[tuple]) -> tuple:
+        """
+        Combines result frames of consecutive byte ranges (in order of the file) into result frames of the whole file.
+        Models which do not support splitting of the file merge a single part only.
+        """
+        if len(parts) == 1:
+            return parts[0]
+
+        raise Exception(f'{self.__class__.__name__}: merging of byte ranges not supported!')
+
+    def _is_whole_file_range(self, byte_range: tuple[int, int]) -> bool:
+        if not self._j_filepath:
+            return False
+
+        # a single part covers all records of the array - the required keys are needed only to find more parts
+        return split_json_array(self._j_filepath, 1, list()) == [tuple(byte_range)]
+
     @abstractmethod
     def set_result_frames(self, *args: list[pd.DataFrame]):
         pass
 
     @abstractmethod
     def reset_result_frames(self):
+        pass
+
+    @abstractmethod
+    def _get_memory_items(self) -> dict[str, Any]:
+        """
+        Returns parts of the model's current results (DataFrames, MdlRaggedFrame objects, indexes or arrays) by name.
+        """
         pass
\ No newline at end of file
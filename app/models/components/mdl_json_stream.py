@@ -0,0 +1,211 @@
+"""Contains incremental reader of json files which yields objects of the top-level array one at a time
+and splitting of the array into record-aligned byte ranges, which can be read independently."""
+
+import os
+import re
+import json
+import codecs
+from typing import Any, Iterator, TextIO, BinaryIO
+
+
+READ_CHUNK_SIZE = 1 << 16
+JSON_WHITESPACE = ' \t\n\r'
+
+# settings of searching for records' boundaries in the middle of the file
+PROBE_WINDOW_SIZE     = 1 << 16
+PROBE_MAX_WINDOW_SIZE = 1 << 26
+PROBE_OVERLAP         = 64
+RECORD_START_PATTERN  = re.compile(rb',[ \t\n\r]*\{')
+
+
+def _skip_whitespace(j_file: TextIO, buffer: str, pos: int, chunk_size: int) -> tuple[str, int]:
+    """
+    Moves the position past any json whitespace, reading further chunks of the file if the buffer runs out.
+
+    :return: Tuple of (possibly refilled) buffer and position of the first non-whitespace character in it.
+    """
+    while True:
+        while pos < len(buffer) and buffer[pos] in JSON_WHITESPACE:
+            pos += 1
+        if pos < len(buffer):
+            return buffer, pos
+
+        buffer, pos = j_file.read(chunk_size), 0
+        if not buffer:
+            return buffer, pos
+
+
+class _ByteRangeReader:
+    """
+    Reads text decoded from the given byte range of a binary file, exposing the read(size) method of text files.
+    """
+
+    def __init__(self, b_file: BinaryIO, start: int, end: int):
+        b_file.seek(start)
+        self._b_file    = b_file
+        self._remaining = end - start
+        self._decoder   = codecs.getincrementaldecoder('utf-8')()
+
+    def read(self, size: int) -> str:
+        while self._remaining > 0:
+            chunk = self._b_file.read(min(size, self._remaining))
+            if not chunk:
+                break
+            self._remaining -= len(chunk)
+            text = self._decoder.decode(chunk, final=self._remaining <= 0)
+            if text:
+                return text
+        self._remaining = 0
+        return ''
+
+
+def _iter_array_items(j_file: TextIO, buffer: str, pos: int, chunk_size: int, source: str
+                      , allow_eof: bool) -> Iterator[Any]:
+    """
+    Yields consecutive values of json array whose opening bracket is already consumed.
+
+    :param allow_eof: Whether the end of data before the closing bracket ends the array (otherwise it is an error).
+    """
+    decoder = json.JSONDecoder()
+
+    while True:
+        buffer, pos = _skip_whitespace(j_file, buffer, pos, chunk_size)
+        if not buffer:
+            if allow_eof:
+                return
+            raise ValueError(f'Unexpected end of json data in file: {source}')
+
+        if buffer[pos] == ']':
+            return
+        if buffer[pos] == ',':
+            pos += 1
+            continue
+
+        try:
+            record, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # the record is split between chunks - drop already consumed text and read further
+            next_chunk = j_file.read(chunk_size)
+            if not next_chunk:
+                raise
+            buffer, pos = buffer[pos:] + next_chunk, 0
+            continue
+
+        yield record
+
+
+def iter_json_records(j_filepath: str, chunk_size: int = READ_CHUNK_SIZE
+                      , byte_range: tuple[int, int] = None) -> Iterator[Any]:
+    """
+    Yields consecutive objects of the top-level json array stored in given file. Only a chunk of raw text and the
+    record being decoded are held in memory at once. If the file does not contain an array, the whole document is
+    yielded as a single record.
+
+    :param j_filepath: String filepath of the file containing source data.
+    :param chunk_size: Number of characters read from the file at once.
+    :param byte_range: Range (start, end) of bytes of the file to read records from - start must point at the first
+                       character of a record of the top-level array (see split_json_array).
+    :return: Generator of decoded json objects.
+    """
+    if byte_range is not None:
+        with open(j_filepath, 'rb') as b_file:
+            reader = _ByteRangeReader(b_file, *byte_range)
+            yield from _iter_array_items(reader, '', 0, chunk_size, j_filepath, allow_eof=True)
+        return
+
+    with open(j_filepath, 'r', encoding='utf-8') as j_file:
+        buffer, pos = _skip_whitespace(j_file, j_file.read(chunk_size), 0, chunk_size)
+
+        if buffer[pos:pos + 1] != '[':
+            yield json.loads(buffer[pos:] + j_file.read())
+            return
+
+        yield from _iter_array_items(j_file, buffer, pos + 1, chunk_size, j_filepath, allow_eof=False)
+
+
+def _find_record_start(b_file: BinaryIO, pos: int, required_keys: set[str]) -> int | None:
+    """
+    Returns byte position of the first record of the top-level array starting at or after given position or None if
+    there is no such record. Candidates are objects following a comma - a candidate is accepted only if it decodes
+    to a dictionary with all required keys and is followed by a comma or the end of the array, which rules out
+    objects nested in records.
+    """
+    decoder = json.JSONDecoder()
+    window_size = PROBE_WINDOW_SIZE
+
+    while True:
+        b_file.seek(pos)
+        window = b_file.read(window_size)
+        is_last = len(window) < window_size
+        # whether a candidate may be cut by the end of the window - then the window is enlarged and searched again
+        truncated = False
+
+        for match in RECORD_START_PATTERN.finditer(window):
+            brace = match.end() - 1
+            text  = window[brace:].decode('utf-8', errors='ignore')
+            try:
+                record, end = decoder.raw_decode(text)
+            except json.JSONDecodeError:
+                truncated = not is_last and window_size < PROBE_MAX_WINDOW_SIZE
+                if truncated:
+                    break
+                continue
+
+            if not isinstance(record, dict) or not required_keys.issubset(record):
+                continue
+            following = text[end:].lstrip(JSON_WHITESPACE)[:1]
+            if not following and not is_last:
+                truncated = True
+                break
+            if following in (',', ']'):
+                return pos + brace
+
+        if truncated:
+            window_size *= 2
+        elif is_last:
+            return None
+        else:
+            # pattern can be cut by the end of the window - next window overlaps the current one
+            pos += len(window) - PROBE_OVERLAP
+
+
+def split_json_array(j_filepath: str, parts_no: int, required_keys: list[str]
+                     , min_part_bytes: int = 0) -> list[tuple[int, int]]:
+    """
+    Splits the top-level json array of given file into byte ranges of similar size, each containing whole records
+    only. Ranges can be read independently (and in parallel) with iter_json_records - records of consecutive
+    ranges follow the order of the file.
+
+    :param j_filepath: String filepath of the file containing source data.
+    :param parts_no: Maximal number of ranges.
+    :param required_keys: Keys which every record of the array contains - used to tell records from nested objects.
+    :param min_part_bytes: Minimal size of a single range - limits number of ranges of small files.
+    :return: List of (start, end) byte ranges - empty if the file does not contain an array of objects.
+    """
+    size = os.path.getsize(j_filepath)
+    parts_no = max(1, min(parts_no, size // max(1, min_part_bytes)))
+
+    with open(j_filepath, 'rb') as b_file:
+        head = b_file.read(PROBE_WINDOW_SIZE)
+        array_start = len(head) - len(head.lstrip(JSON_WHITESPACE.encode()))
+        if head[array_start:array_start + 1] != b'[':
+            return list()
+
+        first = array_start + 1
+        while first < len(head) and head[first:first + 1] in JSON_WHITESPACE.encode():
+            first += 1
+        if head[first:first + 1] != b'{':
+            return list()
+
+        bounds = [first]
+        for part_no in range(1, parts_no):
+            target = first + part_no * (size - first) // parts_no
+            if target <= bounds[-1]:
+                continue
+            start = _find_record_start(b_file, target, set(required_keys))
+            if start is None:
+                break
+            if start > bounds[-1]:
+                bounds.append(start)
+
+    return list(zip(bounds, bounds[1:] + [size]))
@@ -0,0 +1,104 @@
+"""Contains container for variable-length groups of rows stored as flat column arrays plus offsets."""
+
+import numpy  as np
+import pandas as pd
+
+
+class MdlRaggedFrame:
+    """
+    Stores variable-length groups of rows (e.g. all players of a single 360 frame) as flat NumPy column arrays and
+    an offsets array. Rows of the group with position i are stored in range offsets[i]:offsets[i + 1] of every column,
+    so access to any group is a constant-time slice.
+    """
+
+    def __init__(self, offsets: np.ndarray, columns: dict[str, np.ndarray]):
+        self._offsets = np.asarray(offsets, dtype=np.int64)
+        self._columns = columns
+
+        for name, values in self._columns.items():
+            if len(values) != self._offsets[-1]:
+                raise ValueError(f'{self.__class__.__name__}: invalid length of column "{name}"')
+
+    @classmethod
+    def from_lengths(cls, lengths: np.ndarray, columns: dict[str, np.ndarray]) -> 'MdlRaggedFrame':
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(offsets, columns)
+
+    @classmethod
+    def empty(cls, columns: dict[str, np.dtype]) -> 'MdlRaggedFrame':
+        return cls(np.zeros(1, dtype=np.int64), {name: np.empty(0, dtype=dtype) for name, dtype in columns.items()})
+
+    @classmethod
+    def concat(cls, frames: list['MdlRaggedFrame']) -> 'MdlRaggedFrame':
+        """
+        Returns single frame with groups of given frames, in order. All frames must have the same columns.
+        """
+        lengths = np.concatenate([frame.get_lengths() for frame in frames])
+        columns = {
+            name: np.concatenate([frame.get_column(name) for frame in frames]) for name in frames[0].get_column_names()
+        }
+        return cls.from_lengths(lengths, columns)
+
+    def get_groups_no(self) -> int:
+        return len(self._offsets) - 1
+
+    def get_rows_no(self) -> int:
+        return int(self._offsets[-1])
+
+    def get_offsets(self) -> np.ndarray:
+        return self._offsets
+
+    def get_lengths(self) -> np.ndarray:
+        return np.diff(self._offsets)
+
+    def get_column_names(self) -> list[str]:
+        return list(self._columns)
+
+    def get_column(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def get_bounds(self, group_pos: int) -> tuple[int, int]:
+        """
+        Returns range of rows belonging to the group with given position (0-based).
+        """
+        return int(self._offsets[group_pos]), int(self._offsets[group_pos + 1])
+
+    def get_group(self, group_pos: int) -> dict[str, np.ndarray]:
+        """
+        Returns columns of the group with given position (0-based). Arrays returned are views - no data is copied.
+        """
+        start, end = self.get_bounds(group_pos)
+        return {name: values[start:end] for name, values in self._columns.items()}
+
+    def get_empty_group(self) -> dict[str, np.ndarray]:
+        """
+        Returns zero-length views of all columns - stands for a group that does not exist.
+        """
+        return {name: values[:0] for name, values in self._columns.items()}
+
+    def get_group_index(self) -> np.ndarray:
+        """
+        Returns position of the owning group for every row.
+        """
+        return np.repeat(np.arange(self.get_groups_no(), dtype=np.int64), self.get_lengths())
+
+    def get_inner_index(self) -> np.ndarray:
+        """
+        Returns number of every row in the scope of its group (0 for the first row of each group).
+        """
+        return np.arange(self.get_rows_no(), dtype=np.int64) - np.repeat(self._offsets[:-1], self.get_lengths())
+
+    def get_nbytes(self) -> int:
+        return self._offsets.nbytes + sum(values.nbytes for values in self._columns.values())
+
+    def to_frame(self, index_base: int = 1) -> pd.DataFrame:
+        """
+        Returns all rows as pandas DataFrame. Each row is indexed with the position of its group plus given base,
+        so rows of the same group share the index value.
+
+        :param index_base: Index of the first group.
+        :return: Pandas DataFrame
+        """
+        index = pd.Index(self.get_group_index() + index_base)
+        return pd.DataFrame(self._columns, index=index, columns=self.get_column_names())
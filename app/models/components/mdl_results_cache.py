@@ -0,0 +1,189 @@
+"""Contains persistent on-disk cache of models' result frames, keyed by fingerprint of the source json file."""
+
+import os
+import json
+import time
+import shutil
+import pickle
+import hashlib
+import tempfile
+
+from app.models.components.mdl_results_files import save_results, load_results, get_dir_size
+
+
+DEFAULT_CACHE_DIR       = './resources/generated/cache'
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+CACHE_FORMAT_VERSION    = 1
+MANIFEST_FILE_NAME      = 'manifest.json'
+HASH_CHUNK_SIZE         = 1 << 20
+
+
+class MdlResultsCache:
+    """
+    Stores result frames of json models on disk, so that unchanged source files do not need to be parsed again.
+    Every entry is a directory with a manifest and one binary .npy file per column, which allows loading numeric
+    columns as memory-mapped arrays. Entries are keyed by path, size, modification time and content hash of
+    the source file. Total size of the cache is bounded - least recently used entries are evicted first.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_BYTES
+                 , mmap: bool = True):
+        self._cache_dir = cache_dir
+        self._max_bytes = max_bytes
+        self._mmap_mode = 'r' if mmap else None
+
+    def get_cache_dir(self) -> str:
+        return self._cache_dir
+
+    def get_max_bytes(self) -> int:
+        return self._max_bytes
+
+    def is_mmap(self) -> bool:
+        return self._mmap_mode is not None
+
+    def set_max_bytes(self, max_bytes: int):
+        self._max_bytes = max_bytes
+        self._evict()
+
+    @staticmethod
+    def get_fingerprint(j_filepath: str) -> dict:
+        """
+        Returns description of the source file identifying its current version: absolute path, size,
+        modification time and content hash.
+        """
+        stat = os.stat(j_filepath)
+        content_hash = hashlib.blake2b(digest_size=16)
+        with open(j_filepath, 'rb') as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                content_hash.update(chunk)
+
+        return {
+              'path'  : os.path.abspath(j_filepath)
+            , 'size'  : stat.st_size
+            , 'mtime' : stat.st_mtime_ns
+            , 'hash'  : content_hash.hexdigest()
+        }
+
+    def _get_key(self, fingerprint: dict, namespace: str) -> str:
+        key_src = json.dumps([CACHE_FORMAT_VERSION, namespace, fingerprint], sort_keys=True)
+        return hashlib.blake2b(key_src.encode('utf-8'), digest_size=16).hexdigest()
+
+    def load(self, j_filepath: str, namespace: str) -> tuple | None:
+        """
+        Returns result frames stored for the current version of given source file or None if there is no such entry.
+
+        :param j_filepath: String filepath of the source json file.
+        :param namespace: Identifier of the producer of results (e.g. model's class name).
+        :return: Tuple of pandas DataFrames / MdlRaggedFrame objects or None.
+        """
+        entry_dir = os.path.join(self._cache_dir, self._get_key(self.get_fingerprint(j_filepath), namespace))
+        manifest_path = os.path.join(entry_dir, MANIFEST_FILE_NAME)
+        if not os.path.isfile(manifest_path):
+            return None
+
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+            results = load_results(entry_dir, manifest['items'], mmap_mode=self._mmap_mode)
+        except (OSError, ValueError, KeyError, pickle.UnpicklingError):
+            self._remove_entry(entry_dir)
+            return None
+
+        # modification time of the manifest marks the last usage of the entry (for eviction)
+        os.utime(manifest_path)
+        return results
+
+    def store(self, j_filepath: str, namespace: str, results: tuple) -> tuple[str, list[dict]] | None:
+        """
+        Saves result frames computed for the current version of given source file.
+
+        :param j_filepath: String filepath of the source json file.
+        :param namespace: Identifier of the producer of results (e.g. model's class name).
+        :param results: Tuple of pandas DataFrames / MdlRaggedFrame objects.
+        :return: Directory of the entry and descriptors of its items (see load_results) - None if the entry
+                 was evicted at once (results bigger than the size limit).
+        """
+        fingerprint = self.get_fingerprint(j_filepath)
+        entry_dir = os.path.join(self._cache_dir, self._get_key(fingerprint, namespace))
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+        # entry is written to temporary directory first, so that readers never see partial entries
+        tmp_dir = tempfile.mkdtemp(dir=self._cache_dir, prefix='.tmp_')
+        try:
+            items = save_results(tmp_dir, results)
+            manifest = {
+                  'version'    : CACHE_FORMAT_VERSION
+                , 'namespace'  : namespace
+                , 'source'     : fingerprint
+                , 'created'    : time.time()
+                , 'nbytes'     : get_dir_size(tmp_dir)
+                , 'items'      : items
+            }
+            with open(os.path.join(tmp_dir, MANIFEST_FILE_NAME), 'w') as f:
+                json.dump(manifest, f)
+
+            self._remove_entry(entry_dir)
+            os.replace(tmp_dir, entry_dir)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self._evict()
+        return (entry_dir, items) if os.path.isdir(entry_dir) else None
+
+    def invalidate(self, j_filepath: str = None) -> int:
+        """
+        Removes cache entries created for given source file (regardless of its version) or all entries
+        if no filepath is given.
+
+        :return: Number of removed entries.
+        """
+        source_path = os.path.abspath(j_filepath) if j_filepath else None
+        removed = 0
+        for entry_dir, manifest in self._iter_entries():
+            if source_path is None or manifest['source']['path'] == source_path:
+                removed += int(self._remove_entry(entry_dir))
+        return removed
+
+    def get_size(self) -> int:
+        return sum(manifest['nbytes'] for _, manifest in self._iter_entries())
+
+    def _iter_entries(self) -> list[tuple[str, dict]]:
+        if not os.path.isdir(self._cache_dir):
+            return list()
+
+        entries = list()
+        for name in os.listdir(self._cache_dir):
+            manifest_path = os.path.join(self._cache_dir, name, MANIFEST_FILE_NAME)
+            try:
+                with open(manifest_path, 'r') as f:
+                    entries.append((os.path.join(self._cache_dir, name), json.load(f)))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def _evict(self):
+        """
+        Removes least recently used entries until total size of the cache does not exceed the limit.
+        """
+        entries = self._iter_entries()
+        total = sum(manifest['nbytes'] for _, manifest in entries)
+        if total <= self._max_bytes:
+            return
+
+        last_used = lambda entry: os.path.getmtime(os.path.join(entry[0], MANIFEST_FILE_NAME))
+        for entry_dir, manifest in sorted(entries, key=last_used):
+            if total <= self._max_bytes:
+                break
+            if self._remove_entry(entry_dir):
+                total -= manifest['nbytes']
+
+    @staticmethod
+    def _remove_entry(entry_dir: str) -> bool:
+        if not os.path.isdir(entry_dir):
+            return False
+        try:
+            shutil.rmtree(entry_dir)
+        except OSError:
+            # entry can be still memory-mapped by the process (e.g. on Windows) - it will be removed later
+            return False
+        return True
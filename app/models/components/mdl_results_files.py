@@ -0,0 +1,136 @@
+"""Contains functions which save models' result frames as binary per-column files and load them back (memory-mapped)."""
+
+import os
+import pickle
+import numpy  as np
+import pandas as pd
+from typing import Any
+
+from app.models.components.mdl_ragged_frame import MdlRaggedFrame
+
+
+ITEM_KIND_FRAME   = 'frame'
+ITEM_KIND_RAGGED  = 'ragged'
+ARRAY_KIND_PLAIN  = 'array'
+ARRAY_KIND_STR    = 'str'
+ARRAY_KIND_CAT    = 'category'
+ARRAY_KIND_PICKLE = 'pickle'
+
+
+def save_results(dir_path: str, results: tuple) -> list[dict]:
+    """
+    Saves result frames in given directory - one .npy file per column (or .pkl file for columns of arbitrary objects).
+
+    :param dir_path: Existing directory for the files.
+    :param results: Tuple of pandas DataFrames / MdlRaggedFrame objects.
+    :return: List of json-serializable descriptors of saved items, needed to load them.
+    """
+    return [_save_item(dir_path, f'i{no}', item) for no, item in enumerate(results)]
+
+
+def load_results(dir_path: str, items: list[dict], mmap_mode: str = 'r') -> tuple:
+    """
+    Loads result frames saved by save_results. Numeric columns are memory-mapped if mmap_mode is given, so their data
+    is not copied into the process memory.
+
+    :param dir_path: Directory containing the files.
+    :param items: Descriptors of saved items returned by save_results.
+    :param mmap_mode: Mode of memory mapping of numeric columns (see numpy.load) or None to read them into memory.
+    :return: Tuple of pandas DataFrames / MdlRaggedFrame objects.
+    """
+    return tuple(_load_item(dir_path, item, mmap_mode) for item in items)
+
+
+def get_dir_size(dir_path: str) -> int:
+    return sum(os.path.getsize(os.path.join(dir_path, name)) for name in os.listdir(dir_path))
+
+
+def _save_item(dir_path: str, name: str, item: Any) -> dict:
+    if isinstance(item, pd.DataFrame):
+        return {
+              'kind'   : ITEM_KIND_FRAME
+            , 'index'  : _save_index(dir_path, f'{name}_index', item.index)
+            , 'columns': [
+                  dict(name=col, **_save_array(dir_path, f'{name}_c{no}', item[col]))
+                  for no, col in enumerate(item.columns)
+              ]
+        }
+    if isinstance(item, MdlRaggedFrame):
+        return {
+              'kind'   : ITEM_KIND_RAGGED
+            , 'offsets': _save_array(dir_path, f'{name}_offsets', item.get_offsets())
+            , 'columns': [
+                  dict(name=col, **_save_array(dir_path, f'{name}_c{no}', item.get_column(col)))
+                  for no, col in enumerate(item.get_column_names())
+              ]
+        }
+    raise ValueError(f'Unsupported type of result item: {type(item).__name__}')
+
+
+def _load_item(dir_path: str, item: dict, mmap_mode: str) -> pd.DataFrame | MdlRaggedFrame:
+    columns = {col['name']: _load_array(dir_path, col, mmap_mode) for col in item['columns']}
+
+    if item['kind'] == ITEM_KIND_FRAME:
+        index = _load_index(dir_path, item['index'], mmap_mode)
+        return pd.DataFrame(columns, index=index, columns=list(columns), copy=False)
+    if item['kind'] == ITEM_KIND_RAGGED:
+        return MdlRaggedFrame(_load_array(dir_path, item['offsets'], mmap_mode), columns)
+    raise ValueError(f'Unsupported kind of saved result item: {item["kind"]}')
+
+
+def _save_index(dir_path: str, name: str, index: pd.Index) -> dict:
+    if isinstance(index, pd.RangeIndex):
+        return { 'range': [index.start, index.stop, index.step] }
+    return _save_array(dir_path, name, index)
+
+
+def _load_index(dir_path: str, desc: dict, mmap_mode: str) -> pd.Index:
+    if 'range' in desc:
+        return pd.RangeIndex(*desc['range'])
+    return pd.Index(_load_array(dir_path, desc, mmap_mode))
+
+
+def _save_array(dir_path: str, name: str, values: Any) -> dict:
+    """
+    Saves column values in the most compact binary form available and returns descriptor needed to load them.
+    """
+    dtype = getattr(values, 'dtype', None)
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        return {
+              'kind'      : ARRAY_KIND_CAT
+            , 'codes'     : _save_array(dir_path, f'{name}_codes', values.cat.codes.to_numpy())
+            , 'categories': _save_array(dir_path, f'{name}_cats', values.cat.categories)
+            , 'ordered'   : bool(dtype.ordered)
+        }
+
+    if isinstance(dtype, np.dtype) and dtype != np.object_:
+        np.save(os.path.join(dir_path, f'{name}.npy'), np.asarray(values), allow_pickle=False)
+        return { 'kind': ARRAY_KIND_PLAIN, 'file': f'{name}.npy' }
+
+    if pd.api.types.infer_dtype(values, skipna=False) == 'string':
+        np.save(os.path.join(dir_path, f'{name}.npy'), np.asarray(values, dtype=np.str_), allow_pickle=False)
+        return { 'kind': ARRAY_KIND_STR, 'file': f'{name}.npy' }
+
+    with open(os.path.join(dir_path, f'{name}.pkl'), 'wb') as f:
+        pickle.dump(np.asarray(values, dtype=object), f, protocol=pickle.HIGHEST_PROTOCOL)
+    return { 'kind': ARRAY_KIND_PICKLE, 'file': f'{name}.pkl' }
+
+
+def _load_array(dir_path: str, desc: dict, mmap_mode: str) -> Any:
+    if desc['kind'] == ARRAY_KIND_CAT:
+        return pd.Categorical.from_codes(
+              _load_array(dir_path, desc['codes'], mmap_mode)
+            , categories=_load_array(dir_path, desc['categories'], mmap_mode)
+            , ordered=desc['ordered'])
+
+    path = os.path.join(dir_path, desc['file'])
+    if desc['kind'] == ARRAY_KIND_PLAIN:
+        # plain ndarray view keeps the data memory-mapped, but is treated by pandas like any other array
+        return np.load(path, mmap_mode=mmap_mode, allow_pickle=False).view(np.ndarray)
+    if desc['kind'] == ARRAY_KIND_STR:
+        return np.load(path, allow_pickle=False).astype(object)
+    if desc['kind'] == ARRAY_KIND_PICKLE:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    raise ValueError(f'Unsupported kind of saved array: {desc["kind"]}')
@@ -1,7 +1,19 @@
 from enum     import Enum
+import numpy  as np
 import pandas as pd
+from typing   import Any
 
-from app.models.components.mdl_json_model_base import MdlJsonModelBase
+from app.models.components.mdl_json_model_base  import MdlJsonModelBase
+from app.models.components.mdl_columnar_builder import MdlColumnSpec
+from app.models.components.mdl_results_cache    import MdlResultsCache
+from app.models.components.mdl_dtype_policy     import MdlDtypePolicy, DTYPE_CATEGORY
+from app.models.components.mdl_inverted_index   import MdlInvertedIndex
+
+
+# events are indexed by minute in buckets of that many minutes
+MINUTE_BUCKET_SIZE = 5
+# time of events which timestamp cannot be parsed
+NO_TIMESTAMP_MS = -1
 
 
 class EventsJsonAttrNames(Enum):
@@ -41,61 +53,187 @@ class MdlEventsData(MdlJsonModelBase):
     EAN = EventsJsonAttrNames
     ECN = EventsFrameColNames
 
-    def __init__(self, j_filepath: str = None):
-        super(MdlEventsData, self).__init__(j_filepath=j_filepath)
+    # columns of the events frame with paths to their values in json record - nested attributes
+    # (e.g. event's "type" dictionary) are normalized to separate columns while the file is read
+    STREAM_COLUMNS = [
+        MdlColumnSpec(ECN.ID.value             , EAN.ID.value),
+        MdlColumnSpec(ECN.PERIOD.value         , EAN.PERIOD.value),
+        MdlColumnSpec(ECN.TIMESTAMP.value      , EAN.TIMESTAMP.value),
+        MdlColumnSpec(ECN.MINUTE.value         , EAN.MINUTE.value),
+        MdlColumnSpec(ECN.SECOND.value         , EAN.SECOND.value),
+        MdlColumnSpec(ECN.TYPE_ID.value        , (EAN.TYPE.value, EAN.TYPE_ID.value), np.int64),
+        MdlColumnSpec(ECN.TYPE_NAME.value      , (EAN.TYPE.value, EAN.TYPE_NAME.value)),
+        MdlColumnSpec(ECN.EVENT_TEAM_ID.value  , (EAN.EVENT_TEAM.value, EAN.EVENT_TEAM_ID.value), np.int64),
+        MdlColumnSpec(ECN.EVENT_TEAM_NAME.value, (EAN.EVENT_TEAM.value, EAN.EVENT_TEAM_NAME.value))
+    ]
+    # columns with inverted indexes (see get_event_positions_by_values)
+    INDEXED_COLUMNS = [ ECN.TYPE_ID, ECN.EVENT_TEAM_ID, ECN.PERIOD ]
+    # UUIDs and timestamps are unique per event, so they stay as strings
+    DTYPE_POLICY = MdlDtypePolicy({
+          ECN.PERIOD.value         : np.int8
+        , ECN.MINUTE.value         : np.int16
+        , ECN.SECOND.value         : np.int8
+        , ECN.TYPE_ID.value        : np.int16
+        , ECN.TYPE_NAME.value      : DTYPE_CATEGORY
+        , ECN.EVENT_TEAM_ID.value  : np.int32
+        , ECN.EVENT_TEAM_NAME.value: DTYPE_CATEGORY
+    })
+
+    def __init__(self, j_filepath: str = None, extra_columns: list[MdlColumnSpec] = None
+                 , results_cache: MdlResultsCache = None):
+        """
+        :param j_filepath: String filepath of the file containing source data.
+        :param extra_columns: Additional columns to be extracted from event records, e.g. 
+                              MdlColumnSpec('possession_team_name', 'possession_team.name') or 
+                              MdlColumnSpec('location_x', 'location.0', np.float64).
+        :param results_cache: Optional cache of result frames.
+        """
+        super(MdlEventsData, self).__init__(j_filepath=j_filepath, results_cache=results_cache)
+        self._extra_columns: list[MdlColumnSpec] = list(extra_columns or [])
         self._events_frame = self._get_empty_events_frame()
+        self._build_indexes()
+
+    def get_parse_options(self) -> dict:
+        return { 'extra_columns': list(self._extra_columns) }
+
+    def _get_stream_columns(self) -> list[MdlColumnSpec]:
+        return self.STREAM_COLUMNS + self._extra_columns
+
+    def _get_cache_namespace(self) -> str:
+        extra = ','.join(f'{spec.name}:{spec.path}:{spec.dtype}' for spec in self._extra_columns)
+        return f'{super(MdlEventsData, self)._get_cache_namespace()}[{extra}]'
 
     def _get_empty_events_frame(self) -> pd.DataFrame:
-        return pd.DataFrame(columns=[e.value for e in self.ECN])
+        return pd.DataFrame(columns=[spec.name for spec in self._get_stream_columns()])
+    
+    def get_events_frame(self) -> pd.DataFrame:
+        return self._events_frame
+
+    def _build_indexes(self):
+        """
+        Builds hash index from event's UUID to the position of event's row in the events frame, so that event lookups 
+        do not scan the whole frame. If UUID repeats, its first occurrence is indexed. Inverted indexes of
+        INDEXED_COLUMNS and of minute buckets are built for searching events by their details.
+        """
+        ids = self._events_frame[self.ECN.ID.value]
+        first_occurrence = ~ids.duplicated(keep='first').to_numpy()
+
+        self._uuid_index     = pd.Index(ids.to_numpy()[first_occurrence])
+        self._uuid_positions = np.flatnonzero(first_occurrence)
+        # pandas builds hash table lazily on the first lookup - build it upfront
+        self._uuid_index.get_indexer(self._uuid_index[:1])
+
+        self._minutes = self._events_frame[self.ECN.MINUTE.value].to_numpy()
+        self._seconds = self._events_frame[self.ECN.SECOND.value].to_numpy()
+        self._timestamps_ms = self._parse_timestamps(self._events_frame[self.ECN.TIMESTAMP.value])
+
+        # inverted indexes - value -> ascending positions of events' rows
+        self._value_indexes: dict[str, MdlInvertedIndex] = {
+            col.value: MdlInvertedIndex(self._events_frame[col.value].to_numpy()) for col in self.INDEXED_COLUMNS
+        }
+        self._minute_bucket_index = MdlInvertedIndex(self._minutes // MINUTE_BUCKET_SIZE)
+
+    @staticmethod
+    def _parse_timestamps(timestamps: pd.Series) -> np.ndarray:
+        """
+        Converts "HH:MM:SS.fff" timestamps (time since the start of event's period) to integer milliseconds.
+        Invalid timestamps become NO_TIMESTAMP_MS.
+        """
+        timedeltas = pd.to_timedelta(timestamps.astype(object), errors='coerce')
+        values = timedeltas.to_numpy(dtype='timedelta64[ms]').astype(np.int64)
+        values[timedeltas.isna().to_numpy()] = NO_TIMESTAMP_MS
+        return values
+
+    def get_timestamps_ms(self) -> np.ndarray:
+        """
+        Returns time (in milliseconds) since the start of the period of every event - by position of event's row.
+        """
+        return self._timestamps_ms
+
+    def get_event_positions_by_values(self, col: EventsFrameColNames, values: list) -> np.ndarray:
+        """
+        Returns ascending positions (0-based) of rows of events with any of given values in the indexed column
+        (see INDEXED_COLUMNS).
+        """
+        return self._value_indexes[col.value].get_rows_any(values)
+
+    def get_event_positions_by_minutes(self, min_minute: int, max_minute: int) -> np.ndarray:
+        """
+        Returns ascending positions (0-based) of rows of events from given range of minutes (both included).
+        Only events of buckets overlapping the range are checked.
+        """
+        rows = self._minute_bucket_index.get_rows_between(min_minute // MINUTE_BUCKET_SIZE, max_minute // MINUTE_BUCKET_SIZE)
+        minutes = self._minutes[rows]
+        return rows[(minutes >= min_minute) & (minutes <= max_minute)]
+
+    def get_periods(self) -> list[int]:
+        return [ int(period) for period in self._value_indexes[self.ECN.PERIOD.value].get_keys() ]
+
+    def get_event_types(self) -> list[tuple[int, str]]:
+        """
+        Returns (type id, type name) of all types of events occurring in data, ordered by type id.
+        """
+        type_index = self._value_indexes[self.ECN.TYPE_ID.value]
+        names = self._events_frame[self.ECN.TYPE_NAME.value].to_numpy()
+        return [ (int(type_id), str(names[type_index.get_rows(type_id)[0]])) for type_id in type_index.get_keys() ]
+
+    def get_event_position_by_uuid(self, uuid: str) -> int:
+        """
+        Returns position (0-based) of the event's row in the events frame or -1 if there is no such event.
+        """
+        try:
+            return int(self._uuid_positions[self._uuid_index.get_loc(uuid)])
+        except (KeyError, TypeError):
+            return -1
+
+    def get_event_positions_by_uuids(self, uuids: list[str] | np.ndarray) -> np.ndarray:
+        """
+        Returns positions (0-based) of rows of many events in the events frame at once, -1 for not existing events.
+        """
+        found = self._uuid_index.get_indexer(uuids)
+        positions = np.full(len(found), -1, dtype=np.int64)
+        positions[found >= 0] = self._uuid_positions[found[found >= 0]]
+        return positions
     
     def get_events_frame_by_event_uuid(self, uuid: str) -> pd.DataFrame:
-        return self._events_frame.loc[self._events_frame[self.ECN.ID.value] == uuid]
+        pos = self.get_event_position_by_uuid(uuid)
+        if pos < 0:
+            return self._events_frame.iloc[0:0]
+        
+        return self._events_frame.iloc[pos:pos + 1]
+    
+    def get_events_frame_by_event_uuids(self, uuids: list[str] | np.ndarray) -> pd.DataFrame:
+        positions = self.get_event_positions_by_uuids(uuids)
+        return self._events_frame.iloc[positions[positions >= 0]]
     
     def reset_result_frames(self):
         self._events_frame = self._get_empty_events_frame()
+        self._build_indexes()
 
     def get_timestamp_raw_by_event_uuid(self, uuid: str) -> tuple[int, int]:
         if not uuid:
             return None, None
         
-        df = self._events_frame
-        
-        mmn = df.loc[df[self.ECN.ID.value] == uuid, self.ECN.MINUTE.value].item()
-        sec = df.loc[df[self.ECN.ID.value] == uuid, self.ECN.SECOND.value].item()
+        pos = self.get_event_position_by_uuid(uuid)
+        if pos < 0:
+            return None, None
 
-        return mmn, sec
+        return int(self._minutes[pos]), int(self._seconds[pos])
 
     def get_result_frames(self, func_id: str) -> tuple[str, tuple[pd.DataFrame]]:
-        eframe_columns =[
-            self.EAN.ID.value,
-            self.EAN.PERIOD.value,
-            self.EAN.TIMESTAMP.value,
-            self.EAN.MINUTE.value,
-            self.EAN.SECOND.value,
-            self.EAN.TYPE.value,
-            self.EAN.EVENT_TEAM.value
-        ]
         raw_df = self._get_raw_data_frame()
-        raw_df: pd.DataFrame = raw_df[eframe_columns]
-
-        # normalize event's "type" column (which originally contains dictionary with two keys)
-        # to two separate columns, assuring the order of dictionary keys
-        raw_df[[
-                self.ECN.TYPE_ID.value
-              , self.ECN.TYPE_NAME.value]
-            ] = raw_df[self.EAN.TYPE.value].apply(func = lambda x: pd.Series({ 'c1':x[self.EAN.TYPE_ID.value]
-                                                                              ,'c2':x[self.EAN.TYPE_NAME.value]}))
-        raw_df.drop(columns=[self.EAN.TYPE.value])
-
-        # normalize event's "team" column
-        raw_df[[
-                self.ECN.EVENT_TEAM_ID.value
-              , self.ECN.EVENT_TEAM_NAME.value]
-            ] = raw_df[self.EAN.EVENT_TEAM.value].apply(func = lambda x: pd.Series({ 'c1':x[self.EAN.EVENT_TEAM_ID.value]
-                                                                                    ,'c2':x[self.EAN.EVENT_TEAM_NAME.value]}))
-        raw_df.drop(columns=[self.EAN.EVENT_TEAM.value])
-
         return func_id, (raw_df, )
 
     def set_result_frames(self, events_frame: pd.DataFrame):
-        self._events_frame = events_frame
\ No newline at end of file
+        self._events_frame = self._compact_frame(events_frame)
+        self._build_indexes()
+
+    def _get_memory_items(self) -> dict[str, Any]:
+        return {
+              'events_frame'  : self._events_frame
+            , 'uuid_index'    : self._uuid_index
+            , 'uuid_positions': self._uuid_positions
+            , 'timestamps_ms' : self._timestamps_ms
+            , **{ f'{col}_index': index for col, index in self._value_indexes.items() }
+            , 'minute_bucket_index': self._minute_bucket_index
+        }
@@ -0,0 +1,87 @@
+from functools import reduce
+from abc       import ABC, abstractmethod
+import numpy  as np
+
+from app.models.mdl_events_data import MdlEventsData, EventsFrameColNames
+
+
+class MdlEventsFilter(ABC):
+    """
+    Condition on events' details evaluated with inverted indexes of the events' data - no table is scanned.
+    Filters are composed with & (all conditions) and | (any condition).
+    """
+
+    @abstractmethod
+    def evaluate(self, events_model: MdlEventsData) -> np.ndarray:
+        """
+        :return: Ascending positions (0-based) of rows of events fulfilling the condition.
+        """
+        pass
+
+    def __and__(self, other: 'MdlEventsFilter') -> 'MdlEventsFilter':
+        return MdlEventsAllFilter([self, other])
+
+    def __or__(self, other: 'MdlEventsFilter') -> 'MdlEventsFilter':
+        return MdlEventsAnyFilter([self, other])
+
+
+class MdlEventsValueFilter(MdlEventsFilter):
+    """
+    Value of the indexed column (see MdlEventsData.INDEXED_COLUMNS) is one of given values.
+    """
+
+    def __init__(self, col: EventsFrameColNames, values: list):
+        self.col    = col
+        self.values = list(values)
+
+    def evaluate(self, events_model: MdlEventsData) -> np.ndarray:
+        return events_model.get_event_positions_by_values(self.col, self.values)
+
+
+class MdlEventsMinuteFilter(MdlEventsFilter):
+    """
+    Minute of the event is between min_minute and max_minute (both included).
+    """
+
+    def __init__(self, min_minute: int, max_minute: int):
+        self.min_minute = min_minute
+        self.max_minute = max_minute
+
+    def evaluate(self, events_model: MdlEventsData) -> np.ndarray:
+        return events_model.get_event_positions_by_minutes(self.min_minute, self.max_minute)
+
+
+class MdlEventsAllFilter(MdlEventsFilter):
+    """
+    All given filters are fulfilled - without filters, all events are.
+    """
+
+    def __init__(self, filters: list[MdlEventsFilter]):
+        self.filters = list(filters)
+
+    def evaluate(self, events_model: MdlEventsData) -> np.ndarray:
+        if not self.filters:
+            return np.arange(len(events_model.get_events_frame()), dtype=np.int64)
+
+        # the smallest sets are intersected first
+        positions = sorted((events_filter.evaluate(events_model) for events_filter in self.filters), key=len)
+        return reduce(lambda left, right: np.intersect1d(left, right, assume_unique=True), positions)
+
+    def __and__(self, other: MdlEventsFilter) -> MdlEventsFilter:
+        return MdlEventsAllFilter(self.filters + [other])
+
+
+class MdlEventsAnyFilter(MdlEventsFilter):
+    """
+    Any of given filters is fulfilled - without filters, no event is.
+    """
+
+    def __init__(self, filters: list[MdlEventsFilter]):
+        self.filters = list(filters)
+
+    def evaluate(self, events_model: MdlEventsData) -> np.ndarray:
+        positions = [events_filter.evaluate(events_model) for events_filter in self.filters]
+        return reduce(np.union1d, positions) if positions else np.empty(0, dtype=np.int64)
+
+    def __or__(self, other: MdlEventsFilter) -> MdlEventsFilter:
+        return MdlEventsAnyFilter(self.filters + [other])
@@ -1,13 +1,23 @@
-from enum     import Enum
+from enum      import Enum, IntFlag
+from itertools import chain
+import numpy  as np
 import pandas as pd
+from typing    import Any
 
 from app.models.components.mdl_json_model_base import MdlJsonModelBase
+from app.models.components.mdl_results_cache   import MdlResultsCache
+from app.models.components.mdl_ragged_frame    import MdlRaggedFrame
 
 MIN_PLAYER_X_COORD = 0
 MAX_PLAYER_X_COORD = 120
 MIN_PLAYER_Y_COORD = 0
 MAX_PLAYER_Y_COORD = 80
 
+# name of the single column of decoded visible areas - (x, y) coordinates of polygons' corners
+VISIBLE_AREA_COORDS_COL = 'coords'
+# name of the column of players' store with packed boolean attributes (see FramesPlayersFlags)
+PLAYERS_FLAGS_COL = 'flags'
+
 class FramesJsonAttrNames(Enum):
     """
     Contains possible names of json attributes from raw json file that is a base for Pandas DataFrame storing frames' data.
@@ -36,6 +46,14 @@ class FramesPlayersColNames(Enum):
     LOC_X           = 'loc_x'
     LOC_Y           = 'loc_y'
 
+class FramesPlayersFlags(IntFlag):
+    """
+    Bits of the packed flags column of players' store
+    """
+    TEAMMATE        = 1
+    ACTOR           = 2
+    KEEPER          = 4
+
 
 class MdlFramesData(MdlJsonModelBase):
 
@@ -43,54 +61,141 @@ class MdlFramesData(MdlJsonModelBase):
     MCN = FramesMainColNames
     VCN = FramesVisibleAreaColNames
     PCN = FramesPlayersColNames
+    PFL = FramesPlayersFlags
+
+    STREAM_COLUMNS = [ EAN.EVENT_UUID.value, EAN.VISIBLE_AREA.value, EAN.FREEZE_FRAME.value ]
+    RESULTS_VERSION = 2
+    # big files (full match has tens of MB) are parsed in parallel in parts of at least this size
+    MIN_CHUNK_BYTES = 8 * 1024 * 1024
 
-    def __init__(self, j_filepath: str = None):
-        super(MdlFramesData, self).__init__(j_filepath=j_filepath)
+    def __init__(self, j_filepath: str = None, results_cache: MdlResultsCache = None):
+        super(MdlFramesData, self).__init__(j_filepath=j_filepath, results_cache=results_cache)
 
         self._frames_no = 0
-        self._main_frame         = pd.DataFrame()
-        self._visible_area_frame = pd.DataFrame()
-        self._players_frame      = pd.DataFrame()
+        self._main_frame         = self._get_empty_main_frame()
+        self._visible_area       = self._get_empty_visible_area()
+        self._visible_area_frame = self._get_empty_visible_area_frame()
+        self._players            = self._get_empty_players()
 
     def get_frames_no(self) -> int:
         return self._frames_no
     
+    def get_event_uuids(self) -> np.ndarray:
+        """
+        Returns UUIDs of events related to all frames - UUID for frame number N is at position N - 1.
+        """
+        return self._main_frame[self.MCN.EVENT_UUID.value].to_numpy()
+    
     def get_event_uuid_by_frame(self, frame_no: int) -> str:
         if frame_no < 1:
             return None
         
         return self._main_frame.loc[frame_no, self.MCN.EVENT_UUID.value]
     
+    def get_visible_area_by_frame(self, frame_no: int) -> np.ndarray:
+        """
+        Returns (x, y) coordinates of visible area polygon's corners for given frame, as array of shape (corners, 2).
+        Returned array is a view of the coordinates buffer - no data is copied.
+        """
+        if not 1 <= frame_no <= self._visible_area.get_groups_no():
+            return np.empty((0, 2), dtype=np.float32)
+        
+        return self._visible_area.get_group(frame_no - 1)[VISIBLE_AREA_COORDS_COL]
+    
+    def get_visible_area(self) -> MdlRaggedFrame:
+        return self._visible_area
+
+    def get_visible_area_frame(self) -> pd.DataFrame:
+        return self._visible_area_frame
+
     def get_visible_area_frame_by_frame(self, frame_no: int) -> pd.DataFrame:
-        return self._visible_area_frame.loc[self._visible_area_frame.index == frame_no]
+        if not 1 <= frame_no <= self._visible_area.get_groups_no():
+            return self._get_empty_visible_area_frame()
+        
+        return self._get_visible_area_frame_view(self._visible_area, frame_pos=frame_no - 1)
+    
+    def get_players_by_frame(self, frame_no: int) -> dict[str, np.ndarray]:
+        """
+        Returns players' columns (loc_x, loc_y, flags) for given frame. Returned arrays are views of the players' 
+        store - no data is copied.
+        """
+        if not 1 <= frame_no <= self._players.get_groups_no():
+            return self._players.get_empty_group()
+
+        return self._players.get_group(frame_no - 1)
+
+    def get_players(self) -> MdlRaggedFrame:
+        return self._players
+
+    def get_players_frame(self) -> pd.DataFrame:
+        return self._get_players_frame_view(self._players)
     
     def get_players_frame_by_frame(self, frame_no: int) -> pd.DataFrame:
-        return self._players_frame.loc[self._players_frame.index == frame_no]
+        if not 1 <= frame_no <= self._players.get_groups_no():
+            return self._get_empty_players_frame()
+        
+        return self._get_players_frame_view(self._players, frame_pos=frame_no - 1)
     
     def _get_empty_main_frame(self) -> pd.DataFrame:
         return pd.DataFrame(columns=[e.value for e in self.MCN])
     
     def _get_empty_visible_area_frame(self) -> pd.DataFrame:
         return pd.DataFrame(columns=[e.value for e in self.VCN])
+    
+    def _get_empty_visible_area(self) -> MdlRaggedFrame:
+        return MdlRaggedFrame(np.zeros(1, dtype=np.int64), { VISIBLE_AREA_COORDS_COL: np.empty((0, 2), dtype=np.float32) })
 
     def _get_empty_players_frame(self) -> pd.DataFrame:
         return pd.DataFrame(columns=[e.value for e in self.PCN])
     
+    def _get_empty_players(self) -> MdlRaggedFrame:
+        return MdlRaggedFrame.empty({
+              self.PCN.LOC_X.value: np.float32
+            , self.PCN.LOC_Y.value: np.float32
+            , PLAYERS_FLAGS_COL   : np.uint8
+        })
+    
     def reset_result_frames(self):
         self._frames_no          = 0
         self._main_frame         = self._get_empty_main_frame()
+        self._visible_area       = self._get_empty_visible_area()
         self._visible_area_frame = self._get_empty_visible_area_frame()
-        self._players_frame      = self._get_empty_players_frame()
+        self._players            = self._get_empty_players()
+
+    def get_result_frames(self, func_id: str) -> tuple[str, tuple[pd.DataFrame | MdlRaggedFrame]]:
+        return func_id, self._calculate_result_frames(self._get_raw_data_frame())
+
+    def get_result_frames_range(self, func_id: str, byte_range: tuple[int, int]) -> tuple[str, tuple[pd.DataFrame | MdlRaggedFrame]]:
+        return func_id, self._calculate_result_frames(self._get_raw_data_frame(byte_range))
+
+    def merge_result_frames(self, parts: list[tuple]) -> tuple[pd.DataFrame, MdlRaggedFrame, MdlRaggedFrame]:
+        # frames are numbered from 1 in every part - numbering is continued across parts
+        main_frame = pd.concat([part[0] for part in parts], ignore_index=True)
+        main_frame.index += 1
+
+        visible_area = MdlRaggedFrame.concat([part[1] for part in parts])
+        players      = MdlRaggedFrame.concat([part[2] for part in parts])
+        return main_frame, visible_area, players
 
-    def get_result_frames(self, func_id: str) -> tuple[str, tuple[pd.DataFrame]]:
-        raw_df = self._get_raw_data_frame()
-        return func_id, (self._get_main_frame(raw_df), self._get_visible_area_frame(raw_df), self._get_players_frame(raw_df))
+    def _calculate_result_frames(self, raw_df: pd.DataFrame) -> tuple[pd.DataFrame, MdlRaggedFrame, MdlRaggedFrame]:
+        visible_area = self._decode_visible_areas(raw_df[self.EAN.VISIBLE_AREA.value].tolist())
+        players      = self._flatten_freeze_frames(raw_df[self.EAN.FREEZE_FRAME.value].tolist())
+        return self._get_main_frame(raw_df), visible_area, players
 
-    def set_result_frames(self, main_frame: pd.DataFrame, visible_area_frame: pd.DataFrame, players_frame: pd.DataFrame):
+    def set_result_frames(self, main_frame: pd.DataFrame, visible_area: MdlRaggedFrame, players: MdlRaggedFrame):
         self._main_frame         = main_frame
         self._frames_no          = len(self._main_frame.index)
-        self._visible_area_frame = visible_area_frame
-        self._players_frame      = players_frame
+        self._visible_area       = visible_area
+        self._visible_area_frame = self._get_visible_area_frame_view(visible_area)
+        self._players            = players
+
+    def _get_memory_items(self) -> dict[str, Any]:
+        return {
+              'main_frame'        : self._main_frame
+            , 'visible_area'      : self._visible_area
+            , 'visible_area_frame': self._visible_area_frame
+            , 'players'           : self._players
+        }
 
     def _get_main_frame(self, raw_src_df: pd.DataFrame) -> pd.DataFrame:
         eframe_columns =[ self.EAN.EVENT_UUID.value ]
@@ -98,63 +203,115 @@ class MdlFramesData(MdlJsonModelBase):
 
         return raw_df
     
-    def _get_visible_area_frame(self, raw_src_df: pd.DataFrame) -> pd.DataFrame:
-        eframe_columns =[ self.EAN.EVENT_UUID.value, self.EAN.VISIBLE_AREA.value ]
-        raw_df: pd.DataFrame = raw_src_df.copy()[eframe_columns]
-        
-        # getting data from original "visible_area" column
-        # it is a list of float coordinates of polygon's corners (on 2D plane)
-        # each two consecutive values create (x, y) coordinates of another corner
-        # number of corners per frame polygon is variable
-        # the goal is to store each corner's coordinates in separate row
-        
-        # step 1 - group coordinates into pairs, store that pairs in list
-        raw_df[self.EAN.VISIBLE_AREA.value] = \
-            raw_df[self.EAN.VISIBLE_AREA.value].apply(lambda x: [pair for pair in zip(x[::2], x[1::2])])
-        
-        # step 2 - explode this lists with original index - result: each pair in separate row
-        raw_df = raw_df.explode(self.EAN.VISIBLE_AREA.value)
-
-        # step 3 - add corner number for each corner - in the scope of particular frame
-        raw_df[self.VCN.CORNER_NO.value] = raw_df.groupby(level = 0).cumcount()
-
-        # step 4 - separate coords from pairs to two standalone columns
-        raw_df[[
-              self.VCN.X_COORD.value
-            , self.VCN.Y_COORD.value
-        ]] = raw_df[self.EAN.VISIBLE_AREA.value].apply(lambda x : pd.Series({ 'c1': x[0]
-                                                                            , 'c2': x[1]}))
-        
-        # step 5 - drop the pair column
-        raw_df = raw_df.drop(columns=[self.EAN.EVENT_UUID.value, self.EAN.VISIBLE_AREA.value])
-        
-        return raw_df
+    def _decode_visible_areas(self, visible_areas: list[list[float]]) -> MdlRaggedFrame:
+        """
+        Decodes original "visible_area" values into single float32 coordinates buffer with per-frame offsets.
+        Each value is a flat list of float coordinates of polygon's corners (on 2D plane) - each two consecutive
+        values create (x, y) coordinates of another corner. Number of corners per frame polygon is variable.
+
+        :param visible_areas: List of 'visible_area' json attribute values - one per frame.
+        :return: MdlRaggedFrame with single 'coords' column of shape (corners, 2) and frames as groups.
+        """
+        lengths = np.fromiter(map(len, visible_areas), dtype=np.int64, count=len(visible_areas)) // 2
+        # an unpaired trailing value (if any) cannot form a corner, so it is skipped
+        coords  = np.fromiter(
+                      chain.from_iterable(area if len(area) % 2 == 0 else area[:-1] for area in visible_areas)
+                    , dtype=np.float32
+                    , count=2 * int(lengths.sum())
+                ).reshape(-1, 2)
+
+        return MdlRaggedFrame.from_lengths(lengths, { VISIBLE_AREA_COORDS_COL: coords })
+
+    def _get_visible_area_frame_view(self, visible_area: MdlRaggedFrame, frame_pos: int = None) -> pd.DataFrame:
+        """
+        Returns DataFrame with one row per polygon's corner. Corner number is a position of the row in the scope of 
+        its frame, so it is derived from offsets instead of grouping.
+
+        :param visible_area: Decoded visible areas (see _decode_visible_areas).
+        :param frame_pos: Position (0-based) of the single frame to return. All frames are returned if not given.
+        :return: Pandas DataFrame
+        """
+        if frame_pos is None:
+            coords    = visible_area.get_column(VISIBLE_AREA_COORDS_COL)
+            index     = visible_area.get_group_index() + 1
+            corner_no = visible_area.get_inner_index().astype(np.int16)
+        else:
+            coords    = visible_area.get_group(frame_pos)[VISIBLE_AREA_COORDS_COL]
+            index     = np.full(len(coords), frame_pos + 1, dtype=np.int64)
+            corner_no = np.arange(len(coords), dtype=np.int16)
+
+        return pd.DataFrame({
+                  self.VCN.CORNER_NO.value: corner_no
+                , self.VCN.X_COORD.value  : coords[:, 0]
+                , self.VCN.Y_COORD.value  : coords[:, 1]
+            }, index=pd.Index(index))
     
     def _get_players_frame(self, raw_src_df: pd.DataFrame) -> pd.DataFrame:
-        eframe_columns =[ self.EAN.EVENT_UUID.value, self.EAN.FREEZE_FRAME.value ]
-        raw_df: pd.DataFrame = raw_src_df.copy()[eframe_columns]
-
         # each row of 'freeze_frame' column contains list of dictionaries 
         # each dictionary represents single player details at a particular event
         # the goal is to parse every list of dicts into separate rows (each row for one dictionary)
+        players = self._flatten_freeze_frames(raw_src_df[self.EAN.FREEZE_FRAME.value].tolist())
+        return self._get_players_frame_view(players)
 
-        # step 1 - explode lists of dicts with original index 
-        raw_df = raw_df.explode(self.EAN.FREEZE_FRAME.value)
-
-        # step 2 - move particular dict's attributes to separate columns
-        raw_df[[
-              self.PCN.TEAMMATE.value
-            , self.PCN.ACTOR.value 
-            , self.PCN.KEEPER.value
-            , self.PCN.LOC_X.value 
-            , self.PCN.LOC_Y.value
-        ]] = raw_df[self.EAN.FREEZE_FRAME.value].apply(lambda x: pd.Series({ 'c1': x[self.EAN.TEAMMATE.value]
-                                                                            ,'c2': x[self.EAN.ACTOR.value]
-                                                                            ,'c3': x[self.EAN.KEEPER.value]
-                                                                            ,'c4': x[self.EAN.LOCATION.value][0]
-                                                                            ,'c5': x[self.EAN.LOCATION.value][1]}))
-        
-        # step 3 - delete not needed columns 
-        raw_df = raw_df.drop(columns=[self.EAN.EVENT_UUID.value, self.EAN.FREEZE_FRAME.value])
+    def _flatten_freeze_frames(self, freeze_frames: list[list[dict]]) -> MdlRaggedFrame:
+        """
+        Flattens lists of players' dictionaries (one list per frame) into compact players' store in a single pass:
+        float32 coordinates and boolean attributes packed into uint8 flags (see FramesPlayersFlags). 
+        Output arrays are preallocated - the number of players in every frame is known upfront.
+
+        :param freeze_frames: List of 'freeze_frame' json attribute values - one per frame.
+        :return: MdlRaggedFrame with players' columns (loc_x, loc_y, flags) and frames as groups.
+        """
+        lengths = np.fromiter(map(len, freeze_frames), dtype=np.int64, count=len(freeze_frames))
+        rows_no = int(lengths.sum())
+
+        loc_x = np.empty(rows_no, dtype=np.float32)
+        loc_y = np.empty(rows_no, dtype=np.float32)
+        flags = np.empty(rows_no, dtype=np.uint8)
+
+        TEAMMATE, ACTOR, KEEPER, LOCATION = \
+            self.EAN.TEAMMATE.value, self.EAN.ACTOR.value, self.EAN.KEEPER.value, self.EAN.LOCATION.value
+        TEAMMATE_FLAG, ACTOR_FLAG, KEEPER_FLAG = \
+            int(self.PFL.TEAMMATE), int(self.PFL.ACTOR), int(self.PFL.KEEPER)
+
+        row = 0
+        for players in freeze_frames:
+            for player in players:
+                location   = player[LOCATION]
+                loc_x[row] = location[0]
+                loc_y[row] = location[1]
+                flags[row] = (TEAMMATE_FLAG if player[TEAMMATE] else 0) \
+                           | (ACTOR_FLAG    if player[ACTOR]    else 0) \
+                           | (KEEPER_FLAG   if player[KEEPER]   else 0)
+                row += 1
+
+        return MdlRaggedFrame.from_lengths(lengths, {
+              self.PCN.LOC_X.value: loc_x
+            , self.PCN.LOC_Y.value: loc_y
+            , PLAYERS_FLAGS_COL   : flags
+        })
+
+    def _get_players_frame_view(self, players: MdlRaggedFrame, frame_pos: int = None) -> pd.DataFrame:
+        """
+        Returns DataFrame with one row per player, with flags unpacked to boolean columns. Rows are indexed with 
+        the number of their frame.
+
+        :param players: Players' store (see _flatten_freeze_frames).
+        :param frame_pos: Position (0-based) of the single frame to return. All frames are returned if not given.
+        :return: Pandas DataFrame
+        """
+        if frame_pos is None:
+            columns = { name: players.get_column(name) for name in players.get_column_names() }
+            index   = players.get_group_index() + 1
+        else:
+            columns = players.get_group(frame_pos)
+            index   = np.full(len(columns[PLAYERS_FLAGS_COL]), frame_pos + 1, dtype=np.int64)
 
-        return raw_df
\ No newline at end of file
+        flags = columns[PLAYERS_FLAGS_COL]
+        return pd.DataFrame({
+                  self.PCN.TEAMMATE.value: (flags & self.PFL.TEAMMATE) != 0
+                , self.PCN.ACTOR.value   : (flags & self.PFL.ACTOR)    != 0
+                , self.PCN.KEEPER.value  : (flags & self.PFL.KEEPER)   != 0
+                , self.PCN.LOC_X.value   : columns[self.PCN.LOC_X.value]
+                , self.PCN.LOC_Y.value   : columns[self.PCN.LOC_Y.value]
+            }, index=pd.Index(index))
@@ -0,0 +1,259 @@
+from enum     import Enum
+import numpy  as np
+
+from app.models.mdl_events_data  import MdlEventsData, EventsFrameColNames
+from app.models.mdl_frames_data  import MdlFramesData
+from app.models.mdl_lineups_data import MdlLineupsData
+
+
+NO_EVENT_POS = -1
+NO_TEAM_IDX  = -1
+NO_FRAME_NO  = 0
+NO_TIME_MS   = -1
+# minute of the match clock at which every period starts - halves of the match, halves of extra time and penalties
+PERIODS_START_MINUTES = { 1: 0, 2: 45, 3: 90, 4: 105, 5: 120 }
+
+
+class FramesJoinColNames(Enum):
+    """
+    Contains names of columns of the table joining every 360 frame with its event and teams' details
+    """
+    EVENT_POS        = 'event_pos'
+    PERIOD           = 'period'
+    MINUTE           = 'minute'
+    SECOND           = 'second'
+    EVENT_TEAM_IDX   = 'event_team_idx'
+    FIRST_TEAM_EVENT = 'first_team_event'
+    # time since the start of the event's period and time since the start of the match without breaks between
+    # periods (monotonic across periods) - both in milliseconds
+    TIMESTAMP_MS     = 'timestamp_ms'
+    ELAPSED_MS       = 'elapsed_ms'
+
+
+class MdlFramesJoinRow:
+    """
+    Details of the event related to a single 360 frame.
+    """
+
+    def __init__(self, event_pos: int, period: int, minute: int, second: int, event_team_idx: int, first_team_event: bool):
+        self.event_pos        = event_pos
+        self.period           = period
+        self.minute           = minute
+        self.second           = second
+        # index of the team related to the event (0 - first team from lineups' data, 1 - second one, -1 - unknown)
+        self.event_team_idx   = event_team_idx
+        self.first_team_event = first_team_event
+
+
+class MdlFramesJoin:
+    """
+    Materialized join of frames' data (frame -> event_uuid), events' data (event_uuid -> event details) and
+    lineups' data (team id -> team index). Built once after data of all models is calculated - afterwards,
+    details of any frame's event are obtained by array indexing.
+    """
+
+    JCN = FramesJoinColNames
+    ECN = EventsFrameColNames
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._columns: dict[str, np.ndarray] = {
+              self.JCN.EVENT_POS.value       : np.empty(0, dtype=np.int32)
+            , self.JCN.PERIOD.value          : np.empty(0, dtype=np.int8)
+            , self.JCN.MINUTE.value          : np.empty(0, dtype=np.int16)
+            , self.JCN.SECOND.value          : np.empty(0, dtype=np.int8)
+            , self.JCN.EVENT_TEAM_IDX.value  : np.empty(0, dtype=np.int8)
+            , self.JCN.FIRST_TEAM_EVENT.value: np.empty(0, dtype=np.bool_)
+            , self.JCN.TIMESTAMP_MS.value    : np.empty(0, dtype=np.int64)
+            , self.JCN.ELAPSED_MS.value      : np.empty(0, dtype=np.int64)
+        }
+        # time of the start and duration of every period on the timeline of elapsed time - by period number
+        self._period_offsets_ms   = np.zeros(1, dtype=np.int64)
+        self._period_durations_ms = np.zeros(1, dtype=np.int64)
+        # elapsed time of frames (with known time) in ascending order and positions of those frames - for seeking
+        self._seek_times_ms  = np.empty(0, dtype=np.int64)
+        self._seek_frame_pos = np.empty(0, dtype=np.int64)
+        # number of the frame of every event (by position of the event's row) - NO_FRAME_NO if it has no frame
+        self._frame_no_by_event = np.empty(0, dtype=np.int32)
+
+    def build(self, frames_model: MdlFramesData, events_model: MdlEventsData, lineups_model: MdlLineupsData):
+        """
+        Calculates details of the event for every frame of given models' data.
+        """
+        frames_no   = frames_model.get_frames_no()
+        event_uuids = frames_model.get_event_uuids()
+        event_pos   = events_model.get_event_positions_by_uuids(event_uuids).astype(np.int32)
+        has_event   = event_pos >= 0
+        found_pos   = event_pos[has_event]
+
+        events_frame = events_model.get_events_frame()
+
+        def _event_column(col_name: str, dtype: np.dtype) -> np.ndarray:
+            values = np.zeros(frames_no, dtype=dtype)
+            values[has_event] = events_frame[col_name].to_numpy()[found_pos]
+            return values
+
+        event_team_id = _event_column(self.ECN.EVENT_TEAM_ID.value, np.int64)
+
+        # index of team is its position in lineups' data - first team is a team in the first row
+        f_team_id, s_team_id = lineups_model.get_team_ids()
+        event_team_idx = np.full(frames_no, NO_TEAM_IDX, dtype=np.int8)
+        if f_team_id is not None:
+            event_team_idx[has_event] = np.where(event_team_id[has_event] == f_team_id, 0, 1)
+
+        self._columns = {
+              self.JCN.EVENT_POS.value       : event_pos
+            , self.JCN.PERIOD.value          : _event_column(self.ECN.PERIOD.value, np.int8)
+            , self.JCN.MINUTE.value          : _event_column(self.ECN.MINUTE.value, np.int16)
+            , self.JCN.SECOND.value          : _event_column(self.ECN.SECOND.value, np.int8)
+            , self.JCN.EVENT_TEAM_IDX.value  : event_team_idx
+            , self.JCN.FIRST_TEAM_EVENT.value: event_team_idx == 0
+        }
+        self._build_timeline(events_model, event_pos, has_event, found_pos)
+
+        # if many frames share the event, the first one is kept - reversed order makes the first write the last one
+        self._frame_no_by_event = np.full(len(events_frame.index), NO_FRAME_NO, dtype=np.int32)
+        frame_nos = np.flatnonzero(has_event).astype(np.int32) + 1
+        self._frame_no_by_event[found_pos[::-1]] = frame_nos[::-1]
+
+    def _build_timeline(self, events_model: MdlEventsData, event_pos: np.ndarray, has_event: np.ndarray
+                        , found_pos: np.ndarray):
+        """
+        Calculates time of every frame from parsed timestamps of events. Periods are placed one after another on
+        the timeline of elapsed time - every period lasts until its last event.
+        """
+        timestamps_ms = events_model.get_timestamps_ms()
+        periods = events_model.get_events_frame()[self.ECN.PERIOD.value].to_numpy().astype(np.int64)
+        known   = timestamps_ms >= 0
+
+        periods_no = int(periods.max(initial=0)) + 1
+        self._period_durations_ms = np.zeros(periods_no, dtype=np.int64)
+        np.maximum.at(self._period_durations_ms, periods[known], timestamps_ms[known])
+        self._period_offsets_ms = np.concatenate(([0], np.cumsum(self._period_durations_ms)[:-1]))
+
+        frames_timestamp_ms = np.full(len(event_pos), NO_TIME_MS, dtype=np.int64)
+        frames_timestamp_ms[has_event] = timestamps_ms[found_pos]
+        frames_period = self._columns[self.JCN.PERIOD.value].astype(np.int64)
+        frames_known  = frames_timestamp_ms >= 0
+
+        frames_elapsed_ms = np.full(len(event_pos), NO_TIME_MS, dtype=np.int64)
+        frames_elapsed_ms[frames_known] = self._period_offsets_ms[frames_period[frames_known]] + frames_timestamp_ms[frames_known]
+
+        self._columns[self.JCN.TIMESTAMP_MS.value] = frames_timestamp_ms
+        self._columns[self.JCN.ELAPSED_MS.value]   = frames_elapsed_ms
+
+        # events are not strictly ordered by time - frames are sorted once, so seeking is a binary search
+        known_pos = np.flatnonzero(frames_known)
+        self._seek_frame_pos = known_pos[np.argsort(frames_elapsed_ms[known_pos], kind='stable')]
+        self._seek_times_ms  = frames_elapsed_ms[self._seek_frame_pos]
+
+    def get_nbytes(self) -> int:
+        return sum(values.nbytes for values in self._columns.values()) + self._frame_no_by_event.nbytes \
+             + self._seek_times_ms.nbytes + self._seek_frame_pos.nbytes
+
+    def get_timeline_ms(self) -> int:
+        """
+        Returns length (in milliseconds) of the timeline of elapsed time - sum of durations of all periods.
+        """
+        return int(self._period_durations_ms.sum())
+
+    def get_elapsed_ms(self, frame_no: int) -> int:
+        """
+        Returns time (in milliseconds) elapsed since the start of the match till given frame, NO_TIME_MS if unknown.
+        """
+        if not 1 <= frame_no <= self.get_frames_no():
+            return NO_TIME_MS
+        return int(self._columns[self.JCN.ELAPSED_MS.value][frame_no - 1])
+
+    def get_frame_no_by_elapsed(self, elapsed_ms: int) -> int:
+        """
+        Returns number of the frame closest in time to given elapsed time (see get_elapsed_ms) - NO_FRAME_NO if no
+        frame has known time.
+        """
+        if len(self._seek_times_ms) == 0:
+            return NO_FRAME_NO
+
+        pos = int(np.searchsorted(self._seek_times_ms, elapsed_ms))
+        if pos == len(self._seek_times_ms) or \
+                (pos > 0 and elapsed_ms - self._seek_times_ms[pos - 1] <= self._seek_times_ms[pos] - elapsed_ms):
+            pos -= 1
+        return int(self._seek_frame_pos[pos]) + 1
+
+    def get_elapsed_by_match_time(self, match_time_ms: int, period: int = None) -> int:
+        """
+        Converts time of the match clock (e.g. 47:30 for the third minute of the second half) to elapsed time.
+        Clock times of periods overlap (e.g. 45:30 may be in the first half's stoppage time) - the latest period
+        started before given time is chosen, unless the period is given.
+
+        :param match_time_ms: Time of the match clock in milliseconds.
+        :param period: Number of the period - chosen by time if not given.
+        :return: Elapsed time in milliseconds (see get_elapsed_ms), NO_TIME_MS if no period fits.
+        """
+        periods = [
+            p for p in range(1, len(self._period_durations_ms))
+            if self._period_durations_ms[p] > 0 and (period is None or p == period)
+        ]
+        started = [ p for p in periods if PERIODS_START_MINUTES.get(p, 0) * 60_000 <= match_time_ms ]
+        if not periods:
+            return NO_TIME_MS
+
+        period = started[-1] if started else periods[0]
+        period_ms = match_time_ms - PERIODS_START_MINUTES.get(period, 0) * 60_000
+        return int(self._period_offsets_ms[period] + min(max(0, period_ms), self._period_durations_ms[period]))
+
+    def get_match_time_ms(self, frame_no: int) -> int:
+        """
+        Returns time (in milliseconds) of the match clock of given frame - timestamp of its event counted from the start
+        minute of its period (e.g. 47:30 for the third minute of the second half), NO_TIME_MS if unknown.
+        """
+        if not 1 <= frame_no <= self.get_frames_no():
+            return NO_TIME_MS
+
+        timestamp_ms = int(self._columns[self.JCN.TIMESTAMP_MS.value][frame_no - 1])
+        if timestamp_ms == NO_TIME_MS:
+            return NO_TIME_MS
+        period = int(self._columns[self.JCN.PERIOD.value][frame_no - 1])
+        return PERIODS_START_MINUTES.get(period, 0) * 60_000 + timestamp_ms
+
+    def get_frame_nos_by_events(self, event_positions: np.ndarray) -> np.ndarray:
+        """
+        Returns ascending numbers of frames of given events (positions of events' rows) - events without a frame
+        are skipped.
+        """
+        event_positions = np.asarray(event_positions, dtype=np.int64)
+        # events of data newer than the join have no frames yet
+        event_positions = event_positions[event_positions < len(self._frame_no_by_event)]
+        frame_nos = self._frame_no_by_event[event_positions]
+        return np.sort(frame_nos[frame_nos != NO_FRAME_NO])
+
+    def get_frames_no(self) -> int:
+        return len(self._columns[self.JCN.EVENT_POS.value])
+
+    def get_column(self, col: FramesJoinColNames) -> np.ndarray:
+        """
+        Returns values of given column for all frames - value for frame number N is at position N - 1.
+        """
+        return self._columns[col.value]
+
+    def get_row(self, frame_no: int) -> MdlFramesJoinRow | None:
+        """
+        Returns details of the event related to given frame or None if the frame or its event does not exist.
+        """
+        if not 1 <= frame_no <= self.get_frames_no():
+            return None
+
+        pos = frame_no - 1
+        event_pos = int(self._columns[self.JCN.EVENT_POS.value][pos])
+        if event_pos == NO_EVENT_POS:
+            return None
+
+        return MdlFramesJoinRow(
+              event_pos        = event_pos
+            , period           = int(self._columns[self.JCN.PERIOD.value][pos])
+            , minute           = int(self._columns[self.JCN.MINUTE.value][pos])
+            , second           = int(self._columns[self.JCN.SECOND.value][pos])
+            , event_team_idx   = int(self._columns[self.JCN.EVENT_TEAM_IDX.value][pos])
+            , first_team_event = bool(self._columns[self.JCN.FIRST_TEAM_EVENT.value][pos])
+        )
@@ -1,7 +1,11 @@
 from enum     import Enum
+import numpy  as np
 import pandas as pd
+from typing   import Any
 
 from app.models.components.mdl_json_model_base import MdlJsonModelBase
+from app.models.components.mdl_results_cache   import MdlResultsCache
+from app.models.components.mdl_dtype_policy    import MdlDtypePolicy, DTYPE_CATEGORY
 
 
 DEFAULT_TEAM_NAME = '<no data>'
@@ -28,8 +32,14 @@ class MdlLineupsData(MdlJsonModelBase):
     EAN = LineupsJsonAttrNames
     ECN = LineupsFrameColNames
 
-    def __init__(self, j_filepath: str = None):
-        super(MdlLineupsData, self).__init__(j_filepath=j_filepath)
+    STREAM_COLUMNS = [ EAN.TEAM_ID.value, EAN.TEAM_NAME.value ]
+    DTYPE_POLICY = MdlDtypePolicy({
+          ECN.TEAM_ID.value  : np.int32
+        , ECN.TEAM_NAME.value: DTYPE_CATEGORY
+    })
+
+    def __init__(self, j_filepath: str = None, results_cache: MdlResultsCache = None):
+        super(MdlLineupsData, self).__init__(j_filepath=j_filepath, results_cache=results_cache)
         self._lineups_frame = self._get_empty_lineups_frame()
 
     def get_lineups_frame(self):
@@ -41,6 +51,12 @@ class MdlLineupsData(MdlJsonModelBase):
             return DEFAULT_TEAM_NAME, DEFAULT_TEAM_NAME
         return df.loc[1, self.ECN.TEAM_NAME.value], df.loc[2, self.ECN.TEAM_NAME.value]
 
+    def get_team_ids(self) -> tuple[int, int]:
+        df = self._lineups_frame
+        if df.empty:
+            return None, None
+        return int(df.loc[1, self.ECN.TEAM_ID.value]), int(df.loc[2, self.ECN.TEAM_ID.value])
+
     def _get_empty_lineups_frame(self) -> pd.DataFrame:
         return pd.DataFrame(columns=[[e.value for e in self.ECN]])
 
@@ -50,7 +66,10 @@ class MdlLineupsData(MdlJsonModelBase):
         return func_id, (raw_df, )
 
     def set_result_frames(self, lineups_frame: pd.DataFrame):
-        self._lineups_frame = lineups_frame
+        self._lineups_frame = self._compact_frame(lineups_frame)
 
     def reset_result_frames(self):
-        self._lineups_frame = self._get_empty_lineups_frame()
\ No newline at end of file
+        self._lineups_frame = self._get_empty_lineups_frame()
+
+    def _get_memory_items(self) -> dict[str, Any]:
+        return { 'lineups_frame': self._lineups_frame }
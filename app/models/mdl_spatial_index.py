@@ -0,0 +1,259 @@
+from enum     import Enum
+from abc      import ABC, abstractmethod
+import numpy  as np
+
+from app.models.mdl_frames_data import MdlFramesData, FramesPlayersColNames, FramesPlayersFlags, PLAYERS_FLAGS_COL
+from app.models.mdl_frames_data import MIN_PLAYER_X_COORD, MAX_PLAYER_X_COORD, MIN_PLAYER_Y_COORD, MAX_PLAYER_Y_COORD
+from app.models.components.mdl_ragged_frame import MdlRaggedFrame
+
+
+# size (in pitch units) of a square cell of the index - the pitch (120 x 80) is divided into 24 x 16 cells
+SPATIAL_CELL_SIZE = 5
+# pitch units are yards
+PITCH_UNITS_PER_METER = 1 / 0.9144
+
+# columns of the index - players' rows (positions in the players' store) and their frames, grouped by cells
+SPATIAL_ROW_COL   = 'row'
+SPATIAL_FRAME_COL = 'frame_pos'
+
+
+class SpatialPlayersGroup(Enum):
+    """
+    Players taken into account by a spatial predicate - sides are relative to the team of the frame's actor.
+    """
+    ALL       = 'all'
+    TEAMMATES = 'teammates'
+    OPPONENTS = 'opponents'
+    ACTOR     = 'actor'
+    KEEPERS   = 'keepers'
+
+
+class MdlPitchRegion:
+    """
+    Rectangle of the pitch (bounds included) in coordinates of the frames' data - the actor's team attacks
+    towards MAX_PLAYER_X_COORD.
+    """
+
+    def __init__(self, x_min: float, y_min: float, x_max: float, y_max: float):
+        self.x_min, self.y_min = x_min, y_min
+        self.x_max, self.y_max = x_max, y_max
+
+    def contains(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return (x >= self.x_min) & (x <= self.x_max) & (y >= self.y_min) & (y <= self.y_max)
+
+
+# penalty areas of the team defending against the actor's team and of the actor's team
+PENALTY_AREA     = MdlPitchRegion(MAX_PLAYER_X_COORD - 18, 18, MAX_PLAYER_X_COORD, 62)
+OWN_PENALTY_AREA = MdlPitchRegion(MIN_PLAYER_X_COORD, 18, MIN_PLAYER_X_COORD + 18, 62)
+
+
+class MdlSpatialIndex:
+    """
+    Uniform grid over the pitch - every cell holds rows of players (of all frames) located in it, ordered by frame.
+    Built once after data of frames is calculated - afterwards, questions about players' positions are answered
+    for all frames at once, checking exact positions of players from cells close to the asked area only.
+    """
+
+    PCN = FramesPlayersColNames
+    PFL = FramesPlayersFlags
+
+    def __init__(self, cell_size: float = SPATIAL_CELL_SIZE):
+        self._cell_size = cell_size
+        self._cols_no = int(np.ceil((MAX_PLAYER_X_COORD - MIN_PLAYER_X_COORD) / cell_size))
+        self._rows_no = int(np.ceil((MAX_PLAYER_Y_COORD - MIN_PLAYER_Y_COORD) / cell_size))
+        self.reset()
+
+    def reset(self):
+        self._frames_no = 0
+        self._loc_x = np.empty(0, dtype=np.float32)
+        self._loc_y = np.empty(0, dtype=np.float32)
+        self._flags = np.empty(0, dtype=np.uint8)
+        # position of the frame of every player's row
+        self._frame_pos = np.empty(0, dtype=np.int32)
+        self._cells = MdlRaggedFrame.from_lengths(np.zeros(self._cols_no * self._rows_no, dtype=np.int64), {
+              SPATIAL_ROW_COL  : np.empty(0, dtype=np.int64)
+            , SPATIAL_FRAME_COL: np.empty(0, dtype=np.int32)
+        })
+
+    def build(self, frames_model: MdlFramesData):
+        """
+        Distributes players of all frames of given model's data into cells. Players without location are skipped.
+        """
+        players = frames_model.get_players()
+        self._frames_no = players.get_groups_no()
+        self._loc_x = players.get_column(self.PCN.LOC_X.value)
+        self._loc_y = players.get_column(self.PCN.LOC_Y.value)
+        self._flags = players.get_column(PLAYERS_FLAGS_COL)
+        self._frame_pos = players.get_group_index().astype(np.int32)
+
+        rows = np.flatnonzero(np.isfinite(self._loc_x) & np.isfinite(self._loc_y))
+        frame_pos = self._frame_pos[rows]
+        cells = self._get_cells(self._loc_x[rows], self._loc_y[rows])
+
+        # rows are already ordered by frame - stable sort keeps that order in every cell
+        order = np.argsort(cells, kind='stable')
+        self._cells = MdlRaggedFrame.from_lengths(np.bincount(cells, minlength=self._cols_no * self._rows_no), {
+              SPATIAL_ROW_COL  : rows[order]
+            , SPATIAL_FRAME_COL: frame_pos[order]
+        })
+
+    def get_nbytes(self) -> int:
+        return self._cells.get_nbytes() + self._frame_pos.nbytes
+
+    def get_frames_no(self) -> int:
+        return self._frames_no
+
+    def count_in_region(self, region: MdlPitchRegion, group: SpatialPlayersGroup = SpatialPlayersGroup.ALL) -> np.ndarray:
+        """
+        Returns number of players of given group inside the region - for every frame (value for frame number N
+        is at position N - 1).
+        """
+        col_min, row_min = self._get_cell_coords(region.x_min, region.y_min)
+        col_max, row_max = self._get_cell_coords(region.x_max, region.y_max)
+        cols, rows = np.meshgrid(np.arange(col_min, col_max + 1), np.arange(row_min, row_max + 1))
+        cells = (rows * self._cols_no + cols).ravel()
+
+        offsets = self._cells.get_offsets()
+        positions = self._expand_ranges(offsets[cells], offsets[cells + 1])
+        players_rows = self._cells.get_column(SPATIAL_ROW_COL)[positions]
+
+        inside = region.contains(self._loc_x[players_rows], self._loc_y[players_rows]) \
+               & self._get_group_mask(group, players_rows)
+        frame_pos = self._cells.get_column(SPATIAL_FRAME_COL)[positions][inside]
+        return np.bincount(frame_pos, minlength=self._frames_no).astype(np.int32)
+
+    def get_nearest_distances(self, src_group: SpatialPlayersGroup, dst_group: SpatialPlayersGroup) -> np.ndarray:
+        """
+        Returns distance from the first player of src_group to the nearest other player of dst_group - for every
+        frame (value for frame number N is at position N - 1). A frame has only a few players, so distances to all
+        of them are calculated at once, without looking up cells.
+
+        :param src_group: Group of the player the distance is measured from (e.g. the actor).
+        :param dst_group: Group of players the distance is measured to.
+        :return: Distances (in pitch units) - inf if there is no player of dst_group in the frame, NaN if there is
+                 no player of src_group.
+        """
+        rows = np.flatnonzero(np.isfinite(self._loc_x) & np.isfinite(self._loc_y))
+
+        # the first player of the group in every frame - rows are ordered by frame, so the first write wins
+        src_rows = rows[self._get_group_mask(src_group, rows)][::-1]
+        src_row_by_frame = np.full(self._frames_no, -1, dtype=np.int64)
+        src_row_by_frame[self._frame_pos[src_rows]] = src_rows
+        has_src = src_row_by_frame >= 0
+
+        # other players of the group in frames having the source player
+        dst_rows = rows[self._get_group_mask(dst_group, rows)]
+        src_of_dst = src_row_by_frame[self._frame_pos[dst_rows]]
+        valid = (src_of_dst >= 0) & (src_of_dst != dst_rows)
+        dst_rows, src_of_dst = dst_rows[valid], src_of_dst[valid]
+        dst_frame = self._frame_pos[dst_rows]
+
+        distances = np.full(self._frames_no, np.inf, dtype=np.float32)
+        np.minimum.at(distances, dst_frame, np.hypot(self._loc_x[dst_rows] - self._loc_x[src_of_dst]
+                                                     , self._loc_y[dst_rows] - self._loc_y[src_of_dst]))
+        distances[~has_src] = np.nan
+        return distances
+
+    def select_frames(self, predicates: list['MdlSpatialPredicate']) -> np.ndarray:
+        """
+        Returns sorted numbers of frames fulfilling all given predicates.
+        """
+        mask = np.ones(self._frames_no, dtype=np.bool_)
+        for predicate in predicates:
+            mask &= predicate.evaluate(self)
+        return np.flatnonzero(mask) + 1
+
+    def _get_cell_coords(self, x: np.ndarray | float, y: np.ndarray | float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns column and row of cells containing given positions - positions outside of the pitch are assigned
+        to the closest border cells.
+        """
+        col = np.clip(np.floor((np.asarray(x) - MIN_PLAYER_X_COORD) / self._cell_size), 0, self._cols_no - 1)
+        row = np.clip(np.floor((np.asarray(y) - MIN_PLAYER_Y_COORD) / self._cell_size), 0, self._rows_no - 1)
+        return col.astype(np.int64), row.astype(np.int64)
+
+    def _get_cells(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        col, row = self._get_cell_coords(x, y)
+        return row * self._cols_no + col
+
+    def _get_group_mask(self, group: SpatialPlayersGroup, rows: np.ndarray) -> np.ndarray:
+        flags = self._flags[rows]
+        if group == SpatialPlayersGroup.TEAMMATES:
+            return (flags & self.PFL.TEAMMATE) != 0
+        if group == SpatialPlayersGroup.OPPONENTS:
+            return (flags & self.PFL.TEAMMATE) == 0
+        if group == SpatialPlayersGroup.ACTOR:
+            return (flags & self.PFL.ACTOR) != 0
+        if group == SpatialPlayersGroup.KEEPERS:
+            return (flags & self.PFL.KEEPER) != 0
+        return np.ones(len(rows), dtype=np.bool_)
+
+    @staticmethod
+    def _expand_ranges(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """
+        Returns all positions of given ranges [start, end), concatenated in order.
+        """
+        lengths = ends - starts
+        range_starts = np.cumsum(lengths) - lengths
+        return np.arange(int(lengths.sum()), dtype=np.int64) + np.repeat(starts - range_starts, lengths)
+
+
+class MdlSpatialPredicate(ABC):
+    """
+    Condition on players' positions evaluated for all frames at once.
+    """
+
+    @abstractmethod
+    def evaluate(self, index: MdlSpatialIndex) -> np.ndarray:
+        """
+        :return: Boolean mask of frames fulfilling the condition (value for frame number N is at position N - 1).
+        """
+        pass
+
+
+class MdlRegionCountPredicate(MdlSpatialPredicate):
+    """
+    Number of players of the group inside the region is between min_count and max_count (both included).
+    """
+
+    def __init__(self, region: MdlPitchRegion, group: SpatialPlayersGroup = SpatialPlayersGroup.ALL
+                 , min_count: int = 1, max_count: int = None):
+        self.region    = region
+        self.group     = group
+        self.min_count = min_count
+        self.max_count = max_count
+
+    def evaluate(self, index: MdlSpatialIndex) -> np.ndarray:
+        counts = index.count_in_region(self.region, self.group)
+        mask = counts >= self.min_count
+        if self.max_count is not None:
+            mask &= counts <= self.max_count
+        return mask
+
+
+class MdlNearestDistancePredicate(MdlSpatialPredicate):
+    """
+    Distance (in pitch units) from the player of src_group to the nearest player of dst_group is between
+    min_distance and max_distance - e.g. the actor without any opponent closer than min_distance.
+    Frames without player of src_group never fulfill the condition.
+    """
+
+    def __init__(self, src_group: SpatialPlayersGroup, dst_group: SpatialPlayersGroup
+                 , min_distance: float = None, max_distance: float = None):
+        if min_distance is None and max_distance is None:
+            raise ValueError(f'{self.__class__.__name__}: min_distance or max_distance must be given')
+
+        self.src_group    = src_group
+        self.dst_group    = dst_group
+        self.min_distance = min_distance
+        self.max_distance = max_distance
+
+    def evaluate(self, index: MdlSpatialIndex) -> np.ndarray:
+        distances = index.get_nearest_distances(self.src_group, self.dst_group)
+
+        mask = ~np.isnan(distances)
+        if self.min_distance is not None:
+            mask &= distances >= self.min_distance
+        if self.max_distance is not None:
+            mask &= distances <= self.max_distance
+        return mask
@@ -1,8 +1,18 @@
 from .vmd_dataset_list_item import VmdDatasetListItem, VmdDatasetDataType, DEFAULT_FILE_PATH
 from .vmd_dataset_list      import VmdDatasetList
 from .vmd_current_dataset   import VmdCurrentDataset, VmdSelectionChangedData
-from .vmd_football_pitch    import VmdFootballPitch, VmdPitchPlayersData
+from .vmd_football_pitch    import VmdFootballPitch, VmdPitchPaintBuffer, VmdPitchVisibleAreas
+from .vmd_playback          import VmdPlayback, VmdPlaybackStats
+from .vmd_heatmap           import VmdHeatmap, VmdPitchHeatmaps
+from .vmd_spatial_query     import VmdSpatialQuery
+from .vmd_events_filter     import VmdEventsFilter, VmdEventsFilterOptions
+from .vmd_timeline          import VmdTimeline
 
 vmd_football_pitch  = VmdFootballPitch()
 vmd_dataset_list    = VmdDatasetList()
-vmd_current_dataset = VmdCurrentDataset(vmd_football_pitch)
\ No newline at end of file
+vmd_current_dataset = VmdCurrentDataset(vmd_football_pitch)
+vmd_playback        = VmdPlayback(vmd_current_dataset)
+vmd_heatmap         = VmdHeatmap(vmd_current_dataset, vmd_football_pitch)
+vmd_spatial_query   = VmdSpatialQuery(vmd_current_dataset)
+vmd_events_filter   = VmdEventsFilter(vmd_current_dataset)
+vmd_timeline        = VmdTimeline(vmd_current_dataset)
\ No newline at end of file
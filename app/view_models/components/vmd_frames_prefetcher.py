@@ -0,0 +1,140 @@
+"""Contains cache of frames' paint data which is filled in the background with frames around the shown one."""
+
+from collections import OrderedDict
+from threading   import Thread, Condition
+from typing      import Any, Callable
+
+from app.view_models.vmd_dataset_list_item import VmdDatasetListItem
+
+
+# number of frames prepared in advance on each side of the shown frame
+DEFAULT_PREFETCH_WINDOW = 16
+# number of frames kept in the cache (least recently used are dropped first)
+DEFAULT_CACHE_CAPACITY  = 256
+
+
+class VmdFramesPrefetcher:
+    """
+    LRU cache of data prepared for single frames (e.g. paint data of players) keyed by dataset id, version of
+    dataset's data and frame number. Whenever a frame is requested, next and previous frames are prepared by
+    a background thread, so that stepping through frames or playback finds them ready in the cache.
+    Frames are prepared by calculate_func(item, frame_no), which must not change state shared with the GUI thread.
+    """
+
+    def __init__(self, calculate_func: Callable[[VmdDatasetListItem, int], Any]
+                 , window: int = DEFAULT_PREFETCH_WINDOW, capacity: int = DEFAULT_CACHE_CAPACITY):
+        """
+        :param calculate_func: Function preparing data of given frame of the dataset.
+        :param window: Number of frames prepared in advance on each side of the requested frame.
+        :param capacity: Maximal number of frames kept in the cache. Should be greater than 2 * window.
+        """
+        self._calculate = calculate_func
+        self._window    = window
+        self._capacity  = max(capacity, 2 * window + 1)
+
+        self._cache: OrderedDict[tuple[int, int, int], Any] = OrderedDict()
+        # frames waiting to be prepared: (item, data key, frame number) - nearest frames first
+        self._pending: list[tuple[VmdDatasetListItem, tuple[int, int], int]] = list()
+        self._cond = Condition()
+        self._thread: Thread = None
+        self._stopped = False
+
+        self._hits   = 0
+        self._misses = 0
+
+    def get_stats(self) -> tuple[int, int]:
+        """
+        :return: Number of requests served from the cache and number of frames calculated on request.
+        """
+        return self._hits, self._misses
+
+    def get(self, item: VmdDatasetListItem, frame_no: int) -> Any:
+        """
+        Returns data of given frame - from the cache or calculated in place if not prepared yet. Frames around
+        the requested one are scheduled for preparation in the background.
+        """
+        key = (*item.get_data_key(), frame_no)
+
+        with self._cond:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+
+        if value is None:
+            value = self._calculate(item, frame_no)
+            self._misses += 1
+            with self._cond:
+                self._put(key, value)
+
+        self._schedule(item, frame_no)
+        return value
+
+    def clear(self):
+        with self._cond:
+            self._cache.clear()
+            self._pending.clear()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._pending.clear()
+            self._cond.notify()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _put(self, key: tuple[int, int, int], value: Any):
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._capacity:
+            self._cache.popitem(last=False)
+
+    def _schedule(self, item: VmdDatasetListItem, frame_no: int):
+        """
+        Replaces frames waiting for preparation with the window around given frame (frames of previous requests
+        are not needed anymore). Following frames go before preceding ones at the same distance.
+        """
+        frames_no = item.get_frames_no()
+        data_key  = item.get_data_key()
+
+        frame_nos = list()
+        for distance in range(1, self._window + 1):
+            frame_nos += [frame_no + distance, frame_no - distance]
+
+        with self._cond:
+            if self._stopped:
+                return
+
+            self._pending = [
+                (item, data_key, no) for no in frame_nos
+                if 1 <= no <= frames_no and (*data_key, no) not in self._cache
+            ]
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name=self.__class__.__name__, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                item, data_key, frame_no = self._pending.pop(0)
+                key = (*data_key, frame_no)
+                if key in self._cache or item.get_data_key() != data_key:
+                    continue
+
+            try:
+                value = self._calculate(item, frame_no)
+            except Exception:
+                # data of the dataset may be just being replaced - the frame is calculated on request if needed
+                continue
+
+            with self._cond:
+                # value calculated while data was changing is dropped, it could mix old and new data
+                if item.get_data_key() == data_key:
+                    self._put(key, value)
@@ -0,0 +1,100 @@
+"""Contains application-wide pool of worker processes used for calculation of datasets' data."""
+
+import os
+import atexit
+import multiprocessing
+from threading          import Lock
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+
+
+# big source files are split into parts parsed by all workers, so by default every CPU gets its worker
+DEFAULT_MAX_WORKERS = 8
+START_METHOD        = 'spawn'
+
+
+class VmdProcessPool:
+    """
+    Lazily created pool of worker processes shared by all datasets. Worker processes are started on the first
+    submitted task and stay alive between recalculations, so repeated loads do not pay process startup and import
+    costs again. Pool is shut down on interpreter exit (or earlier, by calling shutdown).
+    """
+
+    def __init__(self, max_workers: int = None):
+        """
+        :param max_workers: Number of worker processes. By default the smaller of DEFAULT_MAX_WORKERS and number of CPUs.
+        """
+        self._max_workers = max_workers or min(DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+        self._executor: ProcessPoolExecutor = None
+        self._lock = Lock()
+        self._exit_handler_registered = False
+
+    def get_max_workers(self) -> int:
+        return self._max_workers
+
+    def set_max_workers(self, max_workers: int):
+        """
+        Changes number of worker processes. Running pool (if any) finishes its tasks and is replaced by a new one
+        on the next submitted task.
+        """
+        if max_workers < 1:
+            raise ValueError(f'{self.__class__.__name__}: number of workers must be positive')
+
+        with self._lock:
+            if max_workers == self._max_workers:
+                return
+            self._max_workers = max_workers
+            self._shutdown_executor(wait=False, cancel_futures=False)
+
+    def is_running(self) -> bool:
+        return self._executor is not None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawned workers behave the same on every platform and do not inherit state of Qt application
+                self._executor = ProcessPoolExecutor(
+                      max_workers = self._max_workers
+                    , mp_context  = multiprocessing.get_context(START_METHOD))
+
+                if not self._exit_handler_registered:
+                    atexit.register(self.shutdown)
+                    self._exit_handler_registered = True
+            return self._executor
+
+    def submit(self, func, *args, **kwargs) -> Future:
+        """
+        Schedules func(*args, **kwargs) to be executed by one of worker processes. If the pool is broken
+        (e.g. a worker process was killed), it is replaced by a new one.
+        """
+        try:
+            return self._get_executor().submit(func, *args, **kwargs)
+        except BrokenProcessPool:
+            with self._lock:
+                self._shutdown_executor(wait=False, cancel_futures=True)
+            return self._get_executor().submit(func, *args, **kwargs)
+
+    def warm_up(self, func, workers_no: int = 1) -> list[Future]:
+        """
+        Starts worker processes in the background by submitting func (a cheap task, e.g. importing modules needed
+        by the real tasks) once per worker, so that the first real tasks do not wait for process startup.
+        Does nothing if the pool is already running. Further workers are started only when tasks are submitted,
+        so the pool never has more processes than tasks running at once.
+
+        :param workers_no: Number of worker processes to start - capped by the size of the pool.
+        """
+        if self.is_running():
+            return list()
+        return [self.submit(func) for _ in range(min(workers_no, self._max_workers))]
+
+    def _shutdown_executor(self, wait: bool, cancel_futures: bool):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stops worker processes. Tasks not started yet are cancelled. Pool is created again if any task is submitted later.
+        """
+        with self._lock:
+            self._shutdown_executor(wait=wait, cancel_futures=True)
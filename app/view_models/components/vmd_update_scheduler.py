@@ -0,0 +1,56 @@
+"""Contains scheduler which collapses many update requests made within one event loop iteration into a single update."""
+
+from typing       import Callable
+from PyQt5.QtCore import QObject, QTimer
+
+
+class VmdUpdateStats:
+
+    def __init__(self, requested: int = 0, executed: int = 0):
+        # number of update requests and number of updates really executed
+        self.requested = requested
+        self.executed  = executed
+
+    @property
+    def suppressed(self) -> int:
+        return self.requested - self.executed
+
+
+class VmdUpdateScheduler(QObject):
+    """
+    Defers updates to the next iteration of the event loop. An update requested many times before it is executed
+    (e.g. by several signals triggered by a single user action) is executed only once. Updates are executed
+    in order of their first requests. Must be used from the thread of the scheduler only (GUI thread).
+    """
+
+    def __init__(self, parent: QObject = None):
+        super(VmdUpdateScheduler, self).__init__(parent)
+        self._pending: dict[Callable, None] = dict()
+        self._stats = VmdUpdateStats()
+
+    def get_stats(self) -> VmdUpdateStats:
+        return self._stats
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def schedule(self, update: Callable):
+        """
+        Requests execution of update (callable without arguments) in the next iteration of the event loop.
+        """
+        self._stats.requested += 1
+        if update in self._pending:
+            return
+
+        if not self._pending:
+            QTimer.singleShot(0, self.flush)
+        self._pending[update] = None
+
+    def flush(self):
+        """
+        Executes pending updates at once. Updates requested meanwhile are executed in the next iteration.
+        """
+        pending, self._pending = self._pending, dict()
+        for update in pending:
+            self._stats.executed += 1
+            update()
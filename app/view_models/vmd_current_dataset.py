@@ -1,9 +1,16 @@
+import numpy            as np
+from functools          import reduce
 from PyQt5.QtCore       import QObject, pyqtSignal, QThread
 
 from app.view_models.vmd_dataset_list_item import VmdDatasetListItem
-from app.view_models.vmd_football_pitch    import VmdFootballPitch
+from app.view_models.vmd_football_pitch    import VmdFootballPitch, VmdPitchPaintBuffer
+from app.view_models.components.vmd_frames_prefetcher import VmdFramesPrefetcher
+from app.view_models.components.vmd_update_scheduler  import VmdUpdateScheduler, VmdUpdateStats
 from app.view_models                       import vmd_football_pitch
 
+# movement of players is animated (if enabled) only between frames which are at most that far from each other
+TWEEN_MAX_FRAMES_STEP = 8
+
 
 class VmdSelectionChangedData:
     
@@ -30,19 +37,35 @@ class VmdCurrentDataset(QObject):
     selection_changed = pyqtSignal(VmdSelectionChangedData)
 
     recalculation_in_progress = pyqtSignal(bool)
+    # sorted numbers of frames stepped through by next/previous_selected_frame or None if all frames are selected
+    frames_selection_changed  = pyqtSignal(object)
     
     def __init__(self, football_pitch_vmodel: VmdFootballPitch = None):
         super(VmdCurrentDataset, self).__init__()
         self._fp_vm = football_pitch_vmodel or vmd_football_pitch
+        # paint data of frames around the current one is prepared in the background
+        self._prefetcher = VmdFramesPrefetcher(self._calculate_paint_data)
+        # a single user action can edit the dataset many times - views are updated once per event loop iteration
+        self._scheduler  = VmdUpdateScheduler(self)
 
         self._current_dli: VmdDatasetListItem = None
-        self.get_dataset_edited_slot = lambda: self.dataset_edited.emit(self._current_dli or VmdDatasetListItem())
+        # dataset id, data version and number of the frame shown on the pitch
+        self._shown_frame_key: tuple[int, int, int] = None
+        # frames selected by every source (e.g. a query) and frames selected by all of them
+        self._frames_selections: dict[str, np.ndarray] = dict()
+        self._frames_selection: np.ndarray = None
 
     def get_current_item(self) -> VmdDatasetListItem:
         return self._current_dli
     
     def get_current_item_data(self) -> VmdDatasetListItem:
         return self._current_dli or VmdDatasetListItem()
+
+    def get_current_data_key(self) -> tuple[int, int] | None:
+        """
+        Returns data key (see VmdDatasetListItem.get_data_key) of the current dataset or None if there is none.
+        """
+        return self._current_dli.get_data_key() if self._current_dli else None
     
     def change_current_item(self, item: VmdDatasetListItem):
         old = self._current_dli
@@ -52,17 +75,28 @@ class VmdCurrentDataset(QObject):
         self._subscribe_to_list_item(item)
 
         self.selection_changed.emit(VmdSelectionChangedData(old=old, new=item))
-        self.get_data()
+        self._scheduler.schedule(self.get_data)
 
     def _subscribe_to_list_item(self, item: VmdDatasetListItem):
         if item:
-            item.dataset_edited.connect(self.get_dataset_edited_slot)
-            item.dataset_edited.connect(self.get_data)
+            item.dataset_edited.connect(self._item_edited)
 
     def _unsubscribe_to_list_item(self, item: VmdDatasetListItem):
         if item:
-            item.dataset_edited.disconnect(self.get_dataset_edited_slot)
-            item.dataset_edited.disconnect(self.get_data)
+            item.dataset_edited.disconnect(self._item_edited)
+
+    def _item_edited(self):
+        self._scheduler.schedule(self._emit_dataset_edited)
+        self._scheduler.schedule(self.get_data)
+
+    def _emit_dataset_edited(self):
+        self.dataset_edited.emit(self._current_dli or VmdDatasetListItem())
+
+    def get_update_stats(self) -> VmdUpdateStats:
+        """
+        :return: Numbers of requested and executed updates of views - the difference was suppressed as redundant.
+        """
+        return self._scheduler.get_stats()
     
     def set_current_frame(self, val: int | str):
         if self._current_dli:
@@ -76,10 +110,67 @@ class VmdCurrentDataset(QObject):
         if self._current_dli:
             self._current_dli.previous_frame()
 
+    def get_frames_selection(self) -> np.ndarray | None:
+        return self._frames_selection
+
+    def set_frames_selection(self, source: str, frame_nos: np.ndarray | None):
+        """
+        Sets frames selected by given source - only frames selected by all sources are stepped through.
+
+        :param source: Name of the selecting source.
+        :param frame_nos: Sorted numbers of selected frames or None to drop selection of the source.
+        """
+        if frame_nos is None:
+            self._frames_selections.pop(source, None)
+        else:
+            self._frames_selections[source] = frame_nos
+
+        selections = list(self._frames_selections.values())
+        self._frames_selection = reduce(np.intersect1d, selections) if selections else None
+        self.frames_selection_changed.emit(self._frames_selection)
+
+    def next_selected_frame(self):
+        """
+        Moves to the closest selected frame after the current one (if any).
+        """
+        if self._current_dli and self._frames_selection is not None:
+            pos = np.searchsorted(self._frames_selection, self._current_dli.get_curr_frame(), side='right')
+            if pos < len(self._frames_selection):
+                self._current_dli.set_current_frame(int(self._frames_selection[pos]))
+
+    def previous_selected_frame(self):
+        """
+        Moves to the closest selected frame before the current one (if any).
+        """
+        if self._current_dli and self._frames_selection is not None:
+            pos = np.searchsorted(self._frames_selection, self._current_dli.get_curr_frame(), side='left') - 1
+            if pos >= 0:
+                self._current_dli.set_current_frame(int(self._frames_selection[pos]))
+
     def get_data(self, item: VmdDatasetListItem = None):
         if self._current_dli:
-            lineups_frame, players_frame, events_frame = self._current_dli.get_data()
-            self._fp_vm.get_data(players_frame, events_frame, lineups_frame)
+            item = self._current_dli
+            frame_key = (*item.get_data_key(), item.get_curr_frame())
+            paint_data = self._prefetcher.get(item, frame_key[2])
+
+            # only frames of the same data close to each other are animated, e.g. not jumps across the match
+            last_key = self._shown_frame_key
+            animate = last_key is not None and last_key[:2] == frame_key[:2] \
+                and 0 < abs(frame_key[2] - last_key[2]) <= TWEEN_MAX_FRAMES_STEP
+
+            # polygons of visible area are calculated for all frames at once, when data changes
+            if last_key is None or last_key[:2] != frame_key[:2]:
+                self._fp_vm.set_visible_areas(*item.get_visible_area_data())
+
+            self._shown_frame_key = frame_key
+            self._fp_vm.set_visible_area_frame(frame_key[2])
+            self._fp_vm.set_paint_data(paint_data, animate=animate)
+
+    def _calculate_paint_data(self, item: VmdDatasetListItem, frame_no: int) -> VmdPitchPaintBuffer:
+        return self._fp_vm.calculate_paint_data(*item.get_frame_data(frame_no))
+
+    def get_prefetcher(self) -> VmdFramesPrefetcher:
+        return self._prefetcher
     
     def refresh_data(self):
         if self._current_dli:
@@ -27,6 +27,7 @@ class VmdDatasetList(QObject):
                 self._unsubscribe_to_list_item(dli)
 
                 self.list_item_deleted.emit(dli)
+                dli.release_data()
 
                 break
             idx -= 1
@@ -1,13 +1,17 @@
 import os
+import re
+import numpy            as np
 import pandas           as pd
 from enum               import Enum
 from PyQt5.QtWidgets    import QFileDialog
 from PyQt5.QtCore       import QObject, pyqtSignal
-from concurrent.futures import ProcessPoolExecutor
-from concurrent.futures import as_completed
-from multiprocessing    import freeze_support, set_start_method
+from concurrent.futures import Future, as_completed
 
-from app.models import MdlEventsData, MdlFramesData, MdlLineupsData
+from app.models import MdlEventsData, MdlFramesData, MdlLineupsData, MdlResultsCache, MdlFramesJoin, MdlFramesJoinRow
+from app.models import MdlSpatialIndex, MdlSpatialPredicate, MdlEventsFilter
+from app.models.components.mdl_ragged_frame import MdlRaggedFrame
+from app.ingestion import IngParseTask, IngResultsTransfer, export_parse_task, warm_up_worker
+from app.view_models.components.vmd_process_pool import VmdProcessPool
 
 
 DEFAULT_DATASET_NAME        = '<dataset name {no}>'
@@ -15,7 +19,15 @@ DEFAULT_FILE_PATH           = '<no data>'
 MAX_FILEPATH_DISPLAY_LEN    = 80
 FILTER_JSON_DATA_FILES      = 'Json Files (*.json)'
 
+MEMORY_SIZE_UNITS = ['B', 'KiB', 'MiB', 'GiB']
+
+EMODEL_FUNC_ID, FMODEL_FUNC_ID, LMODEL_FUNC_ID = 'emodel', 'fmodel', 'lmodel'
+# small files are parsed in place - sending them to a worker process costs more than parsing
+INLINE_FUNC_IDS = { LMODEL_FUNC_ID }
+
 DEFAULT_TIMESTAMP = 'N/A'
+# typed time of the match clock - minutes, optionally seconds (with fraction), e.g. "67", "67:30" or "67:30.5"
+MATCH_TIME_PATTERN = re.compile(r'^\s*(\d+)\s*(?::\s*(\d{1,2}(?:\.\d*)?))?\s*$')
 DEFAULT_CURR_FRAME = 0 
 DEFAULT_FRAMES_NO  = 0
 
@@ -29,6 +41,10 @@ class VmdDatasetDataType(Enum):
 class VmdDatasetListItem(QObject):
 
     cnt = -1
+    # cache of calculated frames shared by all datasets
+    results_cache = MdlResultsCache()
+    # worker processes shared by all datasets - started on the first recalculation and reused by the next ones
+    process_pool = VmdProcessPool()
 
     dataset_name_changed    = pyqtSignal(str)
     dataset_edited          = pyqtSignal()
@@ -41,9 +57,15 @@ class VmdDatasetListItem(QObject):
         VmdDatasetListItem.cnt += 1
         self._cnt = VmdDatasetListItem.cnt
 
-        self._events_model = MdlEventsData()
-        self._frames_model = MdlFramesData()
-        self._lineups_model = MdlLineupsData()
+        self._events_model = MdlEventsData(results_cache=self.results_cache)
+        self._frames_model = MdlFramesData(results_cache=self.results_cache)
+        self._lineups_model = MdlLineupsData(results_cache=self.results_cache)
+        # details of every frame's event - built after recalculation of data
+        self._frames_join = MdlFramesJoin()
+        # grid of players' positions of all frames - built after recalculation of data
+        self._spatial_index = MdlSpatialIndex()
+        # results received from worker processes, backing data of models - by model's func_id
+        self._results_transfers: dict[str, IngResultsTransfer] = dict()
 
         self._dataset_name: str     = None 
         self.set_dataset_name(dataset_name)
@@ -55,27 +77,114 @@ class VmdDatasetListItem(QObject):
 
         self._frames_no  = self._frames_model.get_frames_no() or DEFAULT_FRAMES_NO
         self._curr_frame = DEFAULT_CURR_FRAME 
+        # changed whenever data of frames may change - data prepared for a frame is valid only for the same version
+        self._data_version = 0
 
     def get_id(self) -> int:
         return self._cnt
+
+    def get_data_version(self) -> int:
+        return self._data_version
+
+    def get_data_key(self) -> tuple[int, int]:
+        """
+        Returns id of the dataset and version of its data - anything prepared from the calculated data (e.g. paint
+        data of a frame or a selection of frames) stays valid as long as the key does not change.
+        """
+        return self._cnt, self._data_version
     
     def get_team_names(self) -> tuple[str, str]:
         return self._lineups_model.get_team_names()
+
+    def get_team_ids(self) -> tuple[int, int]:
+        return self._lineups_model.get_team_ids()
+
+    def get_event_types(self) -> list[tuple[int, str]]:
+        return self._events_model.get_event_types()
+
+    def get_event_periods(self) -> list[int]:
+        return self._events_model.get_periods()
     
     def get_timestamp(self) -> str:
-        event_uuid = self._frames_model.get_event_uuid_by_frame(self._curr_frame)
-        if not event_uuid:
-            return DEFAULT_TIMESTAMP
-        
-        mmn, sec = self._events_model.get_timestamp_raw_by_event_uuid(event_uuid)
-        if mmn is None or sec is None: 
+        match_time_ms = self._frames_join.get_match_time_ms(self._curr_frame)
+        if match_time_ms < 0:
             return DEFAULT_TIMESTAMP
 
-        return self._format_timestamp(mmn, sec) or DEFAULT_TIMESTAMP
+        return self._format_timestamp(match_time_ms)
     
-    def _format_timestamp(self, minute: int, second: int) -> str:
-        return f"{str(minute).rjust(2, '0')} : {str(second).rjust(2, '0')}"
+    def get_timeline_ms(self) -> int:
+        return self._frames_join.get_timeline_ms()
+
+    def get_curr_elapsed_ms(self) -> int:
+        """
+        :return Time (in milliseconds) elapsed since the start of the match till the current frame - -1 if unknown.
+        """
+        return self._frames_join.get_elapsed_ms(self._curr_frame)
+
+    def seek_elapsed(self, elapsed_ms: int):
+        """
+        Moves to the frame closest to given time elapsed since the start of the match (without breaks).
+        """
+        frame_no = self._frames_join.get_frame_no_by_elapsed(elapsed_ms)
+        if frame_no > 0 and frame_no != self._curr_frame:
+            self.set_current_frame(frame_no)
+
+    def seek_match_time(self, match_time: str, period: int = None) -> bool:
+        """
+        Moves to the frame closest to given time of the match clock, e.g. "67:30".
+
+        :return: False if the time cannot be parsed or the dataset has no timeline.
+        """
+        match = MATCH_TIME_PATTERN.match(match_time or '')
+        if not match:
+            return False
+
+        match_time_ms = int(match.group(1)) * 60_000 + round(float(match.group(2) or 0) * 1000)
+        elapsed_ms = self._frames_join.get_elapsed_by_match_time(match_time_ms, period)
+        if elapsed_ms < 0:
+            return False
+
+        self.seek_elapsed(elapsed_ms)
+        return True
+
+    def _format_timestamp(self, match_time_ms: int) -> str:
+        minute, second_ms = divmod(match_time_ms, 60_000)
+        return f"{str(minute).rjust(2, '0')} : {str(second_ms // 1000).rjust(2, '0')}.{str(second_ms % 1000).rjust(3, '0')}"
     
+    def memory_usage(self) -> dict[str, dict[str, int]]:
+        """
+        Returns number of bytes used by every part of the dataset's calculated data, grouped by source model.
+
+        :return: Dictionary of model name -> (dictionary of part name -> number of bytes).
+        """
+        return {
+              VmdDatasetDataType.LINEUPS.name.lower(): self._lineups_model.memory_usage()
+            , VmdDatasetDataType.EVENTS.name.lower() : self._events_model.memory_usage()
+            , VmdDatasetDataType.FRAMES.name.lower() : self._frames_model.memory_usage()
+            , 'frames_join'                          : { 'frames_join': self._frames_join.get_nbytes() }
+            , 'spatial_index'                        : { 'spatial_index': self._spatial_index.get_nbytes() }
+        }
+
+    def get_memory_usage_data(self) -> str:
+        usage  = { name: sum(parts.values()) for name, parts in self.memory_usage().items() }
+        total  = self._format_memory_size(sum(usage.values()))
+        models = ', '.join(f'{name}: {self._format_memory_size(nbytes)}' for name, nbytes in usage.items())
+        return f'{total} ({models})'
+
+    def _format_memory_size(self, nbytes: int) -> str:
+        size = float(nbytes)
+        for unit in MEMORY_SIZE_UNITS:
+            if size < 1024 or unit == MEMORY_SIZE_UNITS[-1]:
+                break
+            size /= 1024
+        return f'{size:.0f} {unit}' if unit == MEMORY_SIZE_UNITS[0] else f'{size:.1f} {unit}'
+
+    def get_frames_no(self) -> int:
+        return self._frames_no
+
+    def get_curr_frame(self) -> int:
+        return self._curr_frame
+
     def get_frames_no_data(self) -> str:
         return str(self._frames_no)
     
@@ -117,17 +226,27 @@ class VmdDatasetListItem(QObject):
 
     def set_frames_filepath(self, value: str):
         self._frames_model.set_json_filepath(value)
+        self._frames_join.reset()
+        self._spatial_index.reset()
+        self._set_results_transfer(FMODEL_FUNC_ID, None)
         self._frames_filepath = self._get_display_path(value)
+        self._data_version += 1
         self.dataset_edited.emit()
 
     def set_events_filepath(self, value: str):
         self._events_model.set_json_filepath(value)
+        self._frames_join.reset()
+        self._set_results_transfer(EMODEL_FUNC_ID, None)
         self._events_filepath = self._get_display_path(value)
+        self._data_version += 1
         self.dataset_edited.emit()
 
     def set_lineups_filepath(self, value: str):
         self._lineups_model.set_json_filepath(value)
+        self._frames_join.reset()
+        self._set_results_transfer(LMODEL_FUNC_ID, None)
         self._lineups_filepath = self._get_display_path(value)
+        self._data_version += 1
         self.dataset_edited.emit()
     
     def _set_frames_no(self, val: int):
@@ -177,47 +296,188 @@ class VmdDatasetListItem(QObject):
             if data_type_name == VmdDatasetDataType.FRAMES.name:
                 self.set_frames_filepath(filepath) 
 
-    def get_data(self) -> tuple[pd.DataFrame]:
+    def get_data(self) -> tuple[pd.DataFrame, MdlFramesJoinRow]:
         """
-        :return lineups_frame, players_frame, events_frame
+        :return players_frame, join_row (details of the current frame's event - None if not available)
         """
-        event_uuid = self._frames_model.get_event_uuid_by_frame(self._curr_frame)
+        return self.get_frame_data(self._curr_frame)
 
-        lineups_frame = self._lineups_model.get_lineups_frame()
-        players_frame = self._frames_model.get_players_frame_by_frame(self._curr_frame)
-        events_frame  = self._events_model.get_events_frame_by_event_uuid(event_uuid)
+    def get_visible_area_data(self) -> tuple[MdlRaggedFrame, MdlFramesJoin]:
+        """
+        :return visible_area (polygons of all frames), frames_join (details of all frames' events)
+        """
+        return self._frames_model.get_visible_area(), self._frames_join
+
+    def get_players_data(self) -> tuple[MdlRaggedFrame, MdlFramesJoin]:
+        """
+        :return players (players of all frames), frames_join (details of all frames' events)
+        """
+        return self._frames_model.get_players(), self._frames_join
+
+    def select_frames(self, predicates: list[MdlSpatialPredicate]) -> np.ndarray:
+        """
+        :return Sorted numbers of frames which players' positions fulfill all given predicates.
+        """
+        return self._spatial_index.select_frames(predicates)
 
-        return lineups_frame, players_frame, events_frame
+    def select_event_frames(self, events_filter: MdlEventsFilter) -> np.ndarray:
+        """
+        :return Sorted numbers of frames which events fulfill given filter.
+        """
+        return self._frames_join.get_frame_nos_by_events(events_filter.evaluate(self._events_model))
+
+    def get_frame_data(self, frame_no: int) -> tuple[pd.DataFrame, MdlFramesJoinRow]:
+        """
+        :return players_frame, join_row (details of the given frame's event - None if not available)
+        """
+        players_frame = self._frames_model.get_players_frame_by_frame(frame_no)
+        join_row      = self._frames_join.get_row(frame_no)
+
+        return players_frame, join_row
         
     def refresh_data(self):
         self.set_current_frame(val=1)
 
-    def recalculate_data(self):
-        executor = ProcessPoolExecutor(max_workers=3)
-        futures  = list()
+    def invalidate_cached_data(self) -> int:
+        """
+        Removes calculated frames of all dataset's files from the cache, so that the next recalculation parses them again.
 
-        freeze_support()
-        set_start_method("spawn", force=True)
+        :return: Number of removed cache entries.
+        """
+        return sum(model.invalidate_cached_result_frames() 
+                   for model in (self._events_model, self._frames_model, self._lineups_model))
+
+    def _get_models(self) -> dict[str, MdlEventsData | MdlFramesData | MdlLineupsData]:
+        return {
+              EMODEL_FUNC_ID: self._events_model
+            , FMODEL_FUNC_ID: self._frames_model
+            , LMODEL_FUNC_ID: self._lineups_model
+        }
+
+    def _set_results_transfer(self, func_id: str, transfer: IngResultsTransfer | None):
+        """
+        Replaces results received from worker process for given model - previous ones (if any) are released.
+        """
+        old_transfer = self._results_transfers.pop(func_id, None)
+        if transfer is not None:
+            self._results_transfers[func_id] = transfer
+        if old_transfer is not None:
+            old_transfer.release()
 
-        EMODEL_FUNC_ID, FMODEL_FUNC_ID, LMODEL_FUNC_ID = 'emodel', 'fmodel', 'lmodel'
+    def _set_transferred_results(self, func_id: str, transfers: list[IngResultsTransfer]):
+        """
+        Sets results received from worker processes to the model. Results of many parts of the source file are 
+        merged in order - merged results are cached and the parts are released.
+        """
+        model = self._get_models()[func_id]
+        if len(transfers) == 1:
+            model.set_result_frames(*transfers[0].get_results())
+            self._set_results_transfer(func_id, transfers[0])
+            return
+
+        frames = model.merge_result_frames([transfer.get_results() for transfer in transfers])
+        model.store_cached_result_frames(frames)
+        model.set_result_frames(*frames)
+
+        self._set_results_transfer(func_id, None)
+        for transfer in transfers:
+            transfer.release()
+
+    @staticmethod
+    def _release_parse_futures(futures: dict[Future, tuple[str, int]], received: set[Future]
+                               , transfers: dict[str, dict[int, IngResultsTransfer]]):
+        """
+        Cleans up after a failed recalculation - parse tasks not started yet are cancelled, results of the other ones
+        (already received or still being produced) are released.
+        """
+        for future in futures:
+            future.cancel()
+
+        for parts in transfers.values():
+            for transfer in parts.values():
+                transfer.release()
+
+        for future in futures:
+            if future in received or future.cancelled():
+                continue
+            try:
+                descriptor = future.result()
+            except BaseException:
+                continue
+            IngResultsTransfer(descriptor).release()
+
+    def release_data(self):
+        """
+        Drops calculated data of the dataset and removes files of results received from worker processes.
+        """
+        for model in (self._events_model, self._frames_model, self._lineups_model):
+            model.reset_result_frames()
+        self._frames_join.reset()
+        self._spatial_index.reset()
+        for func_id in list(self._results_transfers):
+            self._set_results_transfer(func_id, None)
 
-        futures.append(executor.submit(self._events_model.get_result_frames, EMODEL_FUNC_ID))
-        futures.append(executor.submit(self._frames_model.get_result_frames, FMODEL_FUNC_ID))
-        futures.append(executor.submit(self._lineups_model.get_result_frames,LMODEL_FUNC_ID))
+        self._frames_no  = DEFAULT_FRAMES_NO
+        self._curr_frame = DEFAULT_CURR_FRAME
+        self._data_version += 1
 
-        data_upd_dict = { 
-              EMODEL_FUNC_ID: self._events_model.set_result_frames
-            , FMODEL_FUNC_ID: self._frames_model.set_result_frames
-            , LMODEL_FUNC_ID: self._lineups_model.set_result_frames
-        }
-        
-        for future in as_completed(futures):
-            func_id, df_tuple = future.result()
-            data_upd_dict[func_id](*df_tuple)
-        
-        executor.shutdown()
+    def recalculate_data(self):
+        models = self._get_models()
+        # the first worker process starts (once) while the cache is checked - nothing is started with the application
+        self.process_pool.warm_up(warm_up_worker)
+
+        # frames of files which have not changed since the last calculation are read from the cache
+        for func_id in list(models):
+            cached_frames = models[func_id].load_cached_result_frames()
+            if cached_frames is not None:
+                models.pop(func_id).set_result_frames(*cached_frames)
+                self._set_results_transfer(func_id, None)
+
+        inline_models = { func_id: models.pop(func_id) for func_id in INLINE_FUNC_IDS.intersection(models) }
+
+        # workers get plain description of the job only - they do not unpickle (and import) anything of the GUI;
+        # results come back as memory-mapped files, only their descriptors are pickled
+        # big files are split into record-aligned parts parsed by many workers at once
+        futures, parts_no = dict(), dict()
+        for func_id, model in models.items():
+            byte_ranges = model.get_chunk_ranges(self.process_pool.get_max_workers())
+            byte_ranges = byte_ranges if len(byte_ranges) > 1 else [None]
+            parts_no[func_id] = len(byte_ranges)
+
+            for part_no, byte_range in enumerate(byte_ranges):
+                task = IngParseTask.from_model(model, func_id, byte_range=byte_range)
+                futures[self.process_pool.submit(export_parse_task, task)] = (func_id, part_no)
+
+        for func_id, model in inline_models.items():
+            model.set_result_frames(*model.get_result_frames_cached(func_id)[1])
+            self._set_results_transfer(func_id, None)
+
+        # results received but not set to models yet - released if any part fails, so their files do not leak
+        transfers = { func_id: dict() for func_id in models }
+        received = set()
+        try:
+            for future in as_completed(futures):
+                func_id, part_no = futures[future]
+                received.add(future)
+                transfers[func_id][part_no] = IngResultsTransfer(future.result())
+
+                if len(transfers[func_id]) == parts_no[func_id]:
+                    parts = transfers.pop(func_id)
+                    try:
+                        self._set_transferred_results(func_id, [parts[no] for no in range(parts_no[func_id])])
+                    except BaseException:
+                        transfers[func_id] = parts
+                        raise
+        except BaseException:
+            self._release_parse_futures(futures, received, transfers)
+            raise
+
+        self._frames_join.build(self._frames_model, self._events_model, self._lineups_model)
+        self._spatial_index.build(self._frames_model)
             
         self._frames_no  = self._frames_model.get_frames_no() or DEFAULT_FRAMES_NO
         self._curr_frame = 1 if self._frames_no > 0 else DEFAULT_CURR_FRAME
+        # version changes after all the data is replaced, so nothing prepared from partial data is reused
+        self._data_version += 1
 
         self.dataset_edited.emit()
\ No newline at end of file
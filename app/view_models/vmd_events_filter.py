@@ -0,0 +1,107 @@
+import numpy  as np
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from app.models import EventsFrameColNames, MdlEventsFilter, MdlEventsValueFilter, MdlEventsAllFilter
+from app.view_models.vmd_current_dataset import VmdCurrentDataset
+
+
+# name of the frames' selection source in the current dataset's view model
+EVENTS_FILTER_SELECTION = 'events_filter'
+
+
+class VmdEventsFilterOptions:
+
+    def __init__(self, event_types: list[tuple[int, str]] = None, periods: list[int] = None):
+        # (type id, type name) of events occurring in the current dataset and its periods
+        self.event_types = event_types or list()
+        self.periods     = periods or list()
+
+
+class VmdEventsFilter(QObject):
+    """
+    Selects frames of the current dataset which events are of the chosen type, team and period - the pitch controls
+    step through them. Frames are found with inverted indexes of events once per change of the filter or data,
+    stepping only searches the selected frames' numbers.
+    """
+
+    ECN = EventsFrameColNames
+
+    options_changed = pyqtSignal(VmdEventsFilterOptions)
+
+    def __init__(self, current_dataset_vmodel: VmdCurrentDataset):
+        super(VmdEventsFilter, self).__init__()
+        self._cd_vm = current_dataset_vmodel
+
+        self._type_id: int  = None
+        self._team_idx: int = None
+        self._period: int   = None
+
+        self._options = VmdEventsFilterOptions()
+        # data key of the dataset the options and the selection were prepared for
+        self._selection_key: tuple[int, int] = None
+
+        self._cd_vm.selection_changed.connect(self._dataset_changed)
+        self._cd_vm.dataset_edited.connect(self._dataset_changed)
+
+    def get_options(self) -> VmdEventsFilterOptions:
+        return self._options
+
+    def get_type_id(self) -> int | None:
+        return self._type_id
+
+    def get_team_idx(self) -> int | None:
+        return self._team_idx
+
+    def get_period(self) -> int | None:
+        return self._period
+
+    def set_type_id(self, type_id: int | None):
+        self._type_id = type_id
+        self._update_selection()
+
+    def set_team_idx(self, team_idx: int | None):
+        self._team_idx = team_idx
+        self._update_selection()
+
+    def set_period(self, period: int | None):
+        self._period = period
+        self._update_selection()
+
+    def get_filter(self) -> MdlEventsFilter | None:
+        """
+        Returns filter of the chosen details - None if no detail is chosen.
+        """
+        item = self._cd_vm.get_current_item()
+        filters = list()
+        if self._type_id is not None:
+            filters.append(MdlEventsValueFilter(self.ECN.TYPE_ID, [self._type_id]))
+        if self._team_idx is not None:
+            team_id = item.get_team_ids()[self._team_idx] if item else None
+            filters.append(MdlEventsValueFilter(self.ECN.EVENT_TEAM_ID, [team_id] if team_id is not None else []))
+        if self._period is not None:
+            filters.append(MdlEventsValueFilter(self.ECN.PERIOD, [self._period]))
+
+        return MdlEventsAllFilter(filters) if filters else None
+
+    def _dataset_changed(self, *args):
+        if self._cd_vm.get_current_data_key() == self._selection_key:
+            return
+
+        item = self._cd_vm.get_current_item()
+        self._options = VmdEventsFilterOptions(item.get_event_types(), item.get_event_periods()) if item \
+                   else VmdEventsFilterOptions()
+        self.options_changed.emit(self._options)
+        self._update_selection()
+
+    def _update_selection(self):
+        item = self._cd_vm.get_current_item()
+        self._selection_key = self._cd_vm.get_current_data_key()
+
+        events_filter = self.get_filter()
+        if events_filter is None:
+            frame_nos = None
+        elif item is None:
+            frame_nos = np.empty(0, dtype=np.int64)
+        else:
+            frame_nos = item.select_event_frames(events_filter)
+        self._cd_vm.set_frames_selection(EVENTS_FILTER_SELECTION, frame_nos)
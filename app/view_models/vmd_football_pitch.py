@@ -1,9 +1,12 @@
+import numpy  as np
 import pandas as pd
-from PyQt5.QtCore       import QObject, pyqtSignal
+from PyQt5.QtCore       import QObject, QTimer, QElapsedTimer, Qt, pyqtSignal
 from PyQt5.QtGui        import QColor
 
-from app.models import LineupsFrameColNames, EventsFrameColNames, FramesPlayersColNames
-from app.models import MAX_PLAYER_X_COORD, MAX_PLAYER_Y_COORD
+from app.models import LineupsFrameColNames, EventsFrameColNames, FramesPlayersColNames, MdlFramesJoinRow
+from app.models import MdlFramesJoin, FramesJoinColNames
+from app.models import MAX_PLAYER_X_COORD, MAX_PLAYER_Y_COORD, VISIBLE_AREA_COORDS_COL
+from app.models.components.mdl_ragged_frame import MdlRaggedFrame
 
 
 KEEPER_ACTOR_NAME = 'keeper'
@@ -18,12 +21,112 @@ ICON_COLORS =  {
         }
 
 
-class VmdPitchPlayersData:
-    
-    def __init__(self, x_coord: int, y_coord: int, color: QColor):
-        self.x_coord = x_coord 
-        self.y_coord = y_coord
-        self.color   = color
+# colors of players' icons are stored in a flat palette - each team has a color of field player and keeper, so
+# index of the color is: team index * PALETTE_TEAM_COLORS_NO + (1 if the player is a keeper else 0)
+PALETTE_TEAM_COLORS_NO = 2
+
+# players' movement between frames is animated at display refresh rate (~60 fps)
+TWEEN_INTERVAL_MS     = 16
+# animation takes as long as the time between consecutive frames, but no longer than below
+TWEEN_MAX_DURATION_MS = 250
+
+
+class VmdPitchPaintBuffer:
+    """
+    Data needed to paint players of a single frame, stored as struct of arrays: coordinates (in pitch units, 
+    already mirrored to the displayed direction) and index of the icon's color in the palette for every player.
+    """
+
+    def __init__(self, x_coords: np.ndarray, y_coords: np.ndarray, color_idxs: np.ndarray, palette: list[QColor]):
+        self.x_coords   = x_coords
+        self.y_coords   = y_coords
+        self.color_idxs = color_idxs
+        self.palette    = palette
+
+    @classmethod
+    def empty(cls, palette: list[QColor]) -> 'VmdPitchPaintBuffer':
+        return cls(np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32), np.empty(0, dtype=np.uint8), palette)
+
+    def __len__(self) -> int:
+        return len(self.color_idxs)
+
+
+class VmdPitchVisibleAreas:
+    """
+    Polygons of the camera's visible area of all frames, stored as struct of arrays: coordinates of corners
+    (in pitch units, already mirrored to the displayed direction) of frame with position i are in range
+    offsets[i]:offsets[i + 1]. Area of frame with position i is displayed only if shown[i] is True.
+    """
+
+    def __init__(self, offsets: np.ndarray, x_coords: np.ndarray, y_coords: np.ndarray, shown: np.ndarray):
+        self.offsets  = offsets
+        self.x_coords = x_coords
+        self.y_coords = y_coords
+        self.shown    = shown
+
+    @classmethod
+    def empty(cls) -> 'VmdPitchVisibleAreas':
+        return cls(np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32)
+                   , np.empty(0, dtype=bool))
+
+    def get_frames_no(self) -> int:
+        return len(self.offsets) - 1
+
+
+def match_players(src: VmdPitchPaintBuffer, dst: VmdPitchPaintBuffer) -> np.ndarray:
+    """
+    Matches players of two frames - players are not identified in frames, so every player of dst frame is paired
+    with the nearest not yet paired player of the same team and role (the same icon's color) in src frame.
+    Pairs are chosen greedily, from the closest one.
+
+    :param src: Paint buffer of the previous frame.
+    :param dst: Paint buffer of the next frame.
+    :return: Index of the matched src player for every dst player, -1 if there is no player to pair with.
+    """
+    src_idxs = np.full(len(dst), -1, dtype=np.intp)
+
+    for color_idx in np.unique(dst.color_idxs):
+        dst_group = np.flatnonzero(dst.color_idxs == color_idx)
+        src_group = np.flatnonzero(src.color_idxs == color_idx)
+        if not len(src_group):
+            continue
+
+        dx = dst.x_coords[dst_group, None] - src.x_coords[None, src_group]
+        dy = dst.y_coords[dst_group, None] - src.y_coords[None, src_group]
+        distances = dx.astype(np.int64) ** 2 + dy.astype(np.int64) ** 2
+
+        dst_paired = np.zeros(len(dst_group), dtype=bool)
+        src_paired = np.zeros(len(src_group), dtype=bool)
+        pairs_no   = min(len(dst_group), len(src_group))
+        for flat_idx in np.argsort(distances, axis=None, kind='stable'):
+            row, col = divmod(int(flat_idx), len(src_group))
+            if dst_paired[row] or src_paired[col]:
+                continue
+            dst_paired[row] = src_paired[col] = True
+            src_idxs[dst_group[row]] = src_group[col]
+
+            pairs_no -= 1
+            if not pairs_no:
+                break
+
+    return src_idxs
+
+
+def interpolate_players(src: VmdPitchPaintBuffer, dst: VmdPitchPaintBuffer, src_idxs: np.ndarray
+                        , progress: float) -> VmdPitchPaintBuffer:
+    """
+    Returns positions of dst players on the way from their matched src positions (see match_players).
+    Players without a match stay at their dst positions.
+
+    :param progress: Part of the way already passed - from 0 (src positions) to 1 (dst positions).
+    """
+    matched = src_idxs >= 0
+    start_x = np.where(matched, src.x_coords[src_idxs], dst.x_coords)
+    start_y = np.where(matched, src.y_coords[src_idxs], dst.y_coords)
+
+    x_coords = np.rint(start_x + (dst.x_coords - start_x) * progress).astype(np.int32)
+    y_coords = np.rint(start_y + (dst.y_coords - start_y) * progress).astype(np.int32)
+    return VmdPitchPaintBuffer(x_coords, y_coords, dst.color_idxs, dst.palette)
 
 
 class VmdFootballPitch(QObject):
@@ -34,71 +137,214 @@ class VmdFootballPitch(QObject):
     FPCN = FramesPlayersColNames
 
     player_pitch_data_changed = pyqtSignal(object)
+    visible_areas_changed     = pyqtSignal(object)
+    # position of the frame which visible area is displayed (-1 if none)
+    visible_area_frame_changed = pyqtSignal(int)
+    visible_area_shown_changed = pyqtSignal(bool)
 
     def __init__(self):
         super(VmdFootballPitch, self).__init__()
-        self._last_data: pd.Series[VmdPitchPlayersData] = pd.Series()
+        self._palette = [
+            self.IC[team_idx][actor_name] 
+            for team_idx in sorted(self.IC) for actor_name in (PLAYER_ACTOR_NAME, KEEPER_ACTOR_NAME)
+        ]
+        self._last_data = VmdPitchPaintBuffer.empty(self._palette)
+
+        # animation of players' movement between frames (optional)
+        self._tweening = False
+        self._tween_timer = QTimer(self)
+        self._tween_timer.setTimerType(Qt.PreciseTimer)
+        self._tween_timer.setInterval(TWEEN_INTERVAL_MS)
+        self._tween_timer.timeout.connect(self._tween_step)
+        self._tween_clock    = QElapsedTimer()
+        self._tween_src      = self._last_data
+        self._tween_dst      = self._last_data
+        self._tween_src_idxs = np.empty(0, dtype=np.intp)
+        self._tween_duration = 0
+        # time since the previous frame was set - the next animation should end before the next frame comes
+        self._frame_clock = QElapsedTimer()
+
+        # overlay of the camera's visible area (optional)
+        self._visible_area_shown = False
+        self._visible_areas      = VmdPitchVisibleAreas.empty()
+        self._visible_area_pos   = -1
+
+    def get_paint_data(self) -> VmdPitchPaintBuffer:
+        return self._last_data
+
+    def get_palette(self) -> list[QColor]:
+        return self._palette
+
+    def is_tweening(self) -> bool:
+        return self._tweening
+
+    def set_tweening(self, enabled: bool):
+        self._tweening = bool(enabled)
+        if not self._tweening and self._tween_timer.isActive():
+            self._tween_timer.stop()
+            self._emit_paint_data(self._tween_dst)
+
+    def is_visible_area_shown(self) -> bool:
+        return self._visible_area_shown
+
+    def set_visible_area_shown(self, shown: bool):
+        self._visible_area_shown = bool(shown)
+        self.visible_area_shown_changed.emit(self._visible_area_shown)
+
+    def get_visible_areas(self) -> VmdPitchVisibleAreas:
+        return self._visible_areas
+
+    def get_visible_area_pos(self) -> int:
+        return self._visible_area_pos
 
-    def get_paint_data(self) -> pd.Series:
+    def set_visible_areas(self, visible_area: MdlRaggedFrame, frames_join: MdlFramesJoin):
         """
-        :return: pd.Series of VmdPitchPlayersData objects
+        Calculates polygons of visible area of all frames at once and passes them to the view.
+
+        :param visible_area: Visible area's corners of all frames (see MdlFramesData).
+        :param frames_join: Details of all frames' events (see MdlFramesJoin).
         """
-        return self._last_data
+        self._visible_areas = self.calculate_visible_areas(visible_area, frames_join)
+        self._visible_area_pos = -1
+        self.visible_areas_changed.emit(self._visible_areas)
 
-    def get_data(self, frames_frame: pd.DataFrame, events_frame: pd.DataFrame, lineups_frame: pd.DataFrame):
-        fdf, edf, ldf = frames_frame, events_frame, lineups_frame
-        
-        if fdf.empty or edf.empty or ldf.empty:
-            self._last_data = pd.Series()
-            self.player_pitch_data_changed.emit(self._last_data)
+    def set_visible_area_frame(self, frame_no: int):
+        pos = frame_no - 1
+        pos = pos if 0 <= pos < self._visible_areas.get_frames_no() and self._visible_areas.shown[pos] else -1
+        if pos != self._visible_area_pos:
+            self._visible_area_pos = pos
+            self.visible_area_frame_changed.emit(pos)
+
+    def calculate_visible_areas(self, visible_area: MdlRaggedFrame, frames_join: MdlFramesJoin) -> VmdPitchVisibleAreas:
+        """
+        Mirrors corners of visible areas of all frames the same way as players of those frames are mirrored.
+        Areas of frames which players are not displayed (e.g. without event details) are not displayed either.
+        """
+        frames_no = visible_area.get_groups_no()
+        if frames_no == 0 or frames_join.get_frames_no() != frames_no:
+            return VmdPitchVisibleAreas.empty()
+
+        coords = visible_area.get_column(VISIBLE_AREA_COORDS_COL)
+        corners_frame_pos = np.repeat(np.arange(frames_no), visible_area.get_lengths())
+
+        event_team_idx = frames_join.get_column(FramesJoinColNames.EVENT_TEAM_IDX)
+        mirrored = self.get_x_mirror_mask(
+              frames_join.get_column(FramesJoinColNames.FIRST_TEAM_EVENT)
+            , frames_join.get_column(FramesJoinColNames.PERIOD))[corners_frame_pos]
+
+        x_coords = np.where(mirrored, MAX_PLAYER_X_COORD - coords[:, 0], coords[:, 0]).astype(np.float32)
+        y_coords = (MAX_PLAYER_Y_COORD - coords[:, 1]).astype(np.float32)
+        return VmdPitchVisibleAreas(visible_area.get_offsets(), x_coords, y_coords, event_team_idx >= 0)
+
+    def set_paint_data(self, paint_data: VmdPitchPaintBuffer, animate: bool = False):
+        """
+        Passes data of a frame to the view.
+
+        :param paint_data: Paint buffer of the frame.
+        :param animate: If True and tweening is enabled, players move from the positions shown at the moment
+            to the positions of the frame smoothly, instead of jumping.
+        """
+        if self._frame_clock.isValid():
+            duration = self._frame_clock.restart()
+        else:
+            duration = 0
+            self._frame_clock.start()
+        if self._tween_timer.isActive():
+            self._tween_timer.stop()
+
+        duration = min(duration, TWEEN_MAX_DURATION_MS)
+        if not (animate and self._tweening) or duration < 2 * TWEEN_INTERVAL_MS or not len(self._last_data):
+            self._tween_dst = paint_data
+            self._emit_paint_data(paint_data)
+            return
+
+        self._tween_src      = self._last_data
+        self._tween_dst      = paint_data
+        self._tween_src_idxs = match_players(self._tween_src, self._tween_dst)
+        self._tween_duration = duration
+        self._tween_clock.start()
+        self._tween_timer.start()
+        self._tween_step()
+
+    def _tween_step(self):
+        progress = self._tween_clock.elapsed() / self._tween_duration
+        if progress >= 1:
+            self._tween_timer.stop()
+            self._emit_paint_data(self._tween_dst)
             return
 
-        # get IDs of the first and the second team (first is a team in 0 row of lineups details data frame)
-        f_team_id = int(ldf.loc[1][self.LFCN.TEAM_ID.value])
-        s_team_id = int(ldf.loc[2][self.LFCN.TEAM_ID.value])
+        self._emit_paint_data(interpolate_players(self._tween_src, self._tween_dst, self._tween_src_idxs, progress))
+
+    def _emit_paint_data(self, paint_data: VmdPitchPaintBuffer):
+        self._last_data = paint_data
+        self.player_pitch_data_changed.emit(self._last_data)
+
+    def get_data(self, frames_frame: pd.DataFrame, join_row: MdlFramesJoinRow):
+        """
+        Calculates data needed to paint players of a single frame and passes it to the view.
+
+        :param frames_frame: Players' data of the frame.
+        :param join_row: Details of the frame's event (see MdlFramesJoin) - None if not available.
+        """
+        self.set_paint_data(self.calculate_paint_data(frames_frame, join_row))
+
+    def calculate_paint_data(self, frames_frame: pd.DataFrame, join_row: MdlFramesJoinRow) -> VmdPitchPaintBuffer:
+        """
+        Calculates data needed to paint players of a single frame. Does not change state of the view model, 
+        so it can be called from any thread (e.g. to prepare data of frames before they are shown).
+
+        :param frames_frame: Players' data of the frame.
+        :param join_row: Details of the frame's event (see MdlFramesJoin) - None if not available.
+        :return: Paint buffer of the frame.
+        """
+        fdf = frames_frame
+        
+        if fdf.empty or join_row is None or join_row.event_team_idx < 0:
+            return VmdPitchPaintBuffer.empty(self._palette)
 
-        # get:
-        # - ID of team that is related to current event
-        # - the number of period of game
-        e_team_id = int(list(edf[self.EFCN.EVENT_TEAM_ID.value])[0])
-        period_no = int(list(edf[self.EFCN.PERIOD.value])[0])
         # below variable indicates, which (first or second) team is the team related to the current event
-        first_team_event = True if f_team_id == e_team_id else False
-        event_team_idx    = 0 if first_team_event else 1
-
-        ppd = fdf.apply(  axis=1
-                        , func=lambda x: VmdPitchPlayersData(
-                              x_coord=self._conditional_x_mirror(x[self.FPCN.LOC_X.value], first_team_event, period_no)
-                            , y_coord=self._conditional_y_mirror(x[self.FPCN.LOC_Y.value])
-                            , color  =self._return_icon_color(event_team_idx, x[self.FPCN.TEAMMATE.value], x[self.FPCN.KEEPER.value])
-                        ))
+        # (first is a team in 0 row of lineups details data frame)
+        first_team_event = join_row.first_team_event
+        event_team_idx   = join_row.event_team_idx
+        period_no        = join_row.period
+
+        x_coords = self._conditional_x_mirror(fdf[self.FPCN.LOC_X.value].to_numpy(), first_team_event, period_no)
+        y_coords = self._conditional_y_mirror(fdf[self.FPCN.LOC_Y.value].to_numpy())
+        color_idxs = self._return_icon_color_idxs(
+              event_team_idx
+            , fdf[self.FPCN.TEAMMATE.value].to_numpy(dtype=bool)
+            , fdf[self.FPCN.KEEPER.value].to_numpy(dtype=bool))
         
-        self._last_data = ppd
-        self.player_pitch_data_changed.emit(self._last_data)
+        return VmdPitchPaintBuffer(x_coords, y_coords, color_idxs, self._palette)
         
-    def _conditional_x_mirror(self, org_x: float, first_team_event: bool, period_no = int) -> int:
+    def _conditional_x_mirror(self, org_x: np.ndarray, first_team_event: bool, period_no = int) -> np.ndarray:
         # if first team (with index 0) is related to event and period of game is odd, then coordinates stays the same.
         # otherwise, they need to be reversed to display the players properly
         if (first_team_event and period_no % 2 == 0) or (not first_team_event and period_no % 2 == 1):
             # mirror the coordinate
             org_x = MAX_PLAYER_X_COORD - org_x
-        return int(org_x)
+        return org_x.astype(np.int32)
     
-    def _conditional_y_mirror(self, org_y: float) -> int:
+    def get_x_mirror_mask(self, first_team_event: np.ndarray, period_no: np.ndarray) -> np.ndarray:
+        """
+        Returns True for frames which X coordinates are mirrored - condition of _conditional_x_mirror for many frames.
+        """
+        odd_period = period_no % 2 == 1
+        return (first_team_event & ~odd_period) | (~first_team_event & odd_period)
+
+    def _conditional_y_mirror(self, org_y: np.ndarray) -> np.ndarray:
         # mirror the coordinate - pitch on GUI has reversed direction of the Y-axis
-        return int(MAX_PLAYER_Y_COORD - org_y)
+        return (MAX_PLAYER_Y_COORD - org_y).astype(np.int32)
     
-    def _return_icon_color(self, event_team_idx: int, is_teammate: bool, is_keeper: bool) -> QColor:
+    def _return_icon_color_idxs(self, event_team_idx: int, is_teammate: np.ndarray, is_keeper: np.ndarray) -> np.ndarray:
         """
-        Returns QColor object to draw specific player icon on pitch based on the data provided.
+        Returns indexes of colors (in the palette of paint buffer) to draw players' icons on pitch.
 
         :param event_team_idx: Int identifier of the team that is related to the current event.
-        :param is_teammate: True if current player is a teammate of the team described by 'event_team_idx' param.
-        :param is_keeper: True if current player is a keeper.
+        :param is_teammate: True for players who are teammates of the team described by 'event_team_idx' param.
+        :param is_keeper: True for players who are keepers.
 
-        :return: qtg.QColor object.
+        :return: Array of palette indexes.
         """
-        player_team_idx = event_team_idx if is_teammate else int(bool(event_team_idx - 1))
-        player_type = KEEPER_ACTOR_NAME if is_keeper else PLAYER_ACTOR_NAME
-
-        return self.IC[player_team_idx][player_type]
\ No newline at end of file
+        player_team_idx = np.where(is_teammate, event_team_idx, 1 - event_team_idx)
+        return (player_team_idx * PALETTE_TEAM_COLORS_NO + is_keeper).astype(np.uint8)
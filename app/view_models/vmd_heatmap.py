@@ -0,0 +1,183 @@
+from collections  import OrderedDict
+import numpy  as np
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from app.models import MdlFramesJoin, FramesJoinColNames, FramesPlayersColNames, FramesPlayersFlags
+from app.models import MAX_PLAYER_X_COORD, MAX_PLAYER_Y_COORD, PLAYERS_FLAGS_COL
+from app.models.components.mdl_ragged_frame import MdlRaggedFrame
+from app.view_models.vmd_dataset_list_item  import VmdDatasetListItem
+from app.view_models.vmd_current_dataset    import VmdCurrentDataset
+from app.view_models.vmd_football_pitch     import VmdFootballPitch
+
+
+# size of heatmap's bins - 2 x 2 units of the pitch (120 x 80)
+HEATMAP_BINS_X = 60
+HEATMAP_BINS_Y = 40
+TEAMS_NO = 2
+# number of datasets which heatmaps are kept after switching to another dataset
+HEATMAP_CACHE_SIZE = 4
+
+
+class VmdPitchHeatmaps:
+    """
+    Numbers of players' occurrences in every bin of the pitch - for each team and period of the match.
+    Bins are indexed as counts[team index, period position, row, column], where rows go from the top
+    of the displayed pitch (coordinates are mirrored the same way as players on the pitch).
+    """
+
+    def __init__(self, counts: np.ndarray, periods: np.ndarray):
+        self.counts  = counts
+        self.periods = periods
+
+    @classmethod
+    def empty(cls) -> 'VmdPitchHeatmaps':
+        return cls(np.zeros((TEAMS_NO, 0, HEATMAP_BINS_Y, HEATMAP_BINS_X), dtype=np.int32), np.empty(0, dtype=np.int8))
+
+    def get_grid(self, team_idx: int = None, period: int = None) -> np.ndarray:
+        """
+        Returns counts of given team (both teams if None) in given period (whole match if None) - array of shape
+        (HEATMAP_BINS_Y, HEATMAP_BINS_X).
+        """
+        counts = self.counts if team_idx is None else self.counts[team_idx:team_idx + 1]
+        if period is not None:
+            pos = np.flatnonzero(self.periods == period)
+            counts = counts[:, pos]
+        return counts.sum(axis=(0, 1))
+
+
+class VmdHeatmap(QObject):
+    """
+    Heatmap of players' positions over all frames of the current dataset. Heatmaps of all teams and periods are
+    calculated at once (on the first use for the dataset's data) and cached, so switching between them only sums
+    a few bins arrays.
+    """
+
+    PCN = FramesPlayersColNames
+    PFL = FramesPlayersFlags
+    JCN = FramesJoinColNames
+
+    # normalized (0 - 1) grid of the selected heatmap or None if heatmap is hidden
+    heatmap_changed = pyqtSignal(object)
+    periods_changed = pyqtSignal(list)
+
+    def __init__(self, current_dataset_vmodel: VmdCurrentDataset, football_pitch_vmodel: VmdFootballPitch):
+        super(VmdHeatmap, self).__init__()
+        self._cd_vm = current_dataset_vmodel
+        self._fp_vm = football_pitch_vmodel
+
+        self._shown    = False
+        self._team_idx: int = None
+        self._period: int   = None
+
+        self._cache: OrderedDict[tuple[int, int], VmdPitchHeatmaps] = OrderedDict()
+        self._heatmaps = VmdPitchHeatmaps.empty()
+        self._heatmaps_key: tuple[int, int] = None
+
+        self._cd_vm.selection_changed.connect(self._dataset_changed)
+        self._cd_vm.dataset_edited.connect(self._dataset_changed)
+
+    def is_shown(self) -> bool:
+        return self._shown
+
+    def get_team_idx(self) -> int | None:
+        return self._team_idx
+
+    def get_period(self) -> int | None:
+        return self._period
+
+    def get_periods(self) -> list[int]:
+        return self._heatmaps.periods.tolist()
+
+    def set_shown(self, shown: bool):
+        self._shown = bool(shown)
+        self._update()
+
+    def set_team_idx(self, team_idx: int | None):
+        self._team_idx = team_idx
+        self._update()
+
+    def set_period(self, period: int | None):
+        self._period = period
+        self._update()
+
+    def get_heatmap(self) -> np.ndarray | None:
+        """
+        Returns normalized grid of the selected team and period - values from 0 to 1, or None if heatmap is hidden.
+        """
+        if not self._shown:
+            return None
+
+        grid = self._heatmaps.get_grid(self._team_idx, self._period).astype(np.float32)
+        max_count = grid.max(initial=0)
+        return grid / max_count if max_count > 0 else grid
+
+    def _dataset_changed(self, *args):
+        if self._cd_vm.get_current_data_key() != self._heatmaps_key and self._shown:
+            self._update()
+
+    def _update(self):
+        item = self._cd_vm.get_current_item()
+        key  = self._cd_vm.get_current_data_key()
+
+        if self._shown and key != self._heatmaps_key:
+            self._heatmaps = self._get_heatmaps(item, key) if item else VmdPitchHeatmaps.empty()
+            self._heatmaps_key = key
+            self.periods_changed.emit(self.get_periods())
+
+        self.heatmap_changed.emit(self.get_heatmap())
+
+    def _get_heatmaps(self, item: VmdDatasetListItem, key: tuple[int, int]) -> VmdPitchHeatmaps:
+        heatmaps = self._cache.get(key)
+        if heatmaps is None:
+            heatmaps = self.calculate_heatmaps(*item.get_players_data())
+            self._cache[key] = heatmaps
+            while len(self._cache) > HEATMAP_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        self._cache.move_to_end(key)
+        return heatmaps
+
+    def calculate_heatmaps(self, players: MdlRaggedFrame, frames_join: MdlFramesJoin) -> VmdPitchHeatmaps:
+        """
+        Bins positions of all players of all frames in a single pass. Players of frames without event's details
+        are skipped - the same as on the pitch.
+
+        :param players: Players of all frames (see MdlFramesData).
+        :param frames_join: Details of all frames' events (see MdlFramesJoin).
+        :return: Heatmaps of all teams and periods.
+        """
+        frames_no = players.get_groups_no()
+        if frames_no == 0 or frames_join.get_frames_no() != frames_no:
+            return VmdPitchHeatmaps.empty()
+
+        event_team_idx = frames_join.get_column(self.JCN.EVENT_TEAM_IDX).astype(np.int64)
+        period         = frames_join.get_column(self.JCN.PERIOD)
+        x_mirrored     = self._fp_vm.get_x_mirror_mask(frames_join.get_column(self.JCN.FIRST_TEAM_EVENT), period)
+
+        loc_x = players.get_column(self.PCN.LOC_X.value)
+        loc_y = players.get_column(self.PCN.LOC_Y.value)
+        rows_frame_pos = np.repeat(np.arange(frames_no), players.get_lengths())
+        rows_shown     = (event_team_idx[rows_frame_pos] >= 0) & np.isfinite(loc_x) & np.isfinite(loc_y)
+
+        rows_frame_pos = rows_frame_pos[rows_shown]
+        loc_x    = loc_x[rows_shown]
+        loc_y    = loc_y[rows_shown]
+        teammate = (players.get_column(PLAYERS_FLAGS_COL)[rows_shown] & self.PFL.TEAMMATE) != 0
+
+        # the same mirroring as of players drawn on the pitch
+        x_coords = np.where(x_mirrored[rows_frame_pos], MAX_PLAYER_X_COORD - loc_x, loc_x)
+        y_coords = MAX_PLAYER_Y_COORD - loc_y
+
+        frames_team_idx = event_team_idx[rows_frame_pos]
+        team_idx = np.where(teammate, frames_team_idx, 1 - frames_team_idx)
+
+        periods    = np.unique(period[event_team_idx >= 0])
+        period_pos = np.searchsorted(periods, period[rows_frame_pos])
+
+        col = np.clip((x_coords * (HEATMAP_BINS_X / MAX_PLAYER_X_COORD)).astype(np.int64), 0, HEATMAP_BINS_X - 1)
+        row = np.clip((y_coords * (HEATMAP_BINS_Y / MAX_PLAYER_Y_COORD)).astype(np.int64), 0, HEATMAP_BINS_Y - 1)
+
+        shape = (TEAMS_NO, len(periods), HEATMAP_BINS_Y, HEATMAP_BINS_X)
+        bins  = np.ravel_multi_index((team_idx, period_pos, row, col), shape)
+        counts = np.bincount(bins, minlength=int(np.prod(shape))).astype(np.int32).reshape(shape)
+
+        return VmdPitchHeatmaps(counts, periods)
@@ -0,0 +1,180 @@
+from PyQt5.QtCore import QObject, QTimer, QElapsedTimer, Qt, pyqtSignal
+
+from app.view_models.vmd_current_dataset import VmdCurrentDataset, VmdSelectionChangedData
+
+
+# number of frames played per second at normal (1x) speed
+BASE_FRAMES_PER_SECOND = 4
+PLAYBACK_SPEEDS        = [0.5, 1.0, 2.0, 4.0, 8.0]
+DEFAULT_SPEED          = 1.0
+# maximal number of repaints per second - playback position moves faster at higher speeds, so frames between
+# consecutive repaints are skipped
+DEFAULT_TARGET_FPS     = 25
+# how often playback statistics are recalculated
+STATS_INTERVAL_MS      = 1000
+
+
+class VmdPlaybackStats:
+
+    def __init__(self, achieved_fps: float = 0.0, shown_frames: int = 0, dropped_frames: int = 0
+                 , skipped_frames: int = 0):
+        # number of frames shown per second during the last statistics interval
+        self.achieved_fps   = achieved_fps
+        # frames shown since the playback started
+        self.shown_frames   = shown_frames
+        # frames not shown because repaints were late (rendering did not keep up with the target fps)
+        self.dropped_frames = dropped_frames
+        # frames not shown because the speed needs more frames per second than the target fps
+        self.skipped_frames = skipped_frames
+
+
+class VmdPlayback(QObject):
+    """
+    Plays frames of the current dataset. Position of the playback is derived from the time elapsed since it was
+    started (and its speed), not from the number of timer ticks - if showing a frame takes longer than the interval
+    between ticks, playback jumps straight to the frame due at the moment instead of queueing frames. Frames passed
+    over are counted as dropped if their repaints were missed (ticks came late), otherwise as skipped (the speed
+    needs more frames per second than the target fps allows).
+    """
+
+    playing_changed = pyqtSignal(bool)
+    speed_changed   = pyqtSignal(float)
+    stats_changed   = pyqtSignal(VmdPlaybackStats)
+
+    def __init__(self, current_dataset_vmodel: VmdCurrentDataset, target_fps: int = DEFAULT_TARGET_FPS):
+        super(VmdPlayback, self).__init__()
+        self._cd_vm = current_dataset_vmodel
+
+        self._speed      = DEFAULT_SPEED
+        self._target_fps = target_fps
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+
+        self._clock = QElapsedTimer()
+        # frame shown when the playback (or its current speed) started and number of repaints (tick intervals)
+        # since then, which are already accounted for - frame shown or dropped
+        self._start_frame    = 0
+        self._repaints_count = 0
+
+        self._stats = VmdPlaybackStats()
+        self._stats_clock  = QElapsedTimer()
+        self._stats_frames = 0
+
+        self._cd_vm.selection_changed.connect(self._selection_changed)
+
+    def is_playing(self) -> bool:
+        return self._timer.isActive()
+
+    def get_speed(self) -> float:
+        return self._speed
+
+    def get_speeds(self) -> list[float]:
+        return list(PLAYBACK_SPEEDS)
+
+    def get_target_fps(self) -> int:
+        return self._target_fps
+
+    def get_stats(self) -> VmdPlaybackStats:
+        return self._stats
+
+    def set_speed(self, speed: float | str):
+        speed = float(speed)
+        if speed <= 0 or speed == self._speed:
+            return
+
+        self._speed = speed
+        if self.is_playing():
+            self._restart_clock()
+        self.speed_changed.emit(self._speed)
+
+    def set_target_fps(self, target_fps: int):
+        self._target_fps = max(1, int(target_fps))
+        if self.is_playing():
+            self._timer.start(self._get_interval_ms())
+
+    def _get_interval_ms(self) -> int:
+        # timer does not need to tick more often than frames change
+        frames_per_second = min(self._target_fps, BASE_FRAMES_PER_SECOND * self._speed)
+        return max(1, int(1000 / frames_per_second))
+
+    def _restart_clock(self):
+        item = self._cd_vm.get_current_item()
+        self._start_frame = item.get_curr_frame() if item else 0
+        self._repaints_count = 0
+        self._clock.start()
+
+    def play(self):
+        item = self._cd_vm.get_current_item()
+        if self.is_playing() or not item or item.get_frames_no() < 1:
+            return
+
+        # playback of a finished match starts from the beginning
+        if item.get_curr_frame() >= item.get_frames_no():
+            self._cd_vm.set_current_frame(1)
+
+        self._stats = VmdPlaybackStats()
+        self._stats_frames = 0
+        self._stats_clock.start()
+
+        self._restart_clock()
+        self._timer.start(self._get_interval_ms())
+        self.playing_changed.emit(True)
+
+    def pause(self):
+        if not self.is_playing():
+            return
+
+        self._timer.stop()
+        self.playing_changed.emit(False)
+
+    def toggle(self):
+        if self.is_playing():
+            self.pause()
+        else:
+            self.play()
+
+    def _tick(self):
+        item = self._cd_vm.get_current_item()
+        if not item:
+            self.pause()
+            return
+
+        frames_no  = item.get_frames_no()
+        curr_frame = item.get_curr_frame()
+        elapsed_ms = self._clock.elapsed()
+        due_frame  = self._start_frame + int(elapsed_ms / 1000 * BASE_FRAMES_PER_SECOND * self._speed)
+        due_frame  = min(due_frame, frames_no)
+
+        if due_frame > curr_frame:
+            # every tick interval is a repaint - those passed since the last accounted one, but the current one,
+            # were missed; other frames passed over are skipped at the target fps anyway
+            passed_frames   = due_frame - curr_frame - 1
+            missed_repaints = max(0, int(elapsed_ms / self._get_interval_ms()) - self._repaints_count - 1)
+            dropped_frames  = min(passed_frames, missed_repaints)
+            self._repaints_count += 1 + missed_repaints
+
+            self._stats.dropped_frames += dropped_frames
+            self._stats.skipped_frames += passed_frames - dropped_frames
+            self._stats.shown_frames   += 1
+            self._stats_frames         += 1
+            self._cd_vm.set_current_frame(due_frame)
+
+        self._update_stats()
+
+        if due_frame >= frames_no:
+            self.pause()
+
+    def _update_stats(self):
+        elapsed = self._stats_clock.elapsed()
+        if elapsed < STATS_INTERVAL_MS:
+            return
+
+        self._stats.achieved_fps = self._stats_frames * 1000 / elapsed
+        self._stats_frames = 0
+        self._stats_clock.restart()
+        self.stats_changed.emit(self._stats)
+
+    def _selection_changed(self, info: VmdSelectionChangedData):
+        self.pause()
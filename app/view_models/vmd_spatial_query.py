@@ -0,0 +1,72 @@
+import numpy  as np
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from app.models import MdlSpatialPredicate, MdlRegionCountPredicate, MdlNearestDistancePredicate, SpatialPlayersGroup
+from app.models import PENALTY_AREA, OWN_PENALTY_AREA, PITCH_UNITS_PER_METER
+from app.view_models.vmd_current_dataset import VmdCurrentDataset
+
+
+SPG = SpatialPlayersGroup
+
+# predefined queries - name -> predicates which all must be fulfilled by the selected frames
+SPATIAL_QUERIES: dict[str, list[MdlSpatialPredicate]] = {
+      '4+ opponents in the penalty area'    : [ MdlRegionCountPredicate(PENALTY_AREA, SPG.OPPONENTS, min_count=4) ]
+    , '3+ teammates in the penalty area'    : [ MdlRegionCountPredicate(PENALTY_AREA, SPG.TEAMMATES, min_count=3) ]
+    , 'Opponents in own penalty area'       : [ MdlRegionCountPredicate(OWN_PENALTY_AREA, SPG.OPPONENTS) ]
+    , 'Actor free (no opponent within 5 m)' : [ MdlNearestDistancePredicate(SPG.ACTOR, SPG.OPPONENTS, min_distance=5 * PITCH_UNITS_PER_METER) ]
+    , 'Actor pressed (opponent within 2 m)' : [ MdlNearestDistancePredicate(SPG.ACTOR, SPG.OPPONENTS, max_distance=2 * PITCH_UNITS_PER_METER) ]
+}
+# name of the frames' selection source in the current dataset's view model
+SPATIAL_QUERY_SELECTION = 'spatial_query'
+
+
+class VmdSpatialQuery(QObject):
+    """
+    Selects frames of the current dataset matching one of SPATIAL_QUERIES - the pitch controls jump through them.
+    Query is evaluated for all frames at once, again only when the dataset's data changes.
+    """
+
+    # name of the selected query or None
+    query_changed = pyqtSignal(object)
+
+    def __init__(self, current_dataset_vmodel: VmdCurrentDataset):
+        super(VmdSpatialQuery, self).__init__()
+        self._cd_vm = current_dataset_vmodel
+
+        self._query: str = None
+        # data key of the dataset the query was evaluated for
+        self._selection_key: tuple[int, int] = None
+
+        self._cd_vm.selection_changed.connect(self._dataset_changed)
+        self._cd_vm.dataset_edited.connect(self._dataset_changed)
+
+    def get_queries(self) -> list[str]:
+        return list(SPATIAL_QUERIES)
+
+    def get_query(self) -> str | None:
+        return self._query
+
+    def set_query(self, query: str | None):
+        if query is not None and query not in SPATIAL_QUERIES:
+            raise ValueError(f'{self.__class__.__name__}: unknown query "{query}"')
+
+        self._query = query
+        self._selection_key = None
+        self._update()
+        self.query_changed.emit(self._query)
+
+    def _dataset_changed(self, *args):
+        if self._query is not None and self._cd_vm.get_current_data_key() != self._selection_key:
+            self._update()
+
+    def _update(self):
+        item = self._cd_vm.get_current_item()
+        self._selection_key = self._cd_vm.get_current_data_key()
+
+        if self._query is None:
+            frame_nos = None
+        elif item is None:
+            frame_nos = np.empty(0, dtype=np.int64)
+        else:
+            frame_nos = item.select_frames(SPATIAL_QUERIES[self._query])
+        self._cd_vm.set_frames_selection(SPATIAL_QUERY_SELECTION, frame_nos)
@@ -0,0 +1,85 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from app.view_models.vmd_current_dataset import VmdCurrentDataset
+
+
+# while the timeline is scrubbed, frames are changed at most once per that many milliseconds
+SEEK_THROTTLE_MS = 40
+
+
+class VmdTimeline(QObject):
+    """
+    Position of the current frame on the timeline of time elapsed since the start of the match. Seeking is a binary
+    search over frames sorted by time. Seeks are throttled - the first one is executed at once, the following ones
+    requested within SEEK_THROTTLE_MS are collapsed into the last of them, so scrubbing does not repaint the pitch
+    more often than needed.
+    """
+
+    # length of the timeline and elapsed time of the current frame - in milliseconds (-1 if unknown)
+    length_changed   = pyqtSignal(int)
+    position_changed = pyqtSignal(int)
+
+    def __init__(self, current_dataset_vmodel: VmdCurrentDataset):
+        super(VmdTimeline, self).__init__()
+        self._cd_vm = current_dataset_vmodel
+
+        self._length_ms   = 0
+        self._position_ms = -1
+        self._pending_seek_ms: int = None
+
+        self._throttle_timer = QTimer(self)
+        self._throttle_timer.setSingleShot(True)
+        self._throttle_timer.setInterval(SEEK_THROTTLE_MS)
+        self._throttle_timer.timeout.connect(self._throttle_timeout)
+
+        self._cd_vm.selection_changed.connect(self._dataset_changed)
+        self._cd_vm.dataset_edited.connect(self._dataset_changed)
+        self._dataset_changed()
+
+    def get_length_ms(self) -> int:
+        return self._length_ms
+
+    def get_position_ms(self) -> int:
+        return self._position_ms
+
+    def seek(self, elapsed_ms: int):
+        """
+        Requests move to the frame closest to given elapsed time - throttled.
+        """
+        self._pending_seek_ms = int(elapsed_ms)
+        if not self._throttle_timer.isActive():
+            self._flush_seek()
+            self._throttle_timer.start()
+
+    def seek_match_time(self, match_time: str) -> bool:
+        """
+        Moves at once to the frame closest to given time of the match clock, e.g. "67:30".
+
+        :return: False if the time cannot be parsed or there is no timeline.
+        """
+        item = self._cd_vm.get_current_item()
+        return item.seek_match_time(match_time) if item else False
+
+    def _flush_seek(self):
+        item = self._cd_vm.get_current_item()
+        if item is not None and self._pending_seek_ms is not None:
+            item.seek_elapsed(self._pending_seek_ms)
+        self._pending_seek_ms = None
+
+    def _throttle_timeout(self):
+        # the last seek requested meanwhile is executed, then the next ones are throttled again
+        if self._pending_seek_ms is not None:
+            self._flush_seek()
+            self._throttle_timer.start()
+
+    def _dataset_changed(self, *args):
+        item = self._cd_vm.get_current_item()
+        length_ms   = item.get_timeline_ms() if item else 0
+        position_ms = item.get_curr_elapsed_ms() if item else -1
+
+        if length_ms != self._length_ms:
+            self._length_ms = length_ms
+            self.length_changed.emit(length_ms)
+        if position_ms != self._position_ms:
+            self._position_ms = position_ms
+            self.position_changed.emit(position_ms)
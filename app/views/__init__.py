@@ -2,6 +2,7 @@ from .vw_dataset_list_item  import VwDatasetListItem
 from .vw_dataset_list       import VwDatasetList
 from .vw_dataset_details    import VwDatasetDetails
 from .vw_football_pitch     import VwFootballPitch
+from .vw_frames_exporter    import VwFramesExporter, VwExportStats
 from .vw_main_data_toolbar  import VwMainDataToolbar
 from .vw_pitch_controls     import VwPitchControls
 from .vw_main_view          import VwMainView
@@ -1,3 +1,4 @@
 from .vw_base_view   import VWBaseView
 from .vw_list_widget import VwListWidget
+from .vw_pitch_painter import VwPitchPainter
 from .vw_loading     import VwLoading
\ No newline at end of file
@@ -0,0 +1,255 @@
+"""Contains drawing of the football pitch's elements, shared by the pitch widget and the headless frames' export."""
+
+import os
+import numpy  as np
+import PyQt5.QtGui      as qtg
+import PyQt5.QtCore     as qtc
+
+from app.models      import MAX_PLAYER_X_COORD, MIN_PLAYER_X_COORD, MAX_PLAYER_Y_COORD, MIN_PLAYER_Y_COORD
+from app.view_models import VmdPitchPaintBuffer, VmdPitchVisibleAreas
+
+
+FOOTBALL_PITCH_PIXMAP_PATH = 'resources/img/test_football_field.png'
+# spellings of the pitch image's path tried by find_background - the resources' directory is capitalized in the
+# repository, which matters on case-sensitive file systems
+FOOTBALL_PITCH_PIXMAP_PATHS = [FOOTBALL_PITCH_PIXMAP_PATH, 'Resources/img/test_football_field.png']
+# In analyzed datasets the size of pitch is normalized to width: 120 and height: 80, so the ratio between
+# width and height (which is 1.5) should remain.
+# Following variables are the size of whole pitch image (with borders).
+FOOTBALL_PITCH_HEIGHT = 446
+FOOTBALL_PITCH_WIDTH = 670
+# Following variables are the size of borders - distance from the start of image to the borderlines of the pitch.
+PITCH_BORDER_X = 22
+PITCH_BORDER_Y = 6
+PITCH_BORDER_SIZE = np.array([PITCH_BORDER_X, PITCH_BORDER_Y])
+# Ranges (in pixels) of exact pitch rectangle (excluding borders on the pitch image).
+PITCH_X_RANGE = (float(PITCH_BORDER_X), float(FOOTBALL_PITCH_WIDTH  - PITCH_BORDER_X))
+PITCH_Y_RANGE = (float(PITCH_BORDER_Y), float(FOOTBALL_PITCH_HEIGHT - PITCH_BORDER_Y))
+# Color of the pitch drawn when the pitch image is not available.
+PITCH_FALLBACK_COLOR = qtg.QColor(0, 204, 0)
+
+# Diameters of ellipse representing player on pitch.
+PLAYER_SIZE = np.array([22, 22])
+# Margin (in pixels) around the player's rectangle covered by the outline of ellipse.
+PLAYER_OUTLINE_MARGIN = 1
+# Size of the player's icon sprite (ellipse with its outline).
+PLAYER_SPRITE_SIZE = PLAYER_SIZE + 2 * PLAYER_OUTLINE_MARGIN
+
+# Colors of the heatmap overlay - from the least to the most occupied bins, empty bins are transparent.
+HEATMAP_COLOR_STOPS = [
+      (0.00, (  0,   0, 255))
+    , (0.25, (  0, 255, 255))
+    , (0.50, (  0, 255,   0))
+    , (0.75, (255, 255,   0))
+    , (1.00, (255,   0,   0))
+]
+HEATMAP_MIN_ALPHA = 40
+HEATMAP_MAX_ALPHA = 190
+
+# Translucent colors of the camera's visible area overlay.
+VISIBLE_AREA_FILL_COLOR    = qtg.QColor(255, 255, 255, 56)
+VISIBLE_AREA_OUTLINE_COLOR = qtg.QColor(255, 255, 255, 140)
+
+
+class VwPitchPainter:
+    """
+    Draws players and visible area of a frame with any QPainter - on layers of the pitch widget or on QImage
+    (also outside of the GUI thread). All positions are in coordinates of the pitch image
+    (FOOTBALL_PITCH_WIDTH x FOOTBALL_PITCH_HEIGHT) - painter should be scaled to draw on a device of different size.
+    """
+
+    def __init__(self):
+        # image with icons of players in all colors of the palette (placed side by side) - by palette colors
+        self._players_atlas: tuple[tuple[int], qtg.QImage] = ((), None)
+
+    @staticmethod
+    def find_background(base_dir: str = None) -> str:
+        """
+        Returns path of the pitch image - the first of FOOTBALL_PITCH_PIXMAP_PATHS existing in given directory
+        (the working directory by default) or FOOTBALL_PITCH_PIXMAP_PATH if none exists.
+        """
+        paths = [os.path.join(base_dir or '', path) for path in FOOTBALL_PITCH_PIXMAP_PATHS]
+        return next((path for path in paths if os.path.isfile(path)), paths[0])
+
+    @staticmethod
+    def load_background(png_file_path: str, width: int, height: int) -> qtg.QImage:
+        """
+        Returns pitch image scaled to given size (the same way as the pitch widget scales it) or an image filled
+        with PITCH_FALLBACK_COLOR, if it cannot be loaded.
+        """
+        image = qtg.QImage(png_file_path)
+        if image.isNull():
+            image = qtg.QImage(width, height, qtg.QImage.Format_ARGB32_Premultiplied)
+            image.fill(PITCH_FALLBACK_COLOR)
+            return image
+
+        image = image.convertToFormat(qtg.QImage.Format_ARGB32_Premultiplied)
+        return image.scaled(width, height, qtc.Qt.IgnoreAspectRatio)
+
+    def get_players_atlas(self, palette: list[qtg.QColor]) -> qtg.QImage:
+        """
+        Returns image with player's icon drawn in every color of the palette - icon of color with index i is placed
+        at x = i * PLAYER_SPRITE_SIZE[0]. Image is drawn once per palette.
+        """
+        palette_key = tuple(color.rgba() for color in palette)
+        if self._players_atlas[0] != palette_key:
+            sprite_w, sprite_h = int(PLAYER_SPRITE_SIZE[0]), int(PLAYER_SPRITE_SIZE[1])
+            atlas = qtg.QImage(sprite_w * max(1, len(palette)), sprite_h, qtg.QImage.Format_ARGB32_Premultiplied)
+            atlas.fill(qtc.Qt.transparent)
+
+            atlas_painter = qtg.QPainter(atlas)
+            for color_idx, color in enumerate(palette):
+                atlas_painter.setBrush(qtg.QBrush(color))
+                atlas_painter.drawEllipse(qtc.QRect(
+                      color_idx * sprite_w + PLAYER_OUTLINE_MARGIN, PLAYER_OUTLINE_MARGIN
+                    , int(PLAYER_SIZE[0]), int(PLAYER_SIZE[1])))
+            atlas_painter.end()
+
+            self._players_atlas = (palette_key, atlas)
+        return self._players_atlas[1]
+
+    def draw_players(self, painter: qtg.QPainter, data: VmdPitchPaintBuffer
+                     , atlas: qtg.QPixmap | qtg.QImage = None) -> list[qtc.QRect]:
+        """
+        Draws players of the paint data. Positions of all players are calculated at once and their icons are copied
+        from the atlas - with a single call, if the atlas is a pixmap.
+
+        :param painter: Active painter.
+        :param data: Paint buffer of the frame.
+        :param atlas: Atlas of players' icons (see get_players_atlas) - possibly converted to pixmap.
+        :return: Rectangles covered by players.
+        """
+        atlas = atlas if atlas is not None else self.get_players_atlas(data.palette)
+        left, top = self.get_pixmap_coordinates(self.map_x_coordinate(data.x_coords)
+                                               ,self.map_y_coordinate(data.y_coords))
+        # sprites contain the ellipse's outline, which is drawn outside of the player's rectangle
+        left, top = (left - PLAYER_OUTLINE_MARGIN).tolist(), (top - PLAYER_OUTLINE_MARGIN).tolist()
+        sprite_w, sprite_h = int(PLAYER_SPRITE_SIZE[0]), int(PLAYER_SPRITE_SIZE[1])
+        color_idxs = data.color_idxs.tolist()
+
+        if isinstance(atlas, qtg.QPixmap):
+            fragments = [
+                qtg.QPainter.PixmapFragment.create(
+                      qtc.QPointF(x + sprite_w / 2, y + sprite_h / 2)
+                    , qtc.QRectF(color_idx * sprite_w, 0, sprite_w, sprite_h))
+                for x, y, color_idx in zip(left, top, color_idxs)
+            ]
+            if fragments:
+                painter.drawPixmapFragments(fragments, atlas)
+        else:
+            for x, y, color_idx in zip(left, top, color_idxs):
+                painter.drawImage(qtc.QPoint(x, y), atlas, qtc.QRect(color_idx * sprite_w, 0, sprite_w, sprite_h))
+
+        return [qtc.QRect(x, y, sprite_w, sprite_h) for x, y in zip(left, top)]
+
+    @staticmethod
+    def get_heatmap_rect() -> qtc.QRect:
+        """
+        Returns area of the pitch covered by heatmap - in the same coordinate system as players' centers.
+        """
+        left, right = VwPitchPainter.map_x_coordinate(np.array([MIN_PLAYER_X_COORD, MAX_PLAYER_X_COORD]))
+        top, bottom = VwPitchPainter.map_y_coordinate(np.array([MIN_PLAYER_Y_COORD, MAX_PLAYER_Y_COORD]))
+        offset_x = PITCH_BORDER_X - int(PLAYER_SIZE[0]) // 2
+        offset_y = PITCH_BORDER_Y - int(PLAYER_SIZE[1]) // 2
+        return qtc.QRect(qtc.QPoint(int(left) + offset_x, int(top) + offset_y)
+                         , qtc.QPoint(int(right) + offset_x, int(bottom) + offset_y))
+
+    @staticmethod
+    def get_heatmap_image(grid: np.ndarray, size: qtc.QSize) -> qtg.QImage:
+        """
+        Returns heatmap colored with HEATMAP_COLOR_STOPS and smoothly scaled to given size.
+
+        :param grid: Normalized (0 - 1) values of heatmap's bins - rows from the top of the pitch.
+        :param size: Size of the image.
+        """
+        stops  = np.array([stop for stop, _ in HEATMAP_COLOR_STOPS])
+        colors = np.array([color for _, color in HEATMAP_COLOR_STOPS], dtype=np.float64)
+        values = np.clip(np.nan_to_num(grid.astype(np.float64)), 0, 1)
+
+        red, green, blue = (np.interp(values, stops, colors[:, channel]) for channel in range(3))
+        alpha = np.where(values > 0, HEATMAP_MIN_ALPHA + (HEATMAP_MAX_ALPHA - HEATMAP_MIN_ALPHA) * values, 0)
+        argb = (  (alpha.astype(np.uint32) << 24) | (red.astype(np.uint32) << 16)
+                | (green.astype(np.uint32) << 8)  |  blue.astype(np.uint32))
+        argb = np.ascontiguousarray(argb, dtype=np.uint32)
+
+        rows_no, cols_no = argb.shape
+        image = qtg.QImage(argb.data, cols_no, rows_no, cols_no * 4, qtg.QImage.Format_ARGB32).copy()
+        return image.scaled(size, qtc.Qt.IgnoreAspectRatio, qtc.Qt.SmoothTransformation)
+
+    def get_visible_area_polygons(self, areas: VmdPitchVisibleAreas) -> list[qtg.QPolygonF]:
+        """
+        Returns polygons of visible areas of all frames. Corners of all frames are mapped to pixels at once and
+        copied straight into memory of the polygons (QPolygonF stores points as pairs of doubles).
+        """
+        # corners are placed in the same coordinate system as players' centers
+        points = np.empty((len(areas.x_coords), 2), dtype=np.float64)
+        points[:, 0] = self.map_x_coordinate(areas.x_coords) + (PITCH_BORDER_X - PLAYER_SIZE[0] / 2)
+        points[:, 1] = self.map_y_coordinate(areas.y_coords) + (PITCH_BORDER_Y - PLAYER_SIZE[1] / 2)
+
+        polygons = list()
+        offsets = areas.offsets.tolist()
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            polygon = qtg.QPolygonF(end - start)
+            if end > start:
+                buffer = polygon.data()
+                buffer.setsize(points[start:end].nbytes)
+                np.frombuffer(buffer, dtype=np.float64).reshape(-1, 2)[:] = points[start:end]
+            polygons.append(polygon)
+        return polygons
+
+    @staticmethod
+    def get_visible_area_rect(polygon: qtg.QPolygonF) -> qtc.QRect:
+        """
+        Returns area covered by drawn polygon of visible area (with its outline).
+        """
+        return polygon.boundingRect().toAlignedRect().adjusted(-2, -2, 2, 2)
+
+    @staticmethod
+    def draw_visible_area(painter: qtg.QPainter, polygon: qtg.QPolygonF):
+        painter.save()
+        painter.setPen(qtg.QPen(VISIBLE_AREA_OUTLINE_COLOR, 1))
+        painter.setBrush(VISIBLE_AREA_FILL_COLOR)
+        painter.drawPolygon(polygon)
+        painter.restore()
+
+    @staticmethod
+    def map_x_coordinate(org_x: np.ndarray) -> np.ndarray:
+        """
+        Returns x coordinates in pitch's coordinate system
+
+        :param org_x: origin values of the X coordinate
+
+        :return: Integer calculated X coordinates
+        """
+        ORG_MIN_X, ORG_MAX_X = MIN_PLAYER_X_COORD, MAX_PLAYER_X_COORD
+        NEW_MIN_X, NEW_MAX_X = PITCH_X_RANGE
+        return (
+                (org_x - ORG_MIN_X) / (ORG_MAX_X - ORG_MIN_X) * (NEW_MAX_X - NEW_MIN_X) + NEW_MIN_X
+            ).astype(np.int32)
+
+    @staticmethod
+    def map_y_coordinate(org_y: np.ndarray) -> np.ndarray:
+        """
+        Returns y coordinates in pitch's coordinate system
+
+        :param org_y: origin values of the Y coordinate
+        :return: Integer calculated Y coordinates
+        """
+        ORG_MIN_Y, ORG_MAX_Y = MIN_PLAYER_Y_COORD, MAX_PLAYER_Y_COORD
+        NEW_MIN_Y, NEW_MAX_Y = PITCH_Y_RANGE
+        return (
+            (org_y - ORG_MIN_Y) / (ORG_MAX_Y - ORG_MIN_Y) * (NEW_MAX_Y - NEW_MIN_Y) + NEW_MIN_Y
+        ).astype(np.int32)
+
+    @staticmethod
+    def get_pixmap_coordinates(pitch_x: np.ndarray, pitch_y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns coordinates in the pitch pixmap's coordinates frame - top-left corners of rectangles which are filled
+        with players' ellipses. Function considers spaces around exact pitch field.
+
+        :param pitch_x: Numpy array containing X pitch raw coordinates
+        :param pitch_y: Numpy array containing Y pitch raw coordinates
+        :return: Numpy arrays of X and Y coordinates in pitch's pixmap's coordinate system
+        """
+        # calculate the rectangle's top-left corner coordinates
+        return pitch_x + (PITCH_BORDER_X - int(PLAYER_SIZE[0])), pitch_y + (PITCH_BORDER_Y - int(PLAYER_SIZE[1]))
@@ -21,6 +21,10 @@ class VwDatasetDetails(VWBaseView):
         self._l_lineups = self._produce_named_label(_tmp_data_model._lineups_filepath, OBJECT_FORM_LABEL_VALUE)  
         self._l_events  = self._produce_named_label(_tmp_data_model._events_filepath, OBJECT_FORM_LABEL_VALUE)  
         self._l_frames  = self._produce_named_label(_tmp_data_model._frames_filepath, OBJECT_FORM_LABEL_VALUE)  
+        self._l_memory  = self._produce_named_label(_tmp_data_model.get_memory_usage_data(), OBJECT_FORM_LABEL_VALUE)  
+        # memory usage walks all data of the dataset - it is recalculated only when the data changes, not on every
+        # edit (e.g. a frame step)
+        self._memory_key: tuple[int, int] = self._model.get_current_data_key()
         
         self._data_form = qtw.QFormLayout()
         self._data_form.addRow(
@@ -32,6 +36,9 @@ class VwDatasetDetails(VWBaseView):
         self._data_form.addRow(
             self._produce_named_label("Frames path: ", OBJECT_FORM_LABEL_NAME)
             ,self._l_frames)
+        self._data_form.addRow(
+            self._produce_named_label("Memory usage: ", OBJECT_FORM_LABEL_NAME)
+            ,self._l_memory)
         
         main_layout = qtw.QVBoxLayout()
         main_layout.addLayout(self._data_form)
@@ -51,11 +58,17 @@ class VwDatasetDetails(VWBaseView):
         pass
 
     def _dataset_edited(self, item: VmdDatasetListItem):
+        self._update_details(memory_usage=self._model.get_current_data_key() != self._memory_key)
+
+    def _selection_changed(self, info: VmdSelectionChangedData):
+        self._update_details(memory_usage=True)
+
+    def _update_details(self, memory_usage: bool):
         item = self._model.get_current_item_data()
         self._l_lineups.setText(item._lineups_filepath)
         self._l_events.setText( item._events_filepath) 
         self._l_frames.setText( item._frames_filepath)
 
-    def _selection_changed(self, info: VmdSelectionChangedData):
-        old, new = info.old, info.new
-        self._dataset_edited(new)
\ No newline at end of file
+        if memory_usage:
+            self._memory_key = self._model.get_current_data_key()
+            self._l_memory.setText(item.get_memory_usage_data())
\ No newline at end of file
@@ -3,25 +3,13 @@ import pandas as pd
 import PyQt5.QtGui      as qtg
 import PyQt5.QtCore     as qtc
 
-from app.views.components import VWBaseView
-from app.models           import MAX_PLAYER_X_COORD, MIN_PLAYER_X_COORD, MAX_PLAYER_Y_COORD, MIN_PLAYER_Y_COORD
-from app.view_models      import VmdFootballPitch, VmdPitchPlayersData
-from app.view_models      import vmd_football_pitch
-
-
-FOOTBALL_PITCH_PIXMAP_PATH = 'resources/img/test_football_field.png'
-# In analyzed datasets the size of pitch is normalized to width: 120 and height: 80, so the ratio between
-# width and height (which is 1.5) should remain.
-# Following variables are the size of whole pitch image (with borders).
-FOOTBALL_PITCH_HEIGHT = 446
-FOOTBALL_PITCH_WIDTH = 670
-# Following variables are the size of borders - distance from the start of image to the borderlines of the pitch.
-PITCH_BORDER_X = 22
-PITCH_BORDER_Y = 6
-PITCH_BORDER_SIZE = np.array([PITCH_BORDER_X, PITCH_BORDER_Y])
-
-# Diameters of ellipse representing player on pitch.
-PLAYER_SIZE = np.array([22, 22])
+from app.views.components import VWBaseView, VwPitchPainter
+from app.view_models      import VmdFootballPitch, VmdPitchPaintBuffer, VmdPitchVisibleAreas
+from app.view_models      import VmdHeatmap
+from app.view_models      import vmd_football_pitch, vmd_heatmap
+from app.views.components.vw_pitch_painter import FOOTBALL_PITCH_PIXMAP_PATH, FOOTBALL_PITCH_HEIGHT, FOOTBALL_PITCH_WIDTH
+from app.views.components.vw_pitch_painter import PITCH_BORDER_X, PITCH_BORDER_Y, PITCH_BORDER_SIZE
+from app.views.components.vw_pitch_painter import PLAYER_SIZE, PLAYER_OUTLINE_MARGIN, PLAYER_SPRITE_SIZE
 
 
 class VwFootballPitch(VWBaseView):
@@ -29,15 +17,30 @@ class VwFootballPitch(VWBaseView):
     Class for football pitch visualization. Contains methods to draw players positions on the pitch based on given data.
     """
 
-    def __init__(self, model: VmdFootballPitch = None, parent=None):
+    def __init__(self, model: VmdFootballPitch = None, heatmap_model: VmdHeatmap = None, parent=None):
         super(VwFootballPitch, self).__init__(parent=parent)
-        # define ranges (in pixels) of exact pitch rectangle (excluding borders on the pitch image)
-        self._pitch_x_range = (float(PITCH_BORDER_X), float(FOOTBALL_PITCH_WIDTH  - PITCH_BORDER_X))
-        self._pitch_y_range = (float(PITCH_BORDER_Y), float(FOOTBALL_PITCH_HEIGHT - PITCH_BORDER_Y))
+        # drawing of players and visible area - shared with the headless export of frames
+        self._painter = VwPitchPainter()
 
         self.setFixedSize(FOOTBALL_PITCH_WIDTH, FOOTBALL_PITCH_HEIGHT)
 
+        # rendering layers - the static pitch image (scaled to the widget's size) and players drawn on transparent
+        # pixmap of the pitch image's size; both are redrawn only when needed, paintEvent just composes them
+        self._background: qtg.QPixmap     = None
+        self._players_layer: qtg.QPixmap  = None
+        # areas (in coordinates of the pitch image) covered by players currently drawn on the players layer
+        self._players_rects: list[qtc.QRect] = list()
+        # pixmap with icons of players in all colors of the palette (placed side by side) - by palette colors
+        self._players_atlas: tuple[tuple[int], qtg.QPixmap] = ((), None)
+        # polygons (in coordinates of the pitch image) of visible areas of all frames - built on the first use
+        self._visible_area_polygons: list[qtg.QPolygonF] = None
+        self._visible_area_pos = -1
+        # normalized grid of the shown heatmap and its colored image (in coordinates of the widget) - built on the first use
+        self._heatmap_grid: np.ndarray = None
+        self._heatmap: tuple[qtc.QRect, qtg.QPixmap] = None
+
         self._model = model or vmd_football_pitch
+        self._heatmap_model = heatmap_model or vmd_heatmap
         
         self._setup()
         self.show()
@@ -65,39 +68,157 @@ class VwFootballPitch(VWBaseView):
 
         return pixmap_image
 
-    def paintEvent(self, event):
+    def _get_background(self) -> qtg.QPixmap:
+        """
+        Returns pitch image scaled to the current size of the widget. Image is loaded and scaled once per widget's size.
         """
-        Function to draw the football pitch image initially on screen.
+        if self._background is None or self._background.size() != self.size():
+            self._background = self._return_pixmap(FOOTBALL_PITCH_PIXMAP_PATH
+                                                ,scaled_height=self.height()
+                                                ,scaled_width =self.width())
+        return self._background
 
-        :param event: PyQt5 event.
-        :return: None
+    def _get_players_layer(self) -> qtg.QPixmap:
+        if self._players_layer is None:
+            self._redraw_players_layer()
+        return self._players_layer
+
+    def _get_players_atlas(self, palette: list[qtg.QColor]) -> qtg.QPixmap:
+        """
+        Returns atlas of players' icons (see VwPitchPainter.get_players_atlas) as pixmap - converted once per palette.
+        """
+        palette_key = tuple(color.rgba() for color in palette)
+        if self._players_atlas[0] != palette_key:
+            self._players_atlas = (palette_key, qtg.QPixmap.fromImage(self._painter.get_players_atlas(palette)))
+        return self._players_atlas[1]
+
+    def _redraw_players_layer(self) -> qtg.QRegion:
+        """
+        Draws players of current paint data on the players layer. Positions of all players are calculated at once
+        and their icons are copied from the atlas with a single call.
+
+        :return: Region of the pitch image changed - covered by players drawn previously or now.
         """
-        pitch_pixmap = self._return_pixmap(FOOTBALL_PITCH_PIXMAP_PATH
-                                        ,scaled_height=FOOTBALL_PITCH_HEIGHT
-                                        ,scaled_width =FOOTBALL_PITCH_WIDTH)
+        if self._players_layer is None:
+            self._players_layer = qtg.QPixmap(FOOTBALL_PITCH_WIDTH, FOOTBALL_PITCH_HEIGHT)
+            self._players_layer.fill(qtc.Qt.transparent)
+
+        changed = qtg.QRegion()
         # painter to draw on pixmap
-        pixmap_painter = qtg.QPainter(pitch_pixmap)
-        
-        for item in self._model.get_paint_data():
-            item: VmdPitchPlayersData = item
+        pixmap_painter = qtg.QPainter(self._players_layer)
 
-            pitch_coordinates = np.array([
-                 self._map_x_coordinate(item.x_coord)
-                ,self._map_y_coordinate(item.y_coord)
-            ])
-            pixmap_coordinates = self._get_pixmap_coordinates(pitch_coordinates)
+        # only areas of previously drawn players are cleared
+        pixmap_painter.setCompositionMode(qtg.QPainter.CompositionMode_Clear)
+        for rect in self._players_rects:
+            pixmap_painter.fillRect(rect, qtc.Qt.transparent)
+            changed = changed.united(rect)
+        pixmap_painter.setCompositionMode(qtg.QPainter.CompositionMode_SourceOver)
 
-            pixmap_painter.setBrush(qtg.QBrush(item.color))
-            pixmap_painter.drawEllipse(pixmap_coordinates)
-        
+        data: VmdPitchPaintBuffer = self._model.get_paint_data()
+        self._players_rects = self._painter.draw_players(pixmap_painter, data, self._get_players_atlas(data.palette))
         pixmap_painter.end()
 
+        for rect in self._players_rects:
+            changed = changed.united(rect)
+        return changed
+
+    def _get_heatmap(self) -> tuple[qtc.QRect, qtg.QPixmap] | None:
+        if self._heatmap_grid is None:
+            return None
+
+        if self._heatmap is None:
+            rect = self._to_widget_rect(self._painter.get_heatmap_rect())
+            image = self._painter.get_heatmap_image(self._heatmap_grid, rect.size())
+            self._heatmap = (rect, qtg.QPixmap.fromImage(image))
+        return self._heatmap
+
+    def _get_visible_area_polygons(self) -> list[qtg.QPolygonF]:
+        if self._visible_area_polygons is None:
+            self._visible_area_polygons = self._painter.get_visible_area_polygons(self._model.get_visible_areas())
+        return self._visible_area_polygons
+
+    def _get_visible_area_polygon(self) -> qtg.QPolygonF | None:
+        if not self._model.is_visible_area_shown() or self._visible_area_pos < 0:
+            return None
+
+        polygons = self._get_visible_area_polygons()
+        return polygons[self._visible_area_pos] if self._visible_area_pos < len(polygons) else None
+
+    def _get_visible_area_rect(self) -> qtc.QRect:
+        """
+        Returns area of the widget covered by the visible area overlay (empty if it is not drawn).
+        """
+        polygon = self._get_visible_area_polygon()
+        if polygon is None or polygon.isEmpty():
+            return qtc.QRect()
+        return self._to_widget_rect(self._painter.get_visible_area_rect(polygon))
+
+    def _to_widget_rect(self, rect: qtc.QRect) -> qtc.QRect:
+        """
+        Maps rectangle in coordinates of the pitch image (and players layer) to coordinates of the widget.
+        """
+        scale_x = self.width()  / FOOTBALL_PITCH_WIDTH
+        scale_y = self.height() / FOOTBALL_PITCH_HEIGHT
+        if scale_x == 1 and scale_y == 1:
+            return rect
+
+        return qtc.QRectF(rect.x() * scale_x, rect.y() * scale_y
+                          , rect.width() * scale_x, rect.height() * scale_y).toAlignedRect()
+
+    def _to_layer_rect(self, rect: qtc.QRect) -> qtc.QRect:
+        """
+        Maps rectangle in coordinates of the widget to coordinates of the pitch image (and players layer).
+        """
+        scale_x = FOOTBALL_PITCH_WIDTH  / max(1, self.width())
+        scale_y = FOOTBALL_PITCH_HEIGHT / max(1, self.height())
+        if scale_x == 1 and scale_y == 1:
+            return rect
+
+        return qtc.QRectF(rect.x() * scale_x, rect.y() * scale_y
+                          , rect.width() * scale_x, rect.height() * scale_y).toAlignedRect()
+
+    def paintEvent(self, event):
+        """
+        Composes cached pitch image and players layer - only the area to be repainted is drawn.
+
+        :param event: PyQt5 event.
+        :return: None
+        """
+        background    = self._get_background()
+        players_layer = self._get_players_layer()
+
+        # painter is clipped to the region to be repainted, so drawing its bounding rectangle touches that region only
+        rect = event.rect()
         painter = qtg.QPainter(self)
-        painter.drawPixmap(self.rect(), pitch_pixmap)
+        painter.drawPixmap(rect, background, rect)
+
+        heatmap = self._get_heatmap()
+        if heatmap is not None:
+            heatmap_rect, heatmap_pixmap = heatmap
+            painter.drawPixmap(heatmap_rect.topLeft(), heatmap_pixmap)
+
+        polygon = self._get_visible_area_polygon()
+        if polygon is not None and not polygon.isEmpty():
+            painter.save()
+            painter.scale(self.width() / FOOTBALL_PITCH_WIDTH, self.height() / FOOTBALL_PITCH_HEIGHT)
+            self._painter.draw_visible_area(painter, polygon)
+            painter.restore()
+
+        painter.drawPixmap(rect, players_layer, self._to_layer_rect(rect))
         painter.end()
 
+    def resizeEvent(self, event):
+        # background and heatmap are scaled again on the next repaint
+        self._background = None
+        self._heatmap = None
+        super(VwFootballPitch, self).resizeEvent(event)
+
     def _set_value_subscriptions(self):
         self._model.player_pitch_data_changed.connect(self._update_view)
+        self._model.visible_areas_changed.connect(self._update_visible_areas)
+        self._model.visible_area_frame_changed.connect(self._update_visible_area_frame)
+        self._model.visible_area_shown_changed.connect(lambda *args: self.update())
+        self._heatmap_model.heatmap_changed.connect(self._update_heatmap)
 
     def _bind_buttons_to_commands(self):
         pass
@@ -105,56 +226,35 @@ class VwFootballPitch(VWBaseView):
     def _init_actions(self):
         pass
 
-    def _update_view(self, data: pd.Series):
+    def _update_view(self, data: VmdPitchPaintBuffer):
         """
-        Draws new positions of players on the pitch, based on given data
+        Draws new positions of players on the pitch, based on given data. Only areas of players moved are repainted.
         
         :return: None
         """
-        self.update()
+        changed = self._redraw_players_layer()
+        if self.size() == qtc.QSize(FOOTBALL_PITCH_WIDTH, FOOTBALL_PITCH_HEIGHT):
+            self.update(changed)
+        else:
+            for rect in changed.rects():
+                self.update(self._to_widget_rect(rect))
 
-    def _map_x_coordinate(self, org_x: float) -> int:
-        """
-        Returns x coordinate in pitch's coordinate system
-
-        :param org_x: origin value of the X coordinate
+    def _update_visible_areas(self, areas: VmdPitchVisibleAreas):
+        self._visible_area_polygons = None
+        self._visible_area_pos = -1
+        self.update()
 
-        :return: Integer calculated X coordinate
-        """
-        ORG_MIN_X, ORG_MAX_X = MIN_PLAYER_X_COORD, MAX_PLAYER_X_COORD
-        NEW_MIN_X, NEW_MAX_X = self._pitch_x_range[0], self._pitch_x_range[1]
-        return int(
-                (org_x - ORG_MIN_X) / (ORG_MAX_X - ORG_MIN_X) * (NEW_MAX_X - NEW_MIN_X) + NEW_MIN_X
-            )
-    
-    def _map_y_coordinate(self, org_y: float) -> int:
-        """
-        Returns y coordinate in pitch's coordinate system
+    def _update_heatmap(self, grid: np.ndarray | None):
+        self._heatmap_grid = grid
+        self._heatmap = None
+        self.update()
 
-        :param org_y: origin value of the Y coordinate
-        :return: Integer calculated Y coordinate
+    def _update_visible_area_frame(self, pos: int):
         """
-        ORG_MIN_Y, ORG_MAX_Y = MIN_PLAYER_Y_COORD, MAX_PLAYER_Y_COORD
-        NEW_MIN_Y, NEW_MAX_Y = self._pitch_y_range[0], self._pitch_y_range[1]
-        return int(
-            (org_y - ORG_MIN_Y) / (ORG_MAX_Y - ORG_MIN_Y) * (NEW_MAX_Y - NEW_MIN_Y) + NEW_MIN_Y
-        )
-    
-    def _get_pixmap_coordinates(self, pitch_coordinates: np.array) -> qtc.QRect:
+        Shows visible area of the frame with given position - only areas covered by the old or new one are repainted.
         """
-        Returns coordinates in the pitch pixmap's coordinates frame in a form readable by QPainter object
-        (as a QRect object). Function considers spaces around exact pitch field and the way that the ellipse is being
-        drawn - there is a need to specify top-left point of a rectangle and its width and height. Ellipse is then
-        filling the rectangle specified.
-
-        :param pitch_coordinates: Numpy array containing X and Y pitch raw coordinates
-        :return: qt.QRect object with coordinates in pitch's pixmap's coordinate system 
-        """
-        pixmap_coordinates = pitch_coordinates + PITCH_BORDER_SIZE
-        # calculate the rectangle's top-left corner coordinates
-        pixmap_coordinates -= PLAYER_SIZE
-
-        top_left_corner = qtc.QPoint(int(pixmap_coordinates[0]), int(pixmap_coordinates[1]))
-        size = qtc.QSize(int(PLAYER_SIZE[0]), int(PLAYER_SIZE[1]))
-
-        return qtc.QRect(top_left_corner, size)
\ No newline at end of file
+        old_rect = self._get_visible_area_rect()
+        self._visible_area_pos = pos
+        changed = old_rect.united(self._get_visible_area_rect())
+        if not changed.isEmpty():
+            self.update(changed)
@@ -0,0 +1,173 @@
+"""Contains headless rendering of dataset's frames to image files - works under the offscreen Qt platform."""
+
+import os
+import math
+import time
+import PyQt5.QtGui      as qtg
+import PyQt5.QtCore     as qtc
+from concurrent.futures import ThreadPoolExecutor
+
+from app.view_models      import VmdFootballPitch, VmdDatasetListItem
+from app.view_models      import vmd_football_pitch
+from app.views.components import VwPitchPainter
+from app.views.components.vw_pitch_painter import FOOTBALL_PITCH_PIXMAP_PATH, FOOTBALL_PITCH_HEIGHT, FOOTBALL_PITCH_WIDTH
+
+
+DEFAULT_FRAME_FILE_PATTERN = 'frame_{frame_no:06d}.png'
+# width (in pixels) of a single frame's tile in the sprite sheet
+DEFAULT_SHEET_TILE_WIDTH   = 120
+DEFAULT_MAX_WORKERS        = 8
+# frames are rendered in batches - one batch is a single task of a worker thread
+FRAMES_PER_BATCH           = 64
+# frames are opaque - PNG encoding of images without alpha channel is about twice as fast
+IMAGE_FORMAT               = qtg.QImage.Format_RGB32
+# quality passed to the image writer - for PNG it selects faster, slightly weaker compression than the default one
+IMAGE_QUALITY              = 80
+
+
+class VwExportStats:
+
+    def __init__(self, frames_no: int, seconds: float, output_path: str):
+        self.frames_no   = frames_no
+        self.seconds     = seconds
+        self.output_path = output_path
+
+    @property
+    def fps(self) -> float:
+        return self.frames_no / self.seconds if self.seconds > 0 else 0.0
+
+
+class VwFramesExporter:
+    """
+    Renders frames of a dataset the same way as VwFootballPitch draws them, but on QImage objects in worker threads
+    (painting on QImage and PNG encoding do not need the GUI thread and run without the GIL). Frames are written
+    as a numbered PNG sequence or composed into a single sprite sheet.
+    """
+
+    def __init__(self, pitch_model: VmdFootballPitch = None, background_path: str = FOOTBALL_PITCH_PIXMAP_PATH
+                 , visible_area: bool = False, max_workers: int = None):
+        """
+        :param pitch_model: View model calculating paint data of frames (its state is not changed).
+        :param background_path: Path of the pitch image.
+        :param visible_area: True to draw the camera's visible area on frames.
+        :param max_workers: Number of rendering threads. By default the smaller of DEFAULT_MAX_WORKERS and number of CPUs.
+        """
+        self._fp_vm = pitch_model or vmd_football_pitch
+        self._painter = VwPitchPainter()
+        self._background = VwPitchPainter.load_background(
+            background_path, FOOTBALL_PITCH_WIDTH, FOOTBALL_PITCH_HEIGHT).convertToFormat(IMAGE_FORMAT)
+        self._visible_area = visible_area
+        self._max_workers = max_workers or min(DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+        # atlas is drawn before rendering starts, workers only read it
+        self._players_atlas = self._painter.get_players_atlas(self._fp_vm.get_palette())
+
+    def export_png_sequence(self, item: VmdDatasetListItem, dir_path: str, frame_nos: list[int] = None
+                            , file_pattern: str = DEFAULT_FRAME_FILE_PATTERN) -> VwExportStats:
+        """
+        Writes every frame as a separate PNG file of the pitch image's size.
+
+        :param item: Dataset with calculated data.
+        :param dir_path: Output directory (created if it does not exist).
+        :param frame_nos: Numbers of frames to export - all frames of the dataset by default.
+        :param file_pattern: Pattern of file names, formatted with frame_no.
+        :return: Statistics of the export.
+        """
+        os.makedirs(dir_path, exist_ok=True)
+        frame_nos = self._get_frame_nos(item, frame_nos)
+        start = time.perf_counter()
+
+        polygons = self._get_visible_area_polygons(item)
+
+        def _export_batch(batch: list[int]):
+            for frame_no in batch:
+                path = os.path.join(dir_path, file_pattern.format(frame_no=frame_no))
+                if not self.render_frame(item, frame_no, polygons).save(path, 'PNG', IMAGE_QUALITY):
+                    raise OSError(f'{self.__class__.__name__}: cannot write file {path}')
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            list(executor.map(_export_batch, self._get_batches(frame_nos)))
+
+        return VwExportStats(len(frame_nos), time.perf_counter() - start, dir_path)
+
+    def export_sprite_sheet(self, item: VmdDatasetListItem, file_path: str, frame_nos: list[int] = None
+                            , tile_width: int = DEFAULT_SHEET_TILE_WIDTH, columns: int = None) -> VwExportStats:
+        """
+        Writes frames as tiles of a single image, row by row.
+
+        :param item: Dataset with calculated data.
+        :param file_path: Output image file (format is deduced from the extension).
+        :param frame_nos: Numbers of frames to export - all frames of the dataset by default.
+        :param tile_width: Width of a frame's tile - height keeps proportions of the pitch image.
+        :param columns: Number of tiles in a row - by default the sheet is close to square.
+        :return: Statistics of the export.
+        """
+        frame_nos = self._get_frame_nos(item, frame_nos)
+        start = time.perf_counter()
+
+        tile_size = qtc.QSize(tile_width, round(tile_width * FOOTBALL_PITCH_HEIGHT / FOOTBALL_PITCH_WIDTH))
+        columns   = columns or max(1, math.ceil(math.sqrt(len(frame_nos))))
+        rows      = max(1, math.ceil(len(frame_nos) / columns))
+
+        polygons   = self._get_visible_area_polygons(item)
+        background = self._background.scaled(tile_size, qtc.Qt.IgnoreAspectRatio, qtc.Qt.SmoothTransformation)
+
+        def _render_batch(batch: list[tuple[int, int]]) -> list[tuple[int, qtg.QImage]]:
+            return [(tile_no, self.render_frame(item, frame_no, polygons, background)) for tile_no, frame_no in batch]
+
+        sheet = qtg.QImage(columns * tile_size.width(), rows * tile_size.height(), IMAGE_FORMAT)
+        sheet.fill(qtc.Qt.black)
+        sheet_painter = qtg.QPainter(sheet)
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            for tiles in executor.map(_render_batch, self._get_batches(list(enumerate(frame_nos)))):
+                for tile_no, tile in tiles:
+                    row, col = divmod(tile_no, columns)
+                    sheet_painter.drawImage(col * tile_size.width(), row * tile_size.height(), tile)
+        sheet_painter.end()
+
+        if not sheet.save(file_path, None, IMAGE_QUALITY):
+            raise OSError(f'{self.__class__.__name__}: cannot write file {file_path}')
+
+        return VwExportStats(len(frame_nos), time.perf_counter() - start, file_path)
+
+    def render_frame(self, item: VmdDatasetListItem, frame_no: int, polygons: list[qtg.QPolygonF] = None
+                     , background: qtg.QImage = None) -> qtg.QImage:
+        """
+        Returns image of the frame - pitch with visible area (if polygons are given) and players.
+        Can be called from any thread.
+
+        :param polygons: Visible area polygons of all dataset's frames (see VwPitchPainter.get_visible_area_polygons).
+        :param background: Pitch image of the output size - pitch image of the original size by default.
+        """
+        background = background if background is not None else self._background
+        image = background.copy()
+
+        data = self._fp_vm.calculate_paint_data(*item.get_frame_data(frame_no))
+
+        painter = qtg.QPainter(image)
+        if image.size() != self._background.size():
+            painter.setRenderHint(qtg.QPainter.SmoothPixmapTransform)
+            painter.scale(image.width() / FOOTBALL_PITCH_WIDTH, image.height() / FOOTBALL_PITCH_HEIGHT)
+
+        if polygons is not None and 0 <= frame_no - 1 < len(polygons) and not polygons[frame_no - 1].isEmpty():
+            self._painter.draw_visible_area(painter, polygons[frame_no - 1])
+        self._painter.draw_players(painter, data, self._players_atlas)
+        painter.end()
+
+        return image
+
+    @staticmethod
+    def _get_frame_nos(item: VmdDatasetListItem, frame_nos: list[int] | None) -> list[int]:
+        return list(frame_nos) if frame_nos is not None else list(range(1, item.get_frames_no() + 1))
+
+    def _get_visible_area_polygons(self, item: VmdDatasetListItem) -> list[qtg.QPolygonF] | None:
+        if not self._visible_area:
+            return None
+
+        areas = self._fp_vm.calculate_visible_areas(*item.get_visible_area_data())
+        polygons = self._painter.get_visible_area_polygons(areas)
+        # areas of frames which players are not drawn are skipped
+        return [polygon if shown else qtg.QPolygonF() for polygon, shown in zip(polygons, areas.shown.tolist())]
+
+    @staticmethod
+    def _get_batches(values: list) -> list[list]:
+        return [values[start:start + FRAMES_PER_BATCH] for start in range(0, len(values), FRAMES_PER_BATCH)]
@@ -1,8 +1,12 @@
+import numpy  as np
 import PyQt5.QtWidgets  as qtw
+import PyQt5.QtCore     as qtc
 
 from app.views.components import VWBaseView
-from app.view_models      import VmdCurrentDataset
-from app.view_models      import vmd_current_dataset
+from app.view_models      import VmdCurrentDataset, VmdPlayback, VmdPlaybackStats, VmdFootballPitch, VmdHeatmap
+from app.view_models      import VmdSpatialQuery, VmdEventsFilter, VmdEventsFilterOptions, VmdTimeline
+from app.view_models      import vmd_current_dataset, vmd_playback, vmd_football_pitch, vmd_heatmap, vmd_spatial_query
+from app.view_models      import vmd_events_filter, vmd_timeline
 
 OBJECT_NAME = 'FOOTBALL_PITCH'
 OBJECT_LEGEND_IND_NAME = 'FOOTBALL_PITCH_LEGEND_IND'
@@ -10,13 +14,46 @@ OBJECT_LEGEND_LBL_NAME = 'FOOTBALL_PITCH_LEGEND_LBL'
 OBJECT_TIMESTAMP_LBL_NAME = 'FOOTBALL_PITCH_TIMESTAMP_LBL'
 OBJECT_CONTROL_FRAME_BUTTON_NAME = 'FOOTBALL_PITCH_CONTROL_FRAME_BUTTON'
 OBJECT_CURRENT_FRAME_EDIT_NAME   = 'FOOTBALL_PITCH_EDIT_FRAME_INPUT'
+OBJECT_PLAYBACK_SPEED_COMBO_NAME = 'FOOTBALL_PITCH_PLAYBACK_SPEED_COMBO'
+OBJECT_TWEENING_CHECKBOX_NAME    = 'FOOTBALL_PITCH_TWEENING_CHECKBOX'
+OBJECT_VISIBLE_AREA_CHECKBOX_NAME = 'FOOTBALL_PITCH_VISIBLE_AREA_CHECKBOX'
+OBJECT_HEATMAP_CHECKBOX_NAME      = 'FOOTBALL_PITCH_HEATMAP_CHECKBOX'
+OBJECT_HEATMAP_TEAM_COMBO_NAME    = 'FOOTBALL_PITCH_HEATMAP_TEAM_COMBO'
+OBJECT_HEATMAP_PERIOD_COMBO_NAME  = 'FOOTBALL_PITCH_HEATMAP_PERIOD_COMBO'
+OBJECT_FRAMES_QUERY_COMBO_NAME    = 'FOOTBALL_PITCH_FRAMES_QUERY_COMBO'
+OBJECT_EVENTS_TYPE_COMBO_NAME     = 'FOOTBALL_PITCH_EVENTS_TYPE_COMBO'
+OBJECT_EVENTS_TEAM_COMBO_NAME     = 'FOOTBALL_PITCH_EVENTS_TEAM_COMBO'
+OBJECT_EVENTS_PERIOD_COMBO_NAME   = 'FOOTBALL_PITCH_EVENTS_PERIOD_COMBO'
+OBJECT_TIMELINE_SLIDER_NAME       = 'FOOTBALL_PITCH_TIMELINE_SLIDER'
+OBJECT_MATCH_TIME_EDIT_NAME       = 'FOOTBALL_PITCH_MATCH_TIME_INPUT'
+
+PLAY_BUTTON_LABEL  = '►'
+PAUSE_BUTTON_LABEL = '||'
+HEATMAP_ALL_TEAMS_LABEL   = 'Both teams'
+HEATMAP_ALL_PERIODS_LABEL = 'Whole match'
+FRAMES_QUERY_NONE_LABEL   = 'All frames'
+EVENTS_ALL_TYPES_LABEL    = 'All events'
+EVENTS_ALL_TEAMS_LABEL    = 'Both teams'
+EVENTS_ALL_PERIODS_LABEL  = 'All periods'
+# steps (in milliseconds) of the timeline slider moved with arrow keys and with page keys
+TIMELINE_SINGLE_STEP_MS   = 1_000
+TIMELINE_PAGE_STEP_MS     = 60_000
 
 
 class VwPitchControls(VWBaseView):
             
-    def __init__(self, model: VmdCurrentDataset = None, parent=None):
+    def __init__(self, model: VmdCurrentDataset = None, playback_model: VmdPlayback = None
+                 , pitch_model: VmdFootballPitch = None, heatmap_model: VmdHeatmap = None
+                 , query_model: VmdSpatialQuery = None, events_filter_model: VmdEventsFilter = None
+                 , timeline_model: VmdTimeline = None, parent=None):
         super(VwPitchControls, self).__init__(parent=parent)
         self._model = model or vmd_current_dataset
+        self._playback_model = playback_model or vmd_playback
+        self._pitch_model = pitch_model or vmd_football_pitch
+        self._heatmap_model = heatmap_model or vmd_heatmap
+        self._query_model = query_model or vmd_spatial_query
+        self._events_filter_model = events_filter_model or vmd_events_filter
+        self._timeline_model = timeline_model or vmd_timeline
         
         t1, t2 = self._model.get_current_item_data().get_team_names()
         self._l_legend_ind_1 = self._produce_icon_label('red_rect.png', size_x=90, size_y=90,  label_name=OBJECT_LEGEND_IND_NAME)
@@ -50,9 +87,85 @@ class VwPitchControls(VWBaseView):
         self._controls_layout.addWidget(self._b_frame_read)
         self._controls_layout.addStretch()
 
+        self._b_play  = self._produce_button(button_label=PLAY_BUTTON_LABEL, button_name=OBJECT_CONTROL_FRAME_BUTTON_NAME)
+        self._c_speed = self._produce_speed_combo()
+        self._l_playback_stats = self._produce_named_label(content='', name=OBJECT_LEGEND_LBL_NAME)
+        self._cb_tweening = qtw.QCheckBox('Smooth movement')
+        self._cb_tweening.setObjectName(OBJECT_TWEENING_CHECKBOX_NAME)
+        self._cb_tweening.setChecked(self._pitch_model.is_tweening())
+        self._cb_visible_area = qtw.QCheckBox('Visible area')
+        self._cb_visible_area.setObjectName(OBJECT_VISIBLE_AREA_CHECKBOX_NAME)
+        self._cb_visible_area.setChecked(self._pitch_model.is_visible_area_shown())
+
+        self._playback_layout = qtw.QHBoxLayout()
+        self._playback_layout.addWidget(self._b_play)
+        self._playback_layout.addWidget(self._produce_named_label(content='Speed:', name=OBJECT_LEGEND_LBL_NAME))
+        self._playback_layout.addWidget(self._c_speed)
+        self._playback_layout.addWidget(self._cb_tweening)
+        self._playback_layout.addWidget(self._cb_visible_area)
+        self._playback_layout.addWidget(self._l_playback_stats)
+        self._playback_layout.addStretch()
+
+        self._cb_heatmap = qtw.QCheckBox('Heatmap')
+        self._cb_heatmap.setObjectName(OBJECT_HEATMAP_CHECKBOX_NAME)
+        self._cb_heatmap.setChecked(self._heatmap_model.is_shown())
+        self._c_heatmap_team   = self._produce_combo(name=OBJECT_HEATMAP_TEAM_COMBO_NAME)
+        self._c_heatmap_period = self._produce_combo(name=OBJECT_HEATMAP_PERIOD_COMBO_NAME)
+        self._update_heatmap_teams(t1, t2)
+        self._update_heatmap_periods(self._heatmap_model.get_periods())
+
+        self._heatmap_layout = qtw.QHBoxLayout()
+        self._heatmap_layout.addWidget(self._cb_heatmap)
+        self._heatmap_layout.addWidget(self._c_heatmap_team)
+        self._heatmap_layout.addWidget(self._c_heatmap_period)
+        self._heatmap_layout.addStretch()
+
+        self._c_frames_query = self._produce_combo(name=OBJECT_FRAMES_QUERY_COMBO_NAME)
+        self._set_combo_items(self._c_frames_query
+                              , [(FRAMES_QUERY_NONE_LABEL, None)] + [(query, query) for query in self._query_model.get_queries()])
+        self._c_events_type   = self._produce_combo(name=OBJECT_EVENTS_TYPE_COMBO_NAME)
+        self._c_events_team   = self._produce_combo(name=OBJECT_EVENTS_TEAM_COMBO_NAME)
+        self._c_events_period = self._produce_combo(name=OBJECT_EVENTS_PERIOD_COMBO_NAME)
+        self._update_events_teams(t1, t2)
+        self._update_events_filter_options(self._events_filter_model.get_options())
+        self._b_selected_left  = self._produce_button(button_label='<<', button_name=OBJECT_CONTROL_FRAME_BUTTON_NAME)
+        self._b_selected_right = self._produce_button(button_label='>>', button_name=OBJECT_CONTROL_FRAME_BUTTON_NAME)
+        self._l_selected_frames = self._produce_named_label(content='', name=OBJECT_LEGEND_LBL_NAME)
+        self._update_frames_selection(self._model.get_frames_selection())
+
+        self._query_layout = qtw.QHBoxLayout()
+        self._query_layout.addWidget(self._produce_named_label(content='Frames:', name=OBJECT_LEGEND_LBL_NAME))
+        self._query_layout.addWidget(self._c_events_type)
+        self._query_layout.addWidget(self._c_events_team)
+        self._query_layout.addWidget(self._c_events_period)
+        self._query_layout.addWidget(self._c_frames_query)
+        self._query_layout.addWidget(self._b_selected_left)
+        self._query_layout.addWidget(self._b_selected_right)
+        self._query_layout.addWidget(self._l_selected_frames)
+        self._query_layout.addStretch()
+
+        self._s_timeline = qtw.QSlider(qtc.Qt.Horizontal)
+        self._s_timeline.setObjectName(OBJECT_TIMELINE_SLIDER_NAME)
+        self._s_timeline.setSingleStep(TIMELINE_SINGLE_STEP_MS)
+        self._s_timeline.setPageStep(TIMELINE_PAGE_STEP_MS)
+        self._l_match_time = self._produce_line_edit(init_val='', name=OBJECT_MATCH_TIME_EDIT_NAME)
+        self._l_match_time.setPlaceholderText('mm:ss')
+        self._update_timeline_length(self._timeline_model.get_length_ms())
+        self._update_timeline_position(self._timeline_model.get_position_ms())
+
+        self._timeline_layout = qtw.QHBoxLayout()
+        self._timeline_layout.addWidget(self._produce_named_label(content='Time:', name=OBJECT_LEGEND_LBL_NAME))
+        self._timeline_layout.addWidget(self._s_timeline, stretch=1)
+        self._timeline_layout.addWidget(self._produce_named_label(content='Go to:', name=OBJECT_LEGEND_LBL_NAME))
+        self._timeline_layout.addWidget(self._l_match_time)
+
         self._main_layout = qtw.QVBoxLayout()
         self._main_layout.addLayout(self._legend_layout)
         self._main_layout.addLayout(self._controls_layout)
+        self._main_layout.addLayout(self._timeline_layout)
+        self._main_layout.addLayout(self._playback_layout)
+        self._main_layout.addLayout(self._heatmap_layout)
+        self._main_layout.addLayout(self._query_layout)
 
         self.setLayout(self._main_layout)
 
@@ -62,12 +175,55 @@ class VwPitchControls(VWBaseView):
     def _set_value_subscriptions(self):
         self._model.dataset_edited.connect(self._update_view)
         self._model.selection_changed.connect(self._update_view)
+        self._playback_model.playing_changed.connect(self._update_playback_view)
+        self._playback_model.stats_changed.connect(self._update_playback_stats)
+        self._heatmap_model.periods_changed.connect(self._update_heatmap_periods)
+        self._model.frames_selection_changed.connect(self._update_frames_selection)
+        self._events_filter_model.options_changed.connect(self._update_events_filter_options)
+        self._timeline_model.length_changed.connect(self._update_timeline_length)
+        self._timeline_model.position_changed.connect(self._update_timeline_position)
 
     def _bind_buttons_to_commands(self):
         self._b_frame_read.clicked.connect(self._model.get_data)
         self._b_frame_left.clicked.connect(self._model.previous_frame)
         self._b_frame_right.clicked.connect(self._model.next_frame)
         self._l_frame_curr.editingFinished.connect(lambda: self._model.set_current_frame(self._l_frame_curr.text()))
+        self._b_play.clicked.connect(self._playback_model.toggle)
+        self._c_speed.currentIndexChanged.connect(lambda idx: self._playback_model.set_speed(self._c_speed.itemData(idx)))
+        self._cb_tweening.toggled.connect(self._pitch_model.set_tweening)
+        self._cb_visible_area.toggled.connect(self._pitch_model.set_visible_area_shown)
+        self._cb_heatmap.toggled.connect(self._heatmap_model.set_shown)
+        self._c_heatmap_team.currentIndexChanged.connect(
+            lambda idx: self._heatmap_model.set_team_idx(self._c_heatmap_team.itemData(idx)))
+        self._c_heatmap_period.currentIndexChanged.connect(
+            lambda idx: self._heatmap_model.set_period(self._c_heatmap_period.itemData(idx)))
+        self._c_frames_query.currentIndexChanged.connect(
+            lambda idx: self._query_model.set_query(self._c_frames_query.itemData(idx)))
+        self._c_events_type.currentIndexChanged.connect(
+            lambda idx: self._events_filter_model.set_type_id(self._c_events_type.itemData(idx)))
+        self._c_events_team.currentIndexChanged.connect(
+            lambda idx: self._events_filter_model.set_team_idx(self._c_events_team.itemData(idx)))
+        self._c_events_period.currentIndexChanged.connect(
+            lambda idx: self._events_filter_model.set_period(self._c_events_period.itemData(idx)))
+        self._s_timeline.valueChanged.connect(self._timeline_model.seek)
+        self._l_match_time.editingFinished.connect(lambda: self._timeline_model.seek_match_time(self._l_match_time.text()))
+        self._b_selected_left.clicked.connect(self._model.previous_selected_frame)
+        self._b_selected_right.clicked.connect(self._model.next_selected_frame)
+
+    def _produce_speed_combo(self) -> qtw.QComboBox:
+        combo = qtw.QComboBox()
+        combo.setObjectName(OBJECT_PLAYBACK_SPEED_COMBO_NAME)
+        for speed in self._playback_model.get_speeds():
+            combo.addItem(f'{speed:g}x', speed)
+        combo.setCurrentIndex(combo.findData(self._playback_model.get_speed()))
+        return combo
+
+    @staticmethod
+    def _produce_combo(name: str) -> qtw.QComboBox:
+        combo = qtw.QComboBox()
+        combo.setObjectName(name)
+        combo.setSizeAdjustPolicy(qtw.QComboBox.AdjustToContents)
+        return combo
         
     def _init_actions(self):
         pass
@@ -81,3 +237,65 @@ class VwPitchControls(VWBaseView):
         t1, t2 = item.get_team_names()
         self._l_legend_lbl_1.setText(t1)
         self._l_legend_lbl_2.setText(t2)
+        self._update_heatmap_teams(t1, t2)
+        self._update_events_teams(t1, t2)
+
+    def _update_playback_view(self, playing: bool):
+        self._b_play.setText(PAUSE_BUTTON_LABEL if playing else PLAY_BUTTON_LABEL)
+
+    def _update_playback_stats(self, stats: VmdPlaybackStats):
+        self._l_playback_stats.setText(f'{stats.achieved_fps:.1f} fps, dropped frames: {stats.dropped_frames}'
+                                       f', skipped: {stats.skipped_frames}')
+
+    def _update_heatmap_teams(self, t1: str, t2: str):
+        self._set_combo_items(self._c_heatmap_team, [(HEATMAP_ALL_TEAMS_LABEL, None), (t1, 0), (t2, 1)])
+
+    def _update_heatmap_periods(self, periods: list[int]):
+        items = [(HEATMAP_ALL_PERIODS_LABEL, None)] + [(f'Period {period}', period) for period in periods]
+        self._set_combo_items(self._c_heatmap_period, items)
+
+    def _update_timeline_length(self, length_ms: int):
+        self._s_timeline.blockSignals(True)
+        self._s_timeline.setRange(0, max(0, length_ms))
+        self._s_timeline.blockSignals(False)
+        self._s_timeline.setEnabled(length_ms > 0)
+
+    def _update_timeline_position(self, position_ms: int):
+        # the slider dragged by the user is not moved back - the frame follows it
+        if position_ms < 0 or self._s_timeline.isSliderDown():
+            return
+        self._s_timeline.blockSignals(True)
+        self._s_timeline.setValue(position_ms)
+        self._s_timeline.blockSignals(False)
+
+    def _update_events_teams(self, t1: str, t2: str):
+        self._set_combo_items(self._c_events_team, [(EVENTS_ALL_TEAMS_LABEL, None), (t1, 0), (t2, 1)])
+
+    def _update_events_filter_options(self, options: VmdEventsFilterOptions):
+        self._set_combo_items(self._c_events_type
+                              , [(EVENTS_ALL_TYPES_LABEL, None)] + [(name, type_id) for type_id, name in sorted(options.event_types, key=lambda t: t[1])])
+        self._set_combo_items(self._c_events_period
+                              , [(EVENTS_ALL_PERIODS_LABEL, None)] + [(f'Period {period}', period) for period in options.periods])
+
+    def _update_frames_selection(self, frame_nos: np.ndarray | None):
+        self._l_selected_frames.setText(f'{len(frame_nos)} frames' if frame_nos is not None else '')
+        self._b_selected_left.setEnabled(frame_nos is not None)
+        self._b_selected_right.setEnabled(frame_nos is not None)
+
+    @staticmethod
+    def _set_combo_items(combo: qtw.QComboBox, items: list[tuple[str, object]]):
+        """
+        Replaces items of the combo box, keeping the selected value - the selection is reset to the first item
+        (and the change is emitted) only if the value is no longer available.
+        """
+        selected = combo.currentData()
+        combo.blockSignals(True)
+        combo.clear()
+        for label, value in items:
+            combo.addItem(label, value)
+        idx = max(0, combo.findData(selected)) if selected is not None else 0
+        combo.setCurrentIndex(idx)
+        combo.blockSignals(False)
+
+        if combo.currentData() != selected:
+            combo.currentIndexChanged.emit(idx)
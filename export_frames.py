@@ -0,0 +1,81 @@
+"""
+Exports frames of a match to images without showing any window.
+
+Usage: python export_frames.py <frames json> <events json> <lineups json> <output> [options]
+Output is a directory for the PNG sequence or, with --sheet, a single image file.
+"""
+
+import os
+import sys
+import argparse
+from multiprocessing import freeze_support
+
+
+# directory of the script - relative default paths of the application are resolved against it, not the working dir
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _parse_args() -> argparse.Namespace:
+    from app.views.vw_frames_exporter import DEFAULT_SHEET_TILE_WIDTH
+
+    parser = argparse.ArgumentParser(description='Exports frames of a match to a PNG sequence or a sprite sheet.')
+    parser.add_argument('frames_filepath')
+    parser.add_argument('events_filepath')
+    parser.add_argument('lineups_filepath')
+    parser.add_argument('output_path', help='directory of PNG files or sprite sheet file (with --sheet)')
+    parser.add_argument('--sheet', action='store_true', help='write a single sprite sheet instead of PNG files')
+    parser.add_argument('--tile-width', type=int, default=DEFAULT_SHEET_TILE_WIDTH, help='width of sprite sheet tile')
+    parser.add_argument('--visible-area', action='store_true', help="draw the camera's visible area")
+    parser.add_argument('--workers', type=int, default=None, help='number of rendering threads')
+    parser.add_argument('--first', type=int, default=1, help='first exported frame')
+    parser.add_argument('--last', type=int, default=None, help='last exported frame')
+    parser.add_argument('--background', default=None, help="pitch image (by default the application's one)")
+    return parser.parse_args()
+
+
+def main() -> int:
+    # rendering does not need a display - offscreen platform is used unless another one is chosen explicitly;
+    # the GUI stack is imported here, so spawned worker processes (importing this module) do not load it
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtGui     import QGuiApplication, QImage
+    from app.view_models import VmdDatasetListItem
+    from app.views       import VwFramesExporter
+    from app.views.components.vw_pitch_painter import VwPitchPainter
+
+    args = _parse_args()
+    app = QGuiApplication(sys.argv[:1])
+
+    # painter falls back to a flat pitch silently - the CLI rather fails, than exports frames without the image
+    background_path = args.background or VwPitchPainter.find_background(SCRIPT_DIR)
+    if QImage(background_path).isNull():
+        print(f'error: cannot load pitch image {background_path} - choose an existing one with --background'
+              , file=sys.stderr)
+        return 2
+
+    item = VmdDatasetListItem('export')
+    item.set_frames_filepath(args.frames_filepath)
+    item.set_events_filepath(args.events_filepath)
+    item.set_lineups_filepath(args.lineups_filepath)
+    try:
+        item.recalculate_data()
+    finally:
+        VmdDatasetListItem.process_pool.shutdown()
+
+    last = min(args.last or item.get_frames_no(), item.get_frames_no())
+    frame_nos = list(range(max(1, args.first), last + 1))
+
+    exporter = VwFramesExporter(background_path=background_path, visible_area=args.visible_area
+                                , max_workers=args.workers)
+    if args.sheet:
+        stats = exporter.export_sprite_sheet(item, args.output_path, frame_nos, tile_width=args.tile_width)
+    else:
+        stats = exporter.export_png_sequence(item, args.output_path, frame_nos)
+
+    print(f'{stats.frames_no} frames exported to {stats.output_path} in {stats.seconds:.2f} s ({stats.fps:.1f} fps)')
+    item.release_data()
+    return 0
+
+
+if __name__ == '__main__':
+    freeze_support()
+    sys.exit(main())
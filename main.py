@@ -1,9 +1,22 @@
-from app import VwMainWindow
-from app.helpers import get_styles_code
-from PyQt5.QtWidgets import QApplication
+from multiprocessing import freeze_support
+
+
+def main():
+    # spawned worker processes import this module as __mp_main__ - the GUI (PyQt5, views and view models' singletons)
+    # is imported only when the application is really started
+    from PyQt5.QtWidgets import QApplication
+    from app import VwMainWindow
+    from app.helpers import get_styles_code
+    from app.view_models import VmdDatasetListItem, vmd_current_dataset
 
-if __name__ == '__main__':
     app = QApplication([])
+    app.aboutToQuit.connect(VmdDatasetListItem.process_pool.shutdown)
+    app.aboutToQuit.connect(vmd_current_dataset.get_prefetcher().stop)
     app.setStyleSheet(get_styles_code())
     app_main_gui = VwMainWindow()
-    app.exec_()
\ No newline at end of file
+    app.exec_()
+
+
+if __name__ == '__main__':
+    freeze_support()
+    main()
@@ -0,0 +1,48 @@
+"""Contains method which generates synthetic 'three-sixty' (frames) json file with full match size"""
+
+import json
+import uuid
+import random
+
+
+FULL_MATCH_FRAMES_NO = 3500
+MAX_PLAYERS_NO       = 22
+
+
+def make_frames_json(j_filepath: str, frames_no: int = FULL_MATCH_FRAMES_NO, seed: int = 0) -> str:
+    """
+    Writes json file with the structure of StatsBomb 'three-sixty' data (compare with
+    /resources/generated/json_schemes/frames_scheme.json) filled with random values.
+
+    :param j_filepath: String filepath of the output file.
+    :param frames_no: Number of frames (events) to generate.
+    :param seed: Seed for the random generator - same seed gives the same file.
+    :return: String filepath of the output file.
+    """
+    rnd = random.Random(seed)
+
+    frames = list()
+    for _ in range(frames_no):
+        freeze_frame = [{
+                  'teammate': rnd.random() < 0.5
+                , 'actor'   : idx == 0
+                , 'keeper'  : rnd.random() < 0.05
+                , 'location': [rnd.uniform(-2.0, 122.0), rnd.uniform(-2.0, 82.0)]
+            } for idx in range(rnd.randint(4, MAX_PLAYERS_NO))]
+
+        visible_area = list()
+        for _ in range(rnd.randint(4, 7)):
+            visible_area += [rnd.uniform(0.0, 120.0), rnd.uniform(0.0, 80.0)]
+        # polygon is closed - the first corner is repeated at the end
+        visible_area += visible_area[:2]
+
+        frames.append({
+              'event_uuid'  : str(uuid.UUID(int=rnd.getrandbits(128), version=4))
+            , 'visible_area': visible_area
+            , 'freeze_frame': freeze_frame
+        })
+
+    with open(j_filepath, 'w') as f:
+        json.dump(frames, f, indent=2)
+
+    return j_filepath
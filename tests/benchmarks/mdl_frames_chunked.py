@@ -0,0 +1,62 @@
+"""
+Compares serial parsing of a big frames json file with parsing of its record-aligned byte ranges in parallel
+worker processes (merged in order), and checks that both give the same result frames.
+
+Usage: python -m tests.benchmarks.mdl_frames_chunked [path to frames json file] [number of workers]
+If no path is given, synthetic file of about 60 MB is generated.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import multiprocessing
+import numpy  as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+from app.models    import MdlFramesData
+from app.ingestion import IngParseTask, run_parse_task
+from tests.benchmarks._synthetic import make_frames_json
+
+
+SYNTHETIC_FRAMES_NO = 21000
+
+
+def _parse_parallel(frames_filepath: str, workers_no: int) -> tuple:
+    mdl = MdlFramesData(j_filepath=frames_filepath)
+    byte_ranges = mdl.get_chunk_ranges(workers_no)
+
+    with ProcessPoolExecutor(max_workers=workers_no, mp_context=multiprocessing.get_context('spawn')) as executor:
+        # workers are started upfront - their startup is not a part of parsing time
+        list(executor.map(int, range(workers_no)))
+
+        start = time.perf_counter()
+        tasks = [IngParseTask.from_model(mdl, 'fmodel', byte_range=byte_range) for byte_range in byte_ranges]
+        parts = [frames for _, frames in executor.map(run_parse_task, tasks)]
+        frames = mdl.merge_result_frames(parts)
+        return time.perf_counter() - start, len(byte_ranges), frames
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        frames_filepath = sys.argv[1]
+    else:
+        frames_filepath = make_frames_json(os.path.join(tempfile.mkdtemp(), 'frames.json'), frames_no=SYNTHETIC_FRAMES_NO)
+    workers_no = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    print(f'file: {os.path.getsize(frames_filepath) / 2**20:.1f} MiB, CPUs: {os.cpu_count()}, workers: {workers_no}')
+
+    start = time.perf_counter()
+    _, serial = MdlFramesData(j_filepath=frames_filepath).get_result_frames('fmodel')
+    print(f'serial  : {time.perf_counter() - start:.3f} s')
+
+    duration, parts_no, parallel = _parse_parallel(frames_filepath, workers_no)
+    print(f'parallel: {duration:.3f} s ({parts_no} parts)')
+
+    pd.testing.assert_frame_equal(serial[0], parallel[0])
+    for serial_ragged, parallel_ragged in zip(serial[1:], parallel[1:]):
+        assert np.array_equal(serial_ragged.get_offsets(), parallel_ragged.get_offsets())
+        for name in serial_ragged.get_column_names():
+            assert np.array_equal(serial_ragged.get_column(name), parallel_ragged.get_column(name))
+    print('results equal')
@@ -0,0 +1,67 @@
+"""
+Compares time of building players' DataFrame from 'freeze_frame' json attribute: row-wise explode + apply approach
+(used previously) against single-pass columnar flattening in MdlFramesData. Also compares memory used by the
+players' DataFrame with the compact players' store.
+
+Usage: python -m tests.benchmarks.mdl_frames_players [path to frames json file]
+If no path is given, synthetic full match file is generated.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import pandas as pd
+
+from app.models import MdlFramesData
+from tests.benchmarks._synthetic import make_frames_json
+
+
+def _legacy_players_frame(mdl: MdlFramesData, raw_src_df: pd.DataFrame) -> pd.DataFrame:
+    raw_df = raw_src_df.copy()[[ mdl.EAN.EVENT_UUID.value, mdl.EAN.FREEZE_FRAME.value ]]
+    raw_df = raw_df.explode(mdl.EAN.FREEZE_FRAME.value)
+    raw_df[[
+          mdl.PCN.TEAMMATE.value
+        , mdl.PCN.ACTOR.value
+        , mdl.PCN.KEEPER.value
+        , mdl.PCN.LOC_X.value
+        , mdl.PCN.LOC_Y.value
+    ]] = raw_df[mdl.EAN.FREEZE_FRAME.value].apply(lambda x: pd.Series({ 'c1': x[mdl.EAN.TEAMMATE.value]
+                                                                        ,'c2': x[mdl.EAN.ACTOR.value]
+                                                                        ,'c3': x[mdl.EAN.KEEPER.value]
+                                                                        ,'c4': x[mdl.EAN.LOCATION.value][0]
+                                                                        ,'c5': x[mdl.EAN.LOCATION.value][1]}))
+    return raw_df.drop(columns=[mdl.EAN.EVENT_UUID.value, mdl.EAN.FREEZE_FRAME.value])
+
+
+def _timed(func, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        frames_filepath = sys.argv[1]
+    else:
+        frames_filepath = make_frames_json(os.path.join(tempfile.mkdtemp(), 'frames.json'))
+
+    mdl = MdlFramesData(j_filepath=frames_filepath)
+    raw_df = mdl._get_raw_data_frame()
+
+    legacy_time, legacy_df = _timed(_legacy_players_frame, mdl, raw_df)
+    new_time, new_df       = _timed(mdl._get_players_frame, raw_df)
+
+    # the store keeps coordinates as float32
+    pd.testing.assert_frame_equal(new_df, legacy_df, check_dtype=False, rtol=1e-6)
+
+    players_store = mdl._flatten_freeze_frames(raw_df[mdl.EAN.FREEZE_FRAME.value].tolist())
+    legacy_bytes  = legacy_df.memory_usage(deep=True).sum()
+    store_bytes   = players_store.get_nbytes()
+
+    print(f'frames: {len(raw_df.index)}, players rows: {len(new_df.index)}')
+    print(f'explode + apply    : {legacy_time:8.3f} s')
+    print(f'columnar flattening: {new_time:8.3f} s')
+    print(f'speedup            : {legacy_time / new_time:8.1f} x')
+    print(f'DataFrame memory   : {legacy_bytes / 1024:8.1f} KiB')
+    print(f'players store      : {store_bytes / 1024:8.1f} KiB ({legacy_bytes / store_bytes:.1f} x less)')
@@ -0,0 +1,120 @@
+"""
+Measures cost of repainting the football pitch: previous paintEvent (pitch image loaded from disk and scaled,
+then all players drawn one by one, on every repaint) against cached layers with dirty-region updates and players'
+icons copied from a sprite atlas in a single batch. Both the repaint after
+a change of frame and the repaint of unchanged view (e.g. after being covered by another window) are measured.
+Also checks that both give the same picture.
+
+Usage: python -m tests.benchmarks.vw_football_pitch_paint [path to frames json file]
+If no path is given, synthetic full match file is generated.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import numpy  as np
+import pandas as pd
+import PyQt5.QtGui      as qtg
+import PyQt5.QtCore     as qtc
+import PyQt5.QtWidgets  as qtw
+
+from app.models          import MdlFramesData, MdlFramesJoinRow
+from app.models          import MAX_PLAYER_X_COORD, MIN_PLAYER_X_COORD, MAX_PLAYER_Y_COORD, MIN_PLAYER_Y_COORD
+from app.view_models     import VmdFootballPitch, VmdPitchPaintBuffer
+from app.views           import vw_football_pitch, VwFootballPitch
+from app.views.components.vw_pitch_painter import PITCH_X_RANGE, PITCH_Y_RANGE, VwPitchPainter
+from tests.benchmarks._synthetic import make_frames_json
+
+
+FRAMES_NO  = 300
+REPEATS_NO = 300
+
+
+class _LegacyFootballPitch(VwFootballPitch):
+
+    def paintEvent(self, event):
+        pitch_pixmap = self._return_pixmap(vw_football_pitch.FOOTBALL_PITCH_PIXMAP_PATH
+                                        ,scaled_height=vw_football_pitch.FOOTBALL_PITCH_HEIGHT
+                                        ,scaled_width =vw_football_pitch.FOOTBALL_PITCH_WIDTH)
+        pixmap_painter = qtg.QPainter(pitch_pixmap)
+        
+        data: VmdPitchPaintBuffer = self._model.get_paint_data()
+        for x_coord, y_coord, color_idx in zip(data.x_coords, data.y_coords, data.color_idxs):
+            pitch_coordinates = np.array([
+                 _legacy_map_coordinate(int(x_coord), MIN_PLAYER_X_COORD, MAX_PLAYER_X_COORD, PITCH_X_RANGE)
+                ,_legacy_map_coordinate(int(y_coord), MIN_PLAYER_Y_COORD, MAX_PLAYER_Y_COORD, PITCH_Y_RANGE)
+            ])
+            pixmap_coordinates = pitch_coordinates + vw_football_pitch.PITCH_BORDER_SIZE - vw_football_pitch.PLAYER_SIZE
+            size = vw_football_pitch.PLAYER_SIZE
+
+            pixmap_painter.setBrush(qtg.QBrush(data.palette[color_idx]))
+            pixmap_painter.drawEllipse(qtc.QRect(int(pixmap_coordinates[0]), int(pixmap_coordinates[1]), int(size[0]), int(size[1])))
+        
+        pixmap_painter.end()
+
+        painter = qtg.QPainter(self)
+        painter.drawPixmap(self.rect(), pitch_pixmap)
+        painter.end()
+
+    def _update_view(self, data: VmdPitchPaintBuffer):
+        self.update()
+
+
+def _legacy_map_coordinate(org: int, org_min: float, org_max: float, new_range: tuple[float, float]) -> int:
+    return int((org - org_min) / (org_max - org_min) * (new_range[1] - new_range[0]) + new_range[0])
+
+
+def _get_paint_data(frames_filepath: str) -> list[VmdPitchPaintBuffer]:
+    mdl = MdlFramesData(j_filepath=frames_filepath)
+    _, frames = mdl.get_result_frames('fmodel')
+    mdl.set_result_frames(*frames)
+
+    vmd = VmdFootballPitch()
+    paint_data = list()
+    for frame_no in range(1, min(FRAMES_NO, mdl.get_frames_no()) + 1):
+        join_row = MdlFramesJoinRow(event_pos=frame_no - 1, period=1 + frame_no % 2, minute=0, second=0
+                                    , event_team_idx=frame_no % 2, first_team_event=frame_no % 2 == 0)
+        vmd.get_data(mdl.get_players_frame_by_frame(frame_no), join_row)
+        paint_data.append(vmd.get_paint_data())
+    return paint_data
+
+
+def _measure(app: qtw.QApplication, view_cls: type, paint_data: list[VmdPitchPaintBuffer]) -> tuple[float, float, qtg.QImage]:
+    vmd  = VmdFootballPitch()
+    view = view_cls(model=vmd)
+    app.processEvents()
+
+    start = time.perf_counter()
+    for no in range(REPEATS_NO):
+        vmd._last_data = paint_data[no % len(paint_data)]
+        vmd.player_pitch_data_changed.emit(vmd._last_data)
+        app.processEvents()
+    frame_change = (time.perf_counter() - start) / REPEATS_NO
+
+    start = time.perf_counter()
+    for _ in range(REPEATS_NO):
+        view.repaint()
+    expose = (time.perf_counter() - start) / REPEATS_NO
+
+    image = view.grab().toImage()
+    view.close()
+    return frame_change, expose, image
+
+
+if __name__ == '__main__':
+    app = qtw.QApplication(sys.argv)
+    vw_football_pitch.FOOTBALL_PITCH_PIXMAP_PATH = VwPitchPainter.find_background()
+
+    if len(sys.argv) > 1:
+        frames_filepath = sys.argv[1]
+    else:
+        frames_filepath = make_frames_json(os.path.join(tempfile.mkdtemp(), 'frames.json'), frames_no=FRAMES_NO)
+    paint_data = _get_paint_data(frames_filepath)
+
+    results = { name: _measure(app, view_cls, paint_data) 
+                for name, view_cls in (('previous', _LegacyFootballPitch), ('layered', VwFootballPitch)) }
+    for name, (frame_change, expose, _) in results.items():
+        print(f'{name:<8}: frame change {frame_change * 1000:.3f} ms, repaint of unchanged view {expose * 1000:.3f} ms')
+
+    print('same picture:', results['previous'][2] == results['layered'][2])
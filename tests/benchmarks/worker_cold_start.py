@@ -0,0 +1,78 @@
+"""
+Measures cold start of a parse worker process: time of importing its entry point in a fresh interpreter
+(headless app.ingestion against app.views, which was imported by workers previously through app/__init__.py),
+time of running the application's main.py the way a spawned worker does (as __mp_main__) and latency of the first task of a newly spawned process pool - cold and warmed up upfront.
+
+Usage: python -m tests.benchmarks.worker_cold_start [path to lineups json file]
+"""
+
+import sys
+import time
+import subprocess
+import statistics
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from app.ingestion import IngParseTask, run_parse_task, warm_up_worker
+
+
+LINEUPS_JSON_FILEPATH = './Resources/tactics_data/3788757 - lineups.json'
+REPEATS_NO = 5
+
+IMPORT_PROBE_CODE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, 'PyQt5' in sys.modules, len(sys.modules))
+"""
+
+# spawned workers run the main module of the parent process under that name, before the first task
+MAIN_PROBE_CODE = """
+import sys, time, runpy
+start = time.perf_counter()
+runpy.run_path({path!r}, run_name='__mp_main__')
+print(time.perf_counter() - start, 'PyQt5' in sys.modules, len(sys.modules))
+"""
+MAIN_FILEPATH = './main.py'
+
+
+def _measure_import(module: str) -> tuple[float, bool, int]:
+    return _measure_probe(IMPORT_PROBE_CODE.format(module=module))
+
+
+def _measure_main(path: str) -> tuple[float, bool, int]:
+    return _measure_probe(MAIN_PROBE_CODE.format(path=path))
+
+
+def _measure_probe(code: str) -> tuple[float, bool, int]:
+    results = list()
+    for _ in range(REPEATS_NO):
+        out = subprocess.run([sys.executable, '-c', code]
+                             , capture_output=True, text=True, check=True).stdout.split()
+        results.append((float(out[0]), out[1] == 'True', int(out[2])))
+    return statistics.median(r[0] for r in results), results[0][1], results[0][2]
+
+
+def _measure_first_task(lineups_filepath: str, warm_up: bool) -> float:
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        if warm_up:
+            executor.submit(warm_up_worker).result()
+
+        start = time.perf_counter()
+        task = IngParseTask(func_id='lmodel', model_name='MdlLineupsData', j_filepath=lineups_filepath)
+        executor.submit(run_parse_task, task).result()
+        return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    lineups_filepath = sys.argv[1] if len(sys.argv) > 1 else LINEUPS_JSON_FILEPATH
+
+    for module in ('app.ingestion', 'app.views'):
+        duration, qt_loaded, modules_no = _measure_import(module)
+        print(f'import {module:<14}: {duration:.3f} s (median of {REPEATS_NO}), PyQt5 loaded: {qt_loaded}, modules: {modules_no}')
+
+    duration, qt_loaded, modules_no = _measure_main(MAIN_FILEPATH)
+    print(f'run main.py as worker: {duration:.3f} s (median of {REPEATS_NO}), PyQt5 loaded: {qt_loaded}, modules: {modules_no}')
+
+    print(f'first task, cold pool     : {_measure_first_task(lineups_filepath, warm_up=False):.3f} s')
+    print(f'first task, warmed-up pool: {_measure_first_task(lineups_filepath, warm_up=True):.3f} s')
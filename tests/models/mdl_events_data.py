@@ -6,4 +6,8 @@ EVENTS_JSON_FILEPATH = r'C:\Users\wikto\Rzeczy\Projekty\Python\FootballTacticsVi
 
 if __name__ == '__main__':
     mdf = MdlEventsData(j_filepath=EVENTS_JSON_FILEPATH)
-    mdf.get_result_frames()
\ No newline at end of file
+    _, frames = mdf.get_result_frames('test')
+    mdf.set_result_frames(*frames)
+
+    print(mdf.get_events_frame().dtypes)
+    print(mdf.memory_usage())
@@ -0,0 +1,15 @@
+from app.models import MdlEventsData, EventsFrameColNames, MdlEventsValueFilter, MdlEventsMinuteFilter
+
+
+EVENTS_JSON_FILEPATH = r'C:\Users\wikto\Rzeczy\Projekty\Python\FootballTacticsViewer\resources\tactics_data\3788757 - events.json'
+
+
+if __name__ == '__main__':
+    mdf = MdlEventsData(j_filepath=EVENTS_JSON_FILEPATH)
+    _, frames = mdf.get_result_frames('test')
+    mdf.set_result_frames(*frames)
+
+    print(mdf.get_event_types())
+    shots  = MdlEventsValueFilter(EventsFrameColNames.TYPE_ID, [16])
+    second = MdlEventsValueFilter(EventsFrameColNames.PERIOD, [2]) & MdlEventsMinuteFilter(60, 75)
+    print(mdf.get_events_frame().iloc[(shots & second).evaluate(mdf)])
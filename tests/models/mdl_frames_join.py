@@ -0,0 +1,18 @@
+from app.models import MdlEventsData, MdlFramesData, MdlLineupsData, MdlFramesJoin
+
+
+EVENTS_JSON_FILEPATH  = r'C:\Users\wikto\Rzeczy\Projekty\Python\FootballTacticsViewer\resources\tactics_data\3788757 - events.json'
+FRAMES_JSON_FILEPATH  = r'C:\Users\wikto\Rzeczy\Projekty\Python\FootballTacticsViewer\resources\tactics_data\3788757 - frames.json'
+LINEUPS_JSON_FILEPATH = r'C:\Users\wikto\Rzeczy\Projekty\Python\FootballTacticsViewer\resources\tactics_data\3788757 - lineups.json'
+
+
+if __name__ == '__main__':
+    models = MdlEventsData(j_filepath=EVENTS_JSON_FILEPATH), MdlFramesData(j_filepath=FRAMES_JSON_FILEPATH), MdlLineupsData(j_filepath=LINEUPS_JSON_FILEPATH)
+    for model in models:
+        _, frames = model.get_result_frames('test')
+        model.set_result_frames(*frames)
+
+    mfj = MdlFramesJoin()
+    mfj.build(frames_model=models[1], events_model=models[0], lineups_model=models[2])
+
+    print(vars(mfj.get_row(1)))
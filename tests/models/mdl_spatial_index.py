@@ -0,0 +1,21 @@
+from app.models import MdlFramesData, MdlSpatialIndex, MdlRegionCountPredicate, MdlNearestDistancePredicate
+from app.models import SpatialPlayersGroup, PENALTY_AREA, PITCH_UNITS_PER_METER
+
+
+FRAMES_JSON_FILEPATH  = r'C:\Users\wikto\Rzeczy\Projekty\Python\FootballTacticsViewer\resources\tactics_data\3788757 - frames.json'
+
+
+if __name__ == '__main__':
+    mfd = MdlFramesData(j_filepath=FRAMES_JSON_FILEPATH)
+    _, frames = mfd.get_result_frames('test')
+    mfd.set_result_frames(*frames)
+
+    msi = MdlSpatialIndex()
+    msi.build(mfd)
+
+    print(msi.count_in_region(PENALTY_AREA, SpatialPlayersGroup.OPPONENTS)[:20])
+    print(msi.get_nearest_distances(SpatialPlayersGroup.ACTOR, SpatialPlayersGroup.OPPONENTS)[:20])
+    print(msi.select_frames([
+          MdlRegionCountPredicate(PENALTY_AREA, SpatialPlayersGroup.OPPONENTS, min_count=4)
+        , MdlNearestDistancePredicate(SpatialPlayersGroup.ACTOR, SpatialPlayersGroup.OPPONENTS, min_distance=5 * PITCH_UNITS_PER_METER)
+    ]))
@@ -1,5 +1,6 @@
 import os
 import pandas as pd 
+from app.models      import MdlFramesJoinRow
 from app.view_models import VmdFootballPitch
 
 PKL_FRAMES_BASE     = r'.\resources\generated\dataframes'
@@ -17,7 +18,16 @@ if __name__ == '__main__':
     lineups_frame: pd.DataFrame         = pd.read_pickle(os.path.join(PKL_FRAMES_BASE, PKL_LINEUPS_FRAME))
     events_frame: pd.DataFrame          = pd.read_pickle(os.path.join(PKL_FRAMES_BASE, PKL_EVENTS_FRAME))
     
+    e_team_id = int(events_frame['event_team_id'].iloc[0])
+    event_team_idx = 0 if e_team_id == int(lineups_frame.loc[1, 'team_id']) else 1
+    join_row = MdlFramesJoinRow(  event_pos        = 0
+                                , period           = int(events_frame['period'].iloc[0])
+                                , minute           = int(events_frame['minute'].iloc[0])
+                                , second           = int(events_frame['second'].iloc[0])
+                                , event_team_idx   = event_team_idx
+                                , first_team_event = event_team_idx == 0)
+
     vfp = VmdFootballPitch()
-    vfp.get_data(players_frame, events_frame, lineups_frame)
+    vfp.get_data(players_frame, join_row)
 
     print(vfp._last_data)
\ No newline at end of file
@@ -0,0 +1,50 @@
+import numpy as np
+from app.view_models.vmd_football_pitch import VmdPitchPaintBuffer, match_players, interpolate_players
+
+
+PALETTE = list()
+
+
+def _buffer(players: list[tuple[int, int, int]]) -> VmdPitchPaintBuffer:
+    """
+    :param players: (x, y, color index) of every player.
+    """
+    x_coords, y_coords, color_idxs = zip(*players) if players else ((), (), ())
+    return VmdPitchPaintBuffer(np.array(x_coords, dtype=np.int32), np.array(y_coords, dtype=np.int32)
+                               , np.array(color_idxs, dtype=np.uint8), PALETTE)
+
+
+if __name__ == '__main__':
+    # groups of different sizes - dst has a player more of color 0 and a player less of color 1;
+    # color 2 is missing from src, color 3 is missing from dst
+    src = _buffer([(10, 10, 0), (50, 50, 0), (20, 70, 1), (90, 40, 1), (60, 60, 3)])
+    dst = _buffer([(52, 48, 0), (12, 11, 0), (100, 5, 0), (88, 41, 1), (30, 30, 2)])
+
+    src_idxs = match_players(src, dst)
+    print(src_idxs)
+    assert src_idxs.tolist() == [1, 0, -1, 3, -1]
+
+    # a src player is paired only once - with the closest dst player, the other one stays unmatched
+    crowded = match_players(_buffer([(0, 0, 0)]), _buffer([(5, 0, 0), (1, 0, 0)]))
+    print(crowded)
+    assert crowded.tolist() == [-1, 0]
+
+    # progress 0 - matched players at their src positions, the others already at dst positions
+    start = interpolate_players(src, dst, src_idxs, 0.0)
+    print(start.x_coords, start.y_coords)
+    assert start.x_coords.tolist() == [50, 10, 100, 90, 30]
+    assert start.y_coords.tolist() == [50, 10, 5, 40, 30]
+
+    # progress 1 - all players at dst positions
+    end = interpolate_players(src, dst, src_idxs, 1.0)
+    print(end.x_coords, end.y_coords)
+    assert np.array_equal(end.x_coords, dst.x_coords) and np.array_equal(end.y_coords, dst.y_coords)
+    assert np.array_equal(end.color_idxs, dst.color_idxs)
+
+    half = interpolate_players(src, dst, src_idxs, 0.5)
+    print(half.x_coords, half.y_coords)
+    assert half.x_coords.tolist() == [51, 11, 100, 89, 30]
+
+    # empty frames
+    assert len(match_players(_buffer([]), dst)) == len(dst)
+    assert len(interpolate_players(src, _buffer([]), match_players(src, _buffer([])), 0.5)) == 0
@@ -0,0 +1,7 @@
+from app.view_models import VmdHeatmap, VmdCurrentDataset, VmdFootballPitch
+
+if __name__ == '__main__':
+    vhm = VmdHeatmap(VmdCurrentDataset(), VmdFootballPitch())
+    vhm.set_shown(True)
+    vhm.set_team_idx(0)
+    print(vhm.is_shown(), vhm.get_team_idx(), vhm.get_period(), vhm.get_periods(), vhm.get_heatmap().shape)
@@ -0,0 +1,6 @@
+from app.view_models import VmdPlayback, VmdCurrentDataset
+
+if __name__ == '__main__':
+    vpb = VmdPlayback(VmdCurrentDataset())
+    vpb.set_speed(2)
+    print(vpb.get_speeds(), vpb.get_speed(), vpb.is_playing())
@@ -0,0 +1,52 @@
+import sys
+from PyQt5.QtCore import QCoreApplication, QTimer
+
+from app.view_models import VmdTimeline, VmdCurrentDataset, VmdDatasetListItem, VmdFootballPitch
+from app.view_models.vmd_timeline import SEEK_THROTTLE_MS
+
+
+EVENTS_JSON_FILEPATH  = r'C:\Users\wikto\Rzeczy\Projekty\Python\FootballTacticsViewer\resources\tactics_data\3788757 - events.json'
+FRAMES_JSON_FILEPATH  = r'C:\Users\wikto\Rzeczy\Projekty\Python\FootballTacticsViewer\resources\tactics_data\3788757 - frames.json'
+LINEUPS_JSON_FILEPATH = r'C:\Users\wikto\Rzeczy\Projekty\Python\FootballTacticsViewer\resources\tactics_data\3788757 - lineups.json'
+
+
+def main():
+    # throttled seeks are executed by a timer - it needs the application object and its event loop
+    app = QCoreApplication(sys.argv)
+
+    item = VmdDatasetListItem('timeline')
+    item.set_events_filepath(EVENTS_JSON_FILEPATH)
+    item.set_frames_filepath(FRAMES_JSON_FILEPATH)
+    item.set_lineups_filepath(LINEUPS_JSON_FILEPATH)
+    item.recalculate_data()
+    VmdDatasetListItem.process_pool.shutdown()
+
+    vcd = VmdCurrentDataset(VmdFootballPitch())
+    vcd.change_current_item(item)
+    vtl = VmdTimeline(vcd)
+    print(vtl.get_length_ms(), vtl.get_position_ms(), item.get_curr_frame(), item.get_timestamp())
+
+    # the first seek is executed at once
+    vtl.seek(vtl.get_length_ms() // 4)
+    app.processEvents()
+    first_frame = item.get_curr_frame()
+    print(vtl.get_position_ms(), first_frame, item.get_timestamp())
+    assert first_frame != 1
+
+    # the following ones are collapsed into the last of them, executed when the throttling interval passes
+    for elapsed_ms in range(vtl.get_length_ms() // 4, vtl.get_length_ms() // 2, 1000):
+        vtl.seek(elapsed_ms)
+    assert item.get_curr_frame() == first_frame
+
+    QTimer.singleShot(3 * SEEK_THROTTLE_MS, app.quit)
+    app.exec_()
+    print(vtl.get_position_ms(), item.get_curr_frame(), item.get_timestamp())
+    assert item.get_curr_frame() != first_frame
+
+    print(vtl.seek_match_time('67:30'))
+    app.processEvents()
+    print(vtl.get_position_ms(), item.get_curr_frame(), item.get_timestamp())
+
+
+if __name__ == '__main__':
+    main()